@@ -0,0 +1,65 @@
+"""
+Load time and in-memory size: scraper CSV + date re-parsing (what
+filter.py does) versus the typed Parquet dataset.
+
+Run from the repository root:
+    python -m benchmarks.dataset_load --rows 200000
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from dataset import read_dataset, write_dataset
+from gradstats_debug import parse_results_page
+
+
+def make_frame(num_rows):
+    with open("test_sc.html", encoding="utf-8") as f, contextlib.redirect_stdout(io.StringIO()):
+        records = parse_results_page(f.read())
+    df = pd.DataFrame(records * (num_rows // len(records) + 1)).head(num_rows)
+    # Spread the rows over a few seasons so there is something to prune
+    df["Year"] = [str(2019 + i % 7) for i in range(len(df))]
+    df["Season"] = ["Fall" if i % 3 else "Spring" for i in range(len(df))]
+    return df
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    df = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<42} {1000 * elapsed:9.1f} ms  {len(df):>8} rows  "
+          f"{df.memory_usage(deep=True).sum() / 2 ** 20:8.1f} MiB")
+    return df
+
+
+def run(num_rows):
+    df = make_frame(num_rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "gradcafe.csv")
+        root = os.path.join(tmp, "dataset")
+        df.to_csv(csv_path, index=False)
+        write_dataset(df, root)
+
+        def load_csv():
+            loaded = pd.read_csv(csv_path)
+            for name in ["Date_Posted", "DecisionDate"]:
+                loaded[name] = pd.to_datetime(loaded[name], errors="coerce")
+            return loaded
+
+        timed("CSV + to_datetime (all columns)", load_csv)
+        timed("dataset (all columns)", lambda: read_dataset(root))
+        timed("dataset (4 columns, Year=2024 Fall)", lambda: read_dataset(
+            root, columns=["School", "Program", "Decision", "DecisionDate"],
+            filters={"Year": 2024, "Season": "Fall"}))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+    run(args.rows)
@@ -0,0 +1,55 @@
+"""
+The original strptime-probing standardize_date versus the memoized,
+tokenizing one in date_utils, on the "Accepted on 28 Dec"-style dates
+the scraper sees.
+
+Run from the repository root:
+    python -m benchmarks.date_parsing --rows 100000
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from date_utils import standardize_date, standardize_date_column, standardize_date_strptime
+
+
+def synthetic_dates(num_rows, seed=0):
+    rng = random.Random(seed)
+    months = ["Jan", "Feb", "Mar", "Apr", "May", "Nov", "Dec"]
+    return [(f"{rng.randint(1, 29)} {rng.choice(months)}", rng.randint(2015, 2026)) for _ in range(num_rows)]
+
+
+def run(num_rows):
+    dates = synthetic_dates(num_rows)
+
+    start = time.perf_counter()
+    expected = [standardize_date_strptime(date_str, year) for date_str, year in dates]
+    strptime_time = time.perf_counter() - start
+
+    standardize_date.cache_clear()
+    start = time.perf_counter()
+    fast = [standardize_date(date_str, year) for date_str, year in dates]
+    fast_time = time.perf_counter() - start
+
+    date_column = pd.Series([date_str for date_str, _ in dates])
+    year_column = pd.Series([year for _, year in dates])
+    standardize_date.cache_clear()
+    start = time.perf_counter()
+    column = standardize_date_column(date_column, year_column)
+    column_time = time.perf_counter() - start
+
+    assert fast == expected and column.tolist() == expected
+    print(f"rows={num_rows}")
+    for name, elapsed in [("strptime probing", strptime_time), ("standardize_date", fast_time),
+                          ("standardize_date_column", column_time)]:
+        print(f"  {name:24s} {elapsed:7.3f}s  {num_rows / elapsed:12.0f} rows/sec"
+              f"  ({strptime_time / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+    run(args.rows)
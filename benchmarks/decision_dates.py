@@ -0,0 +1,58 @@
+"""
+Per-record decision-date handling (_normalize_decision_date in a loop:
+standardize, compute_effective_year, move the date into that year)
+versus columnar.normalize_decision_dates over whole columns.
+
+Run from the repository root:
+    python -m benchmarks.decision_dates --rows 1000000
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from columnar import normalize_decision_dates
+from gradstats_debug import _normalize_decision_date
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def synthetic_columns(num_rows, seed=0):
+    rng = random.Random(seed)
+    raw_dates, seasons, years = [], [], []
+    for _ in range(num_rows):
+        month = rng.choice(MONTHS)
+        raw_dates.append(f"{rng.randint(1, 29 if month == 'Feb' else 28)} {month}" if rng.random() < 0.95 else "")
+        seasons.append(rng.choice(["Fall", "Fall", "Fall", "Spring", ""]))
+        years.append(str(rng.randint(2015, 2026)) if seasons[-1] else "")
+    return pd.Series(raw_dates), pd.Series(seasons), pd.Series(years)
+
+
+def run(num_rows, check_rows=100000):
+    raw_dates, seasons, years = synthetic_columns(num_rows)
+
+    # The per-record loop is timed on a slice; it scales linearly
+    checked = min(num_rows, check_rows)
+    start = time.perf_counter()
+    expected = [_normalize_decision_date(*values)
+                for values in zip(raw_dates[:checked], seasons[:checked], years[:checked])]
+    loop_time = (time.perf_counter() - start) * num_rows / checked
+
+    start = time.perf_counter()
+    batch = normalize_decision_dates(raw_dates, seasons, years)
+    batch_time = time.perf_counter() - start
+
+    assert [tuple(row) for row in batch[:checked].itertuples(index=False)] == expected
+    print(f"rows={num_rows}")
+    print(f"  per-record loop           {loop_time:7.3f}s  {num_rows / loop_time:12.0f} rows/sec"
+          f"  (extrapolated from {checked} rows)")
+    print(f"  normalize_decision_dates  {batch_time:7.3f}s  {num_rows / batch_time:12.0f} rows/sec"
+          f"  ({loop_time / batch_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+    run(args.rows)
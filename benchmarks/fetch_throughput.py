@@ -0,0 +1,37 @@
+"""
+Pages/sec of fetch_pages against the local stand-in server.
+
+Run from the repository root:
+    python -m benchmarks.fetch_throughput --pages 64 --latency 0.1
+"""
+import argparse
+import time
+
+from fetch import PageFetcher, fetch_pages
+from local_server import serve_fixture
+
+
+def run(num_pages, latency, worker_counts):
+    server, base_url = serve_fixture(latency=latency)
+    try:
+        urls = [f"{base_url}?page={n}&sort=newest" for n in range(1, num_pages + 1)]
+        for workers in worker_counts:
+            # A fresh fetcher per run so no ETags carry over between runs
+            fetcher = PageFetcher(pool_size=workers)
+            start = time.perf_counter()
+            for page in fetch_pages(urls, concurrency=workers, fetch=fetcher.fetch):
+                assert page.status_code == 200, page.status_code
+            elapsed = time.perf_counter() - start
+            fetcher.close()
+            print(f"workers={workers:>3}  pages={num_pages}  {elapsed:7.2f}s  {num_pages / elapsed:8.1f} pages/sec")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds of injected latency per page")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+    run(args.pages, args.latency, args.workers)
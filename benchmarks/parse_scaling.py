@@ -0,0 +1,161 @@
+"""
+Throughput, peak RSS and per-stage time of the full parse path (row
+walker, parse_extra_tags, parse_season_year, standardize_date,
+compute_effective_year) on synthetic pages at growing record counts.
+
+Each size runs in a fresh process so its peak RSS is its own. Results
+are written as JSON; pass an earlier file as --baseline to flag sizes
+whose rows/sec dropped by more than --tolerance.
+
+benchmarks/results/parse_scaling.json is the committed baseline; its
+header records the commit, platform and CPU count it was measured on.
+Rows/sec depends on the machine, so on different hardware first write
+a baseline of your own (--output) from an unchanged checkout and
+compare against that.
+
+Run from the repository root:
+    python -m benchmarks.parse_scaling --sizes 1000 10000 100000 1000000
+    python -m benchmarks.parse_scaling --baseline benchmarks/results/parse_scaling.json \\
+        --output /tmp/new.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import cycle, islice
+
+from benchmarks.synthetic_pages import synthetic_pages
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "parse_scaling.json")
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # not on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def measure(num_records, parser, rows_per_page, distinct_pages, keep_records):
+    """
+    Parses `num_records` records (cycling over `distinct_pages` generated
+    pages, so the HTML held in memory stays small) and returns one result
+    dict. Runs inside the worker process.
+    """
+    from gradstats_debug import parse_results_page
+    from instrumentation import RunStats
+
+    num_pages = -(-num_records // rows_per_page)
+    pool = list(synthetic_pages(min(num_pages, distinct_pages), rows_per_page))
+    parse_results_page(pool[0], parser)  # warm up imports and compiled XPath
+
+    stats = RunStats()
+    kept = []
+    rows = 0
+    start = time.perf_counter()
+    for html in islice(cycle(pool), num_pages):
+        records = parse_results_page(html, parser, stats)
+        rows += len(records)
+        if keep_records:
+            kept.extend(records)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "records": rows,
+        "pages": num_pages,
+        "seconds": round(elapsed, 3),
+        "records_per_sec": round(rows / elapsed, 1),
+        "peak_rss_mb": peak_rss_mb(),
+        "timers": {name: round(seconds, 3) for name, seconds in stats.timers.items()},
+        "counters": stats.counters,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, parser, rows_per_page=20, distinct_pages=200, keep_records=False):
+    from parsers import DEFAULT_PARSER
+
+    results = []
+    context = multiprocessing.get_context("spawn")  # a forked child would start with our RSS
+    for size in sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(measure, size, parser, rows_per_page, distinct_pages, keep_records).result()
+        result["size"] = size
+        results.append(result)
+        stages = "  ".join(f"{name}={seconds:.2f}s" for name, seconds in result["timers"].items())
+        print(f"records={size:>8}  {result['seconds']:8.2f}s  {result['records_per_sec']:10.0f} rec/sec"
+              f"  peak RSS {result['peak_rss_mb']} MB  {stages}")
+
+    return {
+        "benchmark": "parse_scaling",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "parser": parser or DEFAULT_PARSER,
+        "rows_per_page": rows_per_page,
+        "keep_records": keep_records,
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """
+    Returns a message per size whose records/sec fell more than
+    `tolerance` (a fraction) below the baseline report.
+    """
+    before = {result["size"]: result for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        old = before.get(result["size"])
+        if old is None:
+            continue
+        ratio = result["records_per_sec"] / old["records_per_sec"]
+        if ratio < 1 - tolerance:
+            regressions.append(f"records={result['size']}: {result['records_per_sec']:.0f} rec/sec vs "
+                               f"{old['records_per_sec']:.0f} in {baseline.get('commit')} ({ratio:.0%})")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--parser", default=None, help="parser backend (default: parsers.DEFAULT_PARSER)")
+    parser.add_argument("--rows-per-page", type=int, default=20)
+    parser.add_argument("--keep-records", action="store_true",
+                        help="hold every record in memory, as scrape_gradcafe_with_program_type does")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=None, help="earlier --output file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed drop in records/sec")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.parser, args.rows_per_page, keep_records=args.keep_records)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        raise SystemExit(1 if regressions else 0)
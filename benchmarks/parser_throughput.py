@@ -0,0 +1,37 @@
+"""
+Rows/sec of each parser backend on the test_sc.html fixture.
+
+Run from the repository root:
+    python -m benchmarks.parser_throughput --repeat 50
+"""
+import argparse
+import time
+
+from parsers import PARSERS
+
+
+def run(html_path, repeat):
+    with open(html_path, encoding="utf-8") as f:
+        html = f.read()
+
+    for name, backend in PARSERS.items():
+        try:
+            backend(html)  # warm up (imports, compiled XPath)
+        except ImportError as e:
+            print(f"{name:>5}: skipped ({e})")
+            continue
+        start = time.perf_counter()
+        rows = 0
+        for _ in range(repeat):
+            rows += len(backend(html))
+        elapsed = time.perf_counter() - start
+        print(f"{name:>5}: {rows} rows in {elapsed:6.3f}s  {rows / elapsed:10.1f} rows/sec"
+              f"  {1000 * elapsed / repeat:7.2f} ms/page")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--html", default="test_sc.html")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    run(args.html, args.repeat)
@@ -0,0 +1,40 @@
+"""
+Pages/sec of the full scrape (fetch + parse) against the local
+stand-in server, for different numbers of parser processes.
+
+Run from the repository root:
+    python -m benchmarks.pipeline_throughput --pages 200 --parser bs4
+"""
+import argparse
+import contextlib
+import os
+import time
+
+from gradstats_debug import scrape_gradcafe_with_program_type
+from local_server import serve_fixture
+
+
+def run(num_pages, latency, concurrency, parser, worker_counts):
+    server, base_url = serve_fixture(latency=latency)
+    try:
+        for workers in worker_counts:
+            start = time.perf_counter()
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                df = scrape_gradcafe_with_program_type(base_url, max_pages=num_pages, concurrency=concurrency,
+                                                       parser=parser, parse_workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"parse_workers={workers:>2}  pages={num_pages}  rows={len(df)}  {elapsed:7.2f}s"
+                  f"  {num_pages / elapsed:8.1f} pages/sec")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of injected latency per page")
+    parser.add_argument("--concurrency", type=int, default=8, help="fetch threads")
+    parser.add_argument("--parser", default=None, help="parser backend (default: parsers.DEFAULT_PARSER)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    args = parser.parse_args()
+    run(args.pages, args.latency, args.concurrency, args.parser, args.workers)
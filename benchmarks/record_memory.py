@@ -0,0 +1,84 @@
+"""
+Bytes per record held in memory after parsing synthetic pages, for the
+record dicts build_record returns, CompactRecord tuples and a
+RecordTable, plus the DataFrame each one ends up as.
+
+Memory is measured with tracemalloc (Python allocations still alive
+once parsing is done), so the numbers do not depend on the allocator.
+tracemalloc slows parsing down several times; only compare the memory.
+
+Run from the repository root:
+    python -m benchmarks.record_memory --records 20000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from itertools import cycle, islice
+
+import pandas as pd
+
+from benchmarks.synthetic_pages import synthetic_pages
+from gradstats_debug import parse_results_page
+from records import RecordTable, compact_record
+
+
+def collect(pages, form):
+    if form == "dicts":
+        held = []
+        for html in pages:
+            held.extend(parse_results_page(html))
+    elif form == "compact":
+        held = []
+        for html in pages:
+            held.extend(compact_record(record) for record in parse_results_page(html))
+    else:
+        held = RecordTable()
+        for page_num, html in enumerate(pages):
+            held.append(parse_results_page(html), page_num)
+    return held
+
+
+def to_frame(held, form):
+    if form == "dicts":
+        return pd.DataFrame(held)
+    if form == "compact":
+        return pd.DataFrame(held, columns=held[0]._fields)
+    return held.to_frame()
+
+
+def measure(pool, num_pages, form):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    held = collect(islice(cycle(pool), num_pages), form)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    held_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    frame = to_frame(held, form)
+    frame_bytes = frame.memory_usage(deep=True).sum()
+    return len(frame), held_bytes, frame_bytes, elapsed
+
+
+def run(num_records, rows_per_page=20, distinct_pages=200):
+    num_pages = -(-num_records // rows_per_page)
+    pool = list(synthetic_pages(min(num_pages, distinct_pages), rows_per_page))
+    parse_results_page(pool[0])  # warm up imports and caches
+
+    print(f"records={num_records}")
+    baseline = None
+    for form in ["dicts", "compact", "table"]:
+        rows, held_bytes, frame_bytes, elapsed = measure(pool, num_pages, form)
+        per_record = held_bytes / rows
+        baseline = baseline or per_record
+        print(f"  {form:>8}: {per_record:8.0f} bytes/record held ({baseline / per_record:4.1f}x smaller)"
+              f"  DataFrame {frame_bytes / rows:6.0f} bytes/record  parse+collect {elapsed:6.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.records)
@@ -0,0 +1,192 @@
+"""
+Synthetic GradCafe result pages in the same Tailwind table markup as
+test_sc.html: a main row per result, a tag row (decision badge, season,
+nationality, GRE / GPA) and, for some results, a comment row.
+
+synthetic_page returns the HTML together with the parsers.RawRow each
+backend should extract from it, so the generator doubles as a parser
+test fixture at any size.
+"""
+import html as html_lib
+import random
+
+from parsers import RawRow
+
+SCHOOLS = [
+    "Vanderbilt University", "University of Wisconsin-Madison", "Stanford University",
+    "University of California, Los Angeles (UCLA)", "Harvard University", "University of Michigan",
+    "Massachusetts Institute of Technology (MIT)", "Columbia University", "New York University (NYU)",
+    "University of Texas at Austin", "Carnegie Mellon University", "Universität Zürich",
+]
+PROGRAMS = [
+    "Education Policy", "Computer Science", "Economics", "Political Science", "Psychology",
+    "Sociology", "Mechanical Engineering", "Public Health", "Statistics", "History",
+]
+DEGREES = ["PhD", "Masters", "MFA", "PsyD", "Other"]
+DECISIONS = ["Accepted", "Rejected", "Interview", "Wait listed"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July",
+          "August", "September", "October", "November", "December"]
+COMMENTS = [
+    "Email from POI. EPS program. Current masters student",
+    "Got the call on a Friday afternoon, still in shock!",
+    "No funding information yet.",
+    "Rejected via portal & email <3 years of trying>",
+]
+
+_PAGE_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>GradCafe Results</title>
+<script>var results = "<table class='tw-min-w-full'>";</script></head>
+<body>
+<div class="tw-flow-root">
+	<div class="tw-inline-block tw-min-w-full tw-py-2 tw-align-middle">
+		<table class="tw-min-w-full tw-divide-y tw-divide-gray-300">
+			<thead>
+				<tr class=" ">
+					<th scope="col" class="tw-py-3.5 tw-pl-4 tw-pr-3 tw-text-left tw-text-sm tw-font-semibold tw-text-gray-900 sm:tw-pl-0">School</th>
+					<th scope="col" class="tw-px-3 tw-py-3.5 tw-text-left tw-text-sm tw-font-semibold tw-text-gray-900">Program</th>
+					<th scope="col" class="tw-px-3 tw-py-3.5 tw-text-left tw-text-sm tw-font-semibold tw-text-gray-900 tw-hidden md:tw-table-cell">Added On</th>
+					<th scope="col" class="tw-px-3 tw-py-3.5 tw-text-left tw-text-sm tw-font-semibold tw-text-gray-900 tw-hidden md:tw-table-cell">Decision</th>
+					<th scope="col" class="tw-px-3 tw-py-3.5 tw-text-left tw-text-sm tw-font-semibold tw-text-gray-900"></th>
+				</tr>
+			</thead>
+			<tbody class="tw-divide-y tw-divide-gray-200 tw-bg-white">
+"""
+
+_PAGE_TAIL = """			</tbody>
+		</table>
+	</div>
+</div>
+<nav aria-label="Pagination"><a href="?page=2">Next</a></nav>
+</body>
+</html>
+"""
+
+_MAIN_ROW = """					<tr>
+						<td class="tw-py-5 tw-pl-4 tw-pr-3 tw-text-sm sm:tw-pl-0">
+							<div class="tw-flex tw-items-center">
+								<div class="tw-font-medium tw-text-gray-900 tw-text-sm">{school}</div>
+							</div>
+						</td>
+						<td class="tw-px-3 tw-py-5 tw-text-sm tw-text-gray-500">
+							<div class="tw-text-gray-900">
+								<span>{program}</span>
+								<svg viewBox="0 0 2 2" class="tw-h-0.5 tw-w-0.5 tw-fill-gray-400 tw-mx-1 tw-inline-block">
+									<circle cx="1" cy="1" r="1" />
+								</svg>
+								<span class="tw-text-gray-500">{degree}</span>
+							</div>
+						</td>
+						<td class="tw-px-3 tw-py-5 tw-text-sm tw-text-gray-500 tw-whitespace-nowrap tw-hidden md:tw-table-cell ">
+															{date_posted}													</td>
+						<td class="tw-px-3 tw-py-5 tw-text-sm tw-text-gray-500 tw-whitespace-nowrap tw-hidden md:tw-table-cell ">
+							<div class="tw-inline-flex tw-items-center tw-rounded-md tw-bg-sky-50 tw-text-sky-700 tw-ring-sky-600/20 tw-px-2 tw-py-1 tw-text-sm tw-font-medium tw-ring-1 tw-ring-inset">
+								{decision}							</div>
+						</td>
+						<td class="tw-relative tw-py-5 tw-pl-3 tw-pr-4 sm:tw-pr-0 tw-whitespace-nowrap tw-align-top">
+							<div class="tw-flex  tw-gap-x-2.5">
+								<dt class="tw-inline-flex tw-items-center tw-space-x-2 tw-text-gray-500 tw-font-medium tw-text-sm">
+									<span class="tw-sr-only">Total comments</span>
+									<a href="/result/{result_id}">
+										<svg class="tw-h-6 tw-w-6 tw-text-gray-400 hover:tw-text-gray-900" fill="none" viewBox="0 0 24 24" stroke-width="1.5" stroke="currentColor" aria-hidden="true" data-slot="icon">
+											<path stroke-linecap="round" stroke-linejoin="round" d="M2.25 12.76c0 1.6 1.123 2.994 2.707 3.227 1.087.16 2.185.283 3.293.369V21l4.076-4.076a1.526 1.526 0 0 1 1.037-.443 48.282 48.282 0 0 0 5.68-.494c1.584-.233 2.707-1.626 2.707-3.228V6.741c0-1.602-1.123-2.995-2.707-3.228A48.394 48.394 0 0 0 12 3c-2.392 0-4.744.175-7.043.513C3.373 3.746 2.25 5.14 2.25 6.741v6.018Z"></path>
+										</svg>
+									</a>
+									<a class="" href="https://www.thegradcafe.com/result/{result_id}#insticator-commenting" data-ext-page-id="{result_id}"></a>
+								</dt>
+								<dt class="tw-relative tw-flex-none">
+									<button type="button" class="tw--m-2.5 tw-block tw-p-2.5 tw-text-gray-500 hover:tw-text-gray-900" id="options-menu-{result_id}-button" aria-expanded="false" aria-haspopup="true">
+										<span class="tw-sr-only">Open options</span>
+									</button>
+									<div class="tw-absolute tw-right-0 tw-z-10 tw-mt-2 tw-w-32 tw-origin-top-right tw-rounded-md tw-bg-white tw-py-2 tw-shadow-lg tw-hidden" role="menu" id="options-menu-{result_id}-list">
+										<!--  -->
+										<a href="/result/{result_id}" class="tw-block tw-px-3 tw-py-1 tw-text-sm tw-leading-6 tw-text-gray-900 tw-font-normal hover:tw-bg-gray-50" role="menuitem">See More</a>
+									</div>
+								</dt>
+							</div>
+						</td>
+					</tr>
+"""
+
+_TAG_ROW_HEAD = """					<tr class="tw-border-none">
+						<td colspan="3" class="tw-py-2 tw-pr-4 sm:tw-pl-0 tw-pl-4">
+							<div class="tw-gap-2 tw-flex tw-flex-wrap">
+								<div class="tw-inline-flex tw-items-center tw-rounded-md tw-bg-sky-50 tw-text-sky-700 tw-ring-sky-600/20 tw-px-2 tw-py-1 tw-text-xs tw-font-medium tw-ring-1 tw-ring-inset md:tw-hidden">
+									{decision}								</div>
+"""
+
+_TAG = """								<div class="tw-inline-flex tw-items-center tw-rounded-md tw-bg-stone-50 tw-px-2 tw-py-1 tw-text-xs tw-font-medium tw-text-stone-700 tw-ring-1 tw-ring-inset tw-ring-stone-600/20">{tag}</div>
+"""
+
+_TAG_ROW_TAIL = """							</div>
+						</td>
+					</tr>
+"""
+
+_COMMENT_ROW = """					<tr class="tw-border-none">
+						<td colspan="100%" class="tw-py-2 tw-pr-4 sm:tw-pl-0 tw-pl-4">
+							<p class="tw-text-gray-500 tw-text-sm tw-my-0">{comment}</p>
+						</td>
+					</tr>
+"""
+
+
+def _random_result(rng):
+    season = rng.choice(["Fall", "Fall", "Fall", "Spring"])
+    year = rng.randint(2015, 2026)
+    decision = rng.choice(DECISIONS)
+    month = rng.choice(MONTHS)
+    day = rng.randint(1, 29 if month == "February" else 28)
+    decision_text = f"{decision} on {day} {month[:3]}" if rng.random() < 0.95 else decision
+
+    tags = [f"{season} {year}", rng.choice(["American", "International", "Other"])]
+    if rng.random() < 0.3:
+        tags += [f"GRE {rng.randint(290, 340)}", f"GRE V {rng.randint(140, 170)}",
+                 f"GRE AW {rng.choice(['3.00', '3.50', '4.00', '4.50', '5.00'])}"]
+    if rng.random() < 0.5:
+        tags.append(f"GPA {rng.uniform(2.5, 4.0):.2f}")
+
+    posted_month = rng.choice(MONTHS)
+    return RawRow(
+        school=rng.choice(SCHOOLS),
+        program=rng.choice(PROGRAMS),
+        degree_type=rng.choice(DEGREES),
+        date_posted=f"{posted_month} {rng.randint(1, 28)}, {year - rng.randint(0, 1)}",
+        decision=decision_text,
+        tags=tags,
+        comment=rng.choice(COMMENTS) if rng.random() < 0.4 else "",
+    )
+
+
+def synthetic_page(num_rows=20, seed=0, first_id=1):
+    """
+    One results page with `num_rows` random results. Returns
+    (html, raw_rows): the tag list of each RawRow starts with the
+    decision badge, as the real tag row does.
+    """
+    rng = random.Random(seed)
+    parts = [_PAGE_HEAD]
+    raw_rows = []
+    for offset in range(num_rows):
+        result = _random_result(rng)
+        esc = html_lib.escape
+        parts.append(_MAIN_ROW.format(school=esc(result.school), program=esc(result.program),
+                                      degree=esc(result.degree_type), date_posted=esc(result.date_posted),
+                                      decision=esc(result.decision), result_id=first_id + offset))
+        parts.append(_TAG_ROW_HEAD.format(decision=esc(result.decision)))
+        parts.extend(_TAG.format(tag=esc(tag)) for tag in result.tags)
+        parts.append(_TAG_ROW_TAIL)
+        if result.comment:
+            parts.append(_COMMENT_ROW.format(comment=esc(result.comment)))
+        raw_rows.append(result._replace(tags=[result.decision] + result.tags))
+    parts.append(_PAGE_TAIL)
+    return "".join(parts), raw_rows
+
+
+def synthetic_pages(num_pages, rows_per_page=20, seed=0):
+    """
+    Yields the HTML of `num_pages` distinct synthetic pages.
+    """
+    for page_num in range(num_pages):
+        html, _ = synthetic_page(rows_per_page, seed=seed + page_num, first_id=1 + page_num * rows_per_page)
+        yield html
@@ -0,0 +1,60 @@
+"""
+Per-record tag parsing (parse_extra_tags + parse_season_year in a loop)
+versus columnar.parse_tags_batch on synthetic tag lists.
+
+Run from the repository root:
+    python -m benchmarks.tag_parsing --rows 100000
+"""
+import argparse
+import random
+import time
+
+from columnar import TAG_COLUMNS, parse_tags_batch
+from gradstats_debug import parse_extra_tags, parse_season_year
+
+
+def synthetic_tag_lists(num_rows, seed=0):
+    rng = random.Random(seed)
+    decisions = ["Accepted", "Rejected", "Interview", "Wait listed"]
+    months = ["Jan", "Feb", "Mar", "Apr", "Dec"]
+    lists = []
+    for _ in range(num_rows):
+        tags = [f"{rng.choice(decisions)} on {rng.randint(1, 28)} {rng.choice(months)}",
+                f"{rng.choice(['Fall', 'Spring'])} {rng.randint(2015, 2026)}",
+                rng.choice(["American", "International", "Other"])]
+        if rng.random() < 0.5:
+            tags.append(f"GPA {rng.uniform(2.5, 4.0):.2f}")
+        if rng.random() < 0.3:
+            tags += [f"GRE {rng.randint(290, 340)}", f"GRE V {rng.randint(140, 170)}",
+                     f"GRE AW {rng.choice(['3.00', '3.50', '4.00', '4.50', '5.00'])}"]
+        lists.append(tags)
+    return lists
+
+
+def per_record(tag_lists):
+    return [parse_extra_tags(tags) + parse_season_year(tags) for tags in tag_lists]
+
+
+def run(num_rows):
+    tag_lists = synthetic_tag_lists(num_rows)
+
+    start = time.perf_counter()
+    expected = per_record(tag_lists)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = parse_tags_batch(tag_lists)
+    batch_time = time.perf_counter() - start
+
+    assert [tuple(row) for row in batch[TAG_COLUMNS].itertuples(index=False)] == expected
+    print(f"rows={num_rows}")
+    print(f"  per-record loop   {loop_time:7.3f}s  {num_rows / loop_time:12.0f} rows/sec")
+    print(f"  parse_tags_batch  {batch_time:7.3f}s  {num_rows / batch_time:12.0f} rows/sec"
+          f"  ({loop_time / batch_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+    run(args.rows)
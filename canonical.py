@@ -0,0 +1,243 @@
+"""
+Canonical School / Program names.
+
+GradCafe users type school and program names freely, so one program
+shows up as "Social And Engineering Systems (SES)", "IDSS SES",
+"Social and Engineering Systems", ... and every grouping fragments.
+NameCanonicalizer maps each raw string to a canonical name:
+
+  1. the raw string is looked up in the mapping cache (raw -> canonical)
+  2. its normalized form (lowercase, accents / punctuation dropped,
+     "&" -> "and", "Univ." -> "university") is looked up among the
+     canonical names and their aliases; a trailing "(ABBR)" counts as
+     an alias
+  3. otherwise the canonical names sharing the most character trigrams
+     with it are compared by edit distance, both on the whole name and
+     on its distinctive words (so "UC Irvine" never matches "UC Davis")
+  4. if nothing is close enough the string becomes a canonical name
+
+Every decision is kept in the mapping, and save_canonicalizers writes it to
+a JSON cache, so each distinct string is resolved once across runs.
+Columns are canonicalized per distinct value, so with a warm cache a
+few million rows take a second or two.
+
+canonical_names.json seeds the canonical names and hand-picked aliases
+(acronyms like "IDSS" cannot be found by edit distance).
+"""
+import json
+import os
+import re
+import unicodedata
+from collections import Counter
+
+CACHE_FILE = ".canonical_cache.json"
+SEED_FILE = "canonical_names.json"
+KINDS = ["School", "Program"]
+
+# Words that do not tell two names apart
+STOPWORDS = {"university", "of", "the", "at", "in", "and", "for", "college", "school", "department",
+             "program", "institute", "studies"}
+ABBREVIATIONS = {"univ": "university", "coll": "college", "inst": "institute", "dept": "department",
+                 "sci": "science", "eng": "engineering"}
+
+_ACRONYM_RE = re.compile(r'\(([^()]+)\)\s*$')
+_NON_WORD_RE = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_name(name):
+    """
+    "Université de Montréal (UdeM)" -> "universite de montreal udem"
+    """
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(ch for ch in name if not unicodedata.combining(ch)).lower().replace("&", " and ")
+    words = _NON_WORD_RE.sub(" ", name).split()
+    return " ".join(ABBREVIATIONS.get(word, word) for word in words)
+
+
+def edit_distance(a, b, limit=None):
+    """
+    Levenshtein distance; gives up early (returning limit + 1) once it
+    is sure to exceed `limit`.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def similarity(a, b):
+    longest = max(len(a), len(b))
+    if not longest:
+        return 1.0
+    return 1.0 - edit_distance(a, b) / longest
+
+
+def _is_stopword(word):
+    # Also catches misspelled stopwords ("univeristy")
+    if word in STOPWORDS:
+        return True
+    return len(word) >= 6 and any(edit_distance(word, stop, 2) <= 2 for stop in STOPWORDS if len(stop) >= 6)
+
+
+def distinctive_words(normalized):
+    words = [word for word in normalized.split() if not _is_stopword(word)]
+    return " ".join(words) if words else normalized
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameCanonicalizer:
+    """
+    Resolves raw names of one kind (schools or programs) to canonical
+    names. `threshold` is the edit similarity (0..1) both the whole name
+    and its distinctive words need to reach.
+    """
+
+    def __init__(self, threshold=0.85, candidates=10):
+        self.threshold = threshold
+        self.candidates = candidates
+        self.canonical = []      # canonical names, in the order they were added
+        self.mapping = {}        # raw string -> canonical name
+        self._by_normalized = {}  # normalized canonical name or alias -> canonical name
+        self._keys = []          # per canonical: (normalized, distinctive words)
+        self._trigram_index = {}  # trigram -> canonical positions
+
+    def add_canonical(self, name, aliases=()):
+        normalized = normalize_name(name)
+        if normalized in self._by_normalized:
+            canonical = self._by_normalized[normalized]
+        else:
+            canonical = name
+            position = len(self.canonical)
+            self.canonical.append(name)
+            self._by_normalized[normalized] = name
+            self._keys.append((normalized, distinctive_words(normalized)))
+            for gram in _trigrams(normalized):
+                self._trigram_index.setdefault(gram, []).append(position)
+
+        acronym = _ACRONYM_RE.search(name)
+        for alias in list(aliases) + ([acronym.group(1)] if acronym else []):
+            self._by_normalized.setdefault(normalize_name(alias), canonical)
+            self.mapping.setdefault(alias, canonical)
+        self.mapping.setdefault(name, canonical)
+        return canonical
+
+    def _best_match(self, normalized):
+        shared = Counter()
+        for gram in _trigrams(normalized):
+            for position in self._trigram_index.get(gram, ()):
+                shared[position] += 1
+
+        words = distinctive_words(normalized)
+        best, best_score = None, self.threshold
+        for position, _ in shared.most_common(self.candidates):
+            candidate, candidate_words = self._keys[position]
+            score = similarity(normalized, candidate)
+            if score >= best_score and similarity(words, candidate_words) >= self.threshold:
+                best, best_score = self.canonical[position], score
+        return best
+
+    def resolve(self, raw):
+        """
+        The canonical name for `raw` ("" stays "").
+        """
+        canonical = self.mapping.get(raw)
+        if canonical is not None:
+            return canonical
+        if not raw.strip():
+            return raw
+
+        normalized = normalize_name(raw)
+        # Without the "(ABBR)" suffix, so "Foo University (FU)" finds "Foo University"
+        acronym = _ACRONYM_RE.search(raw)
+        base = normalize_name(raw[:acronym.start()]) if acronym else normalized
+        canonical = (self._by_normalized.get(normalized) or self._by_normalized.get(base)
+                     or self._best_match(base))
+        if canonical is None:
+            canonical = self.add_canonical(raw.strip())
+        self.mapping[raw] = canonical
+        return canonical
+
+    def to_dict(self):
+        return {"canonical": self.canonical, "mapping": self.mapping}
+
+    @classmethod
+    def from_dict(cls, data, **options):
+        canonicalizer = cls(**options)
+        for name in data.get("canonical", []):
+            canonicalizer.add_canonical(name)
+        canonicalizer.mapping.update(data.get("mapping", {}))
+        return canonicalizer
+
+
+def load_canonicalizers(cache_path=CACHE_FILE, seed_path=SEED_FILE, **options):
+    """
+    A NameCanonicalizer per kind ("School", "Program") from the cache
+    of earlier runs, with the seed names and aliases added.
+    """
+    cached = {}
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+    seeds = {}
+    if seed_path and os.path.exists(seed_path):
+        with open(seed_path, encoding="utf-8") as f:
+            seeds = json.load(f)
+
+    canonicalizers = {}
+    for kind in KINDS:
+        canonicalizer = NameCanonicalizer.from_dict(cached.get(kind, {}), **options)
+        for name, aliases in seeds.get(kind, {}).items():
+            canonicalizer.add_canonical(name, aliases)
+        canonicalizers[kind] = canonicalizer
+    return canonicalizers
+
+
+def save_canonicalizers(canonicalizers, cache_path=CACHE_FILE):
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({kind: c.to_dict() for kind, c in canonicalizers.items()}, f, ensure_ascii=False)
+    os.replace(tmp_path, cache_path)
+
+
+def canonicalize_column(values, canonicalizer):
+    """
+    Canonical names for a Series of raw names, resolving each distinct
+    value once.
+    """
+    import numpy as np
+    import pandas as pd
+
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values.fillna("").astype(str))
+    resolved = np.array([canonicalizer.resolve(value) for value in uniques], dtype=object)
+    return pd.Series(resolved[codes], index=values.index, dtype=object)
+
+
+def add_canonical_columns(df, canonicalizers=None, cache_path=CACHE_FILE):
+    """
+    Returns a copy of `df` with School_Canonical and Program_Canonical
+    columns. Without `canonicalizers` they are loaded from (and the
+    new decisions saved back to) `cache_path`.
+    """
+    own = canonicalizers is None
+    if own:
+        canonicalizers = load_canonicalizers(cache_path)
+    out = df.copy()
+    for kind in KINDS:
+        out[f"{kind}_Canonical"] = canonicalize_column(df[kind], canonicalizers[kind])
+    if own and cache_path:
+        save_canonicalizers(canonicalizers, cache_path)
+    return out
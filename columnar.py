@@ -0,0 +1,293 @@
+"""
+Whole-column versions of the per-record helpers in gradstats_debug.
+
+The per-record functions run their regexes once per tag per row. Tags
+repeat heavily across a page or a dataset ("Fall 2025", "American",
+"GPA 3.80", ...), so the batch versions here match each distinct value
+once and spread the results back with NumPy integer indexing, giving
+exactly the same output as the per-record functions.
+
+The same goes for decision dates: _normalize_decision_date parses each
+row's ISO date twice more with strptime after standardizing it (once
+for compute_effective_year, once to move it into that year) and formats
+it back. normalize_decision_dates standardizes each distinct date once,
+applies the Fall / Spring rules as month masks over whole columns and
+only formats the distinct (date, effective_year) pairs.
+build_records_frame runs a whole batch of parsers.RawRow through these
+instead of build_record.
+"""
+from datetime import datetime
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from date_utils import standardize_date, standardize_date_column
+from gradstats_debug import GPA_RE, GRE_AW_RE, GRE_TOTAL_RE, GRE_V_RE, SEASON_YEAR_RE
+
+TAG_COLUMNS = ["GRE_Total", "GRE_V", "GRE_AW", "GPA", "Nationality", "Season", "Year"]
+_LAST_MATCH_COLUMNS = TAG_COLUMNS[:5]   # parse_extra_tags: the last tag that matches wins
+_FIRST_MATCH_COLUMNS = TAG_COLUMNS[5:]  # parse_season_year: the first tag that matches wins
+
+
+def _tag_fields(tag):
+    """
+    What a single tag contributes to each column (None = nothing).
+    """
+    lower = tag.lower()
+    fields = []
+    for pattern in (GRE_TOTAL_RE, GRE_V_RE, GRE_AW_RE, GPA_RE):
+        match = pattern.search(lower)
+        fields.append(match.group(1) if match else None)
+
+    if "american" in lower:
+        fields.append("American")
+    elif "international" in lower:
+        fields.append("International")
+    else:
+        fields.append(None)
+
+    match = SEASON_YEAR_RE.search(tag)
+    if match:
+        fields += [match.group(1).title(), match.group(2)]
+    else:
+        fields += [None, None]
+    return fields
+
+
+def parse_tags_batch(tag_lists):
+    """
+    Batch version of parse_extra_tags + parse_season_year.
+
+    Takes a sequence (or Series) of tag lists, one per record, and
+    returns a DataFrame with one row per record and the columns
+    GRE_Total, GRE_V, GRE_AW, GPA, Nationality, Season, Year, holding
+    the same strings the per-record functions return ("" if missing).
+    """
+    tag_lists = [tags if isinstance(tags, (list, tuple)) else list(tags) for tags in tag_lists]
+    num_rows = len(tag_lists)
+
+    # Flatten to one entry per tag, remembering which record it belongs to
+    lengths = np.fromiter((len(tags) for tags in tag_lists), dtype=np.int64, count=num_rows)
+    rows = np.repeat(np.arange(num_rows), lengths)
+    flat_tags = list(chain.from_iterable(tag_lists))
+
+    # Each distinct tag is matched once
+    codes, uniques = pd.factorize(pd.Series(flat_tags, dtype=object), sort=False)
+    table = [_tag_fields(tag) for tag in uniques]
+
+    result = {}
+    for position, name in enumerate(TAG_COLUMNS):
+        # Integer-code what each distinct tag contributes to this column; -1 = nothing
+        values = [fields[position] for fields in table]
+        value_codes, labels = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+        per_tag = value_codes[codes] if len(codes) else np.empty(0, dtype=np.int64)
+        matched = per_tag >= 0
+
+        picked = np.full(num_rows, -1, dtype=np.int64)
+        if name in _LAST_MATCH_COLUMNS:
+            # With repeated indices the last assignment wins: the last matching tag
+            picked[rows[matched]] = per_tag[matched]
+        else:
+            # Assign in reverse so the first matching tag is the one that sticks
+            picked[rows[matched][::-1]] = per_tag[matched][::-1]
+
+        # Label -1 maps to the trailing "" entry
+        lookup = np.append(np.asarray(labels, dtype=object), "")
+        result[name] = lookup[picked]
+
+    return pd.DataFrame(result, columns=TAG_COLUMNS)
+
+
+def add_tag_columns(df, tags_column="Tags"):
+    """
+    Recomputes the tag-derived columns of a records DataFrame from its
+    Tags column in one batch. Returns a new DataFrame.
+    """
+    parsed = parse_tags_batch(df[tags_column])
+    parsed.index = df.index
+    out = df.copy()
+    for name in TAG_COLUMNS:
+        out[name] = parsed[name]
+    return out
+
+
+def _factorize_text(values):
+    """
+    Integer codes plus the list of distinct strings (missing -> "").
+    """
+    if not isinstance(values, (pd.Series, pd.Index)):
+        values = np.asarray(values, dtype=object)
+    codes, uniques = pd.factorize(values)
+    uniques = list(uniques)
+    if (codes < 0).any():
+        codes = np.where(codes < 0, len(uniques), codes)
+        uniques.append("")
+    return codes, uniques
+
+
+def _combine(codes, other_codes, other_size):
+    """
+    Codes of the distinct (code, other_code) pairs, plus the two
+    component codes of each distinct pair.
+    """
+    pair_codes, keys = pd.factorize(codes.astype(np.int64) * other_size + other_codes)
+    return pair_codes, keys // other_size, keys % other_size
+
+
+def _date_parts(iso_dates):
+    """
+    (year, month, day, valid) arrays for a list of ISO date strings.
+    """
+    parts = np.zeros((len(iso_dates), 4), dtype=np.int64)
+    for position, value in enumerate(iso_dates):
+        try:
+            dt = datetime.strptime(value, "%Y-%m-%d")
+        except ValueError:
+            continue
+        parts[position] = (dt.year, dt.month, dt.day, 1)
+    return parts[:, 0], parts[:, 1], parts[:, 2], parts[:, 3].astype(bool)
+
+
+def _season_years(years):
+    # int(year_str) per value; valid is False where that fails
+    values = np.zeros(len(years), dtype=np.int64)
+    valid = np.zeros(len(years), dtype=bool)
+    for position, value in enumerate(years):
+        try:
+            values[position] = int(value)
+            valid[position] = True
+        except ValueError:
+            pass
+    return values, valid
+
+
+def _effective_years(seasons, years, month, date_valid):
+    """
+    compute_effective_year with month masks: seasons and years are
+    object arrays of strings, month / date_valid the parsed dates.
+    Returns (effective_year ints, valid).
+    """
+    season_lower = np.array([season.lower() for season in seasons], dtype=object)
+    season_year, year_valid = _season_years(years)
+    earlier = (((season_lower == "fall") & (month >= 11) & (month <= 12))
+               | ((season_lower == "spring") & (month >= 6) & (month <= 10)))
+    return season_year - earlier, date_valid & year_valid
+
+
+def _year_text(values, valid):
+    return np.array([str(value) if ok else "" for value, ok in zip(values.tolist(), valid)], dtype=object)
+
+
+def effective_year_batch(seasons, years, decision_dates):
+    """
+    Batch version of compute_effective_year over columns of Season,
+    Year and ISO DecisionDate strings. Returns an object array of year
+    strings ("" where the per-record function returns "").
+    """
+    season_codes, season_uniques = _factorize_text(seasons)
+    year_codes, year_uniques = _factorize_text(years)
+    date_codes, date_uniques = _factorize_text(decision_dates)
+
+    # Work on the distinct (date, year, season) combinations
+    date_year, date_part, year_part = _combine(date_codes, year_codes, len(year_uniques))
+    combo_codes, date_year_part, season_part = _combine(date_year, season_codes, len(season_uniques))
+    date_index = date_part[date_year_part]
+    _, month, _, date_valid = _date_parts(date_uniques)
+    effective, valid = _effective_years(np.array(season_uniques, dtype=object)[season_part],
+                                        np.array(year_uniques, dtype=object)[year_part[date_year_part]],
+                                        month[date_index], date_valid[date_index])
+    return _year_text(effective, valid)[combo_codes]
+
+
+def normalize_decision_dates(raw_dates, seasons, years):
+    """
+    Batch version of gradstats_debug._normalize_decision_date over
+    columns of raw decision dates ("24 Dec"), Season and Year strings.
+    Returns a DataFrame with the columns DecisionDate, effective_year
+    and failed, holding exactly what the per-record function returns.
+    """
+    raw_codes, raw_uniques = _factorize_text(raw_dates)
+    season_codes, season_uniques = _factorize_text(seasons)
+    year_codes, year_uniques = _factorize_text(years)
+
+    # Standardize each distinct (raw date, season year) pair once
+    pair_codes, pair_raw, pair_year = _combine(raw_codes, year_codes, len(year_uniques))
+    pair_raw_text = np.array(raw_uniques, dtype=object)[pair_raw]
+    pair_year_text = np.array(year_uniques, dtype=object)[pair_year]
+    standardized = np.empty(len(pair_raw_text), dtype=object)
+    for position, (raw, year) in enumerate(zip(pair_raw_text, pair_year_text)):
+        try:
+            standardized[position] = standardize_date(raw, int(year) if year else None) if raw else ""
+        except Exception:
+            standardized[position] = ""
+    failed = (pair_raw_text != "") & (standardized == "")
+
+    # Then the rules on each distinct (pair, season) combination
+    combo_codes, combo_pair, combo_season = _combine(pair_codes, season_codes, len(season_uniques))
+    season = np.array(season_uniques, dtype=object)[combo_season]
+    year_text = pair_year_text[combo_pair]
+    date_text = standardized[combo_pair]
+    date_year, month, day, date_valid = (part[combo_pair] for part in _date_parts(standardized))
+    applies = (season != "") & (year_text != "") & (date_text != "") & (date_text != pair_raw_text[combo_pair])
+    effective, valid = _effective_years(season, year_text, month, date_valid & applies)
+
+    # Move the date into effective_year; 29 Feb becomes 28 Feb outside leap
+    # years, and years datetime cannot represent keep the original date
+    moved = valid & (effective >= 1) & (effective <= 9999)
+    leap = (effective % 4 == 0) & ((effective % 100 != 0) | (effective % 400 == 0))
+    day = np.where((month == 2) & (day == 29) & ~leap, 28, day)
+    decision_dates = date_text.copy()
+    for position in np.flatnonzero(moved).tolist():
+        decision_dates[position] = datetime(int(effective[position]), int(month[position]),
+                                            int(day[position])).strftime("%Y-%m-%d")
+
+    # dtype=object skips inferring a string dtype over every row again
+    return pd.DataFrame({
+        "DecisionDate": pd.Series(decision_dates[combo_codes], dtype=object),
+        "effective_year": pd.Series(_year_text(effective, applies & valid)[combo_codes], dtype=object),
+        "failed": failed[pair_codes],
+    })
+
+
+def build_records_frame(rows):
+    """
+    Batch version of gradstats_debug.build_record: turns a list of
+    parsers.RawRow into the DataFrame pd.DataFrame([build_record(row)
+    for row in rows]) would give, one whole-column step at a time.
+    """
+    from sinks import RECORD_COLUMNS
+
+    if not rows:
+        return pd.DataFrame(columns=RECORD_COLUMNS)
+    columns = list(zip(*rows))
+    school, program, degree_type, date_posted, decision, tags, comment = columns
+
+    decision_types, decision_raw = [], []
+    for text in decision:
+        if " on " in text:
+            decision_type, date_raw = text.split(" on ", 1)
+            decision_types.append(decision_type.strip())
+            decision_raw.append(date_raw.strip())
+        else:
+            decision_types.append(text)
+            decision_raw.append("")
+
+    tag_fields = parse_tags_batch(tags)
+    decisions = normalize_decision_dates(decision_raw, tag_fields["Season"], tag_fields["Year"])
+    data = {
+        "School": list(school),
+        "Program": list(program),
+        "Degree_Type": list(degree_type),
+        "Date_Posted": standardize_date_column(pd.Series(date_posted, dtype=object)).tolist(),
+        "Decision": decision_types,
+        "DecisionDate": decisions["DecisionDate"].tolist(),
+        "Season": tag_fields["Season"].tolist(),
+        "Year": tag_fields["Year"].tolist(),
+        "effective_year": decisions["effective_year"].tolist(),
+    }
+    for name in _LAST_MATCH_COLUMNS:
+        data[name] = tag_fields[name].tolist()
+    data["Tags"] = list(tags)
+    data["Comment"] = list(comment)
+    return pd.DataFrame(data, columns=RECORD_COLUMNS)
@@ -0,0 +1,145 @@
+"""
+Pre-aggregated decision counts for timeline queries.
+
+The cube holds one row per (School, Program, Degree_Type, Season,
+effective_year, Decision, DecisionWeek) with the number of records in
+it, where DecisionWeek is the Monday of the week of the DecisionDate
+(NaT if there is none). That is a few thousand rows instead of the raw
+records, so questions like "when do decisions for these programs come
+out" are answered from the cube without rescanning the dataset.
+
+The cube is stored as <dataset root>/_cube.parquet (pyarrow skips
+files starting with "_" when reading the dataset itself). DatasetSink
+folds every flushed batch into it, so it stays current as a scrape
+appends records; rebuild_cube recomputes it from the whole dataset.
+"""
+import os
+
+import pandas as pd
+
+DIMENSIONS = ["School", "Program", "Degree_Type", "Season", "effective_year", "Decision", "DecisionWeek"]
+TEXT_DIMENSIONS = ["School", "Program", "Degree_Type", "Season", "Decision"]
+CUBE_FILE = "_cube.parquet"
+
+
+def cube_path(root):
+    return os.path.join(root, CUBE_FILE)
+
+
+def build_cube(df):
+    """
+    Aggregates records (a typed frame from dataset.to_typed_frame /
+    read_dataset, or all-text scraper records) into a cube.
+    """
+    from dataset import to_typed_frame
+
+    if not pd.api.types.is_datetime64_any_dtype(df["DecisionDate"]):
+        df = to_typed_frame(df)
+
+    dates = df["DecisionDate"]
+    keys = df[DIMENSIONS[:-1]].copy()
+    keys["DecisionWeek"] = (dates - pd.to_timedelta(dates.dt.dayofweek, unit="D")).dt.normalize()
+    return _aggregate(keys.assign(count=1))
+
+
+def _aggregate(rows):
+    counts = rows.groupby(DIMENSIONS, dropna=False, observed=True, sort=True)["count"].sum()
+    cube = counts.reset_index()
+    cube["count"] = cube["count"].astype("int64")
+    for name in TEXT_DIMENSIONS:
+        cube[name] = cube[name].astype("category")
+    return cube
+
+
+def merge_cubes(*cubes):
+    """
+    Adds up the counts of several cubes.
+    """
+    cubes = [cube for cube in cubes if cube is not None and len(cube)]
+    if not cubes:
+        return None
+    if len(cubes) == 1:
+        return cubes[0]
+    # Categoricals with different categories concatenate as plain values; _aggregate re-encodes them
+    return _aggregate(pd.concat(cubes, ignore_index=True))
+
+
+def load_cube(root):
+    """
+    The cube stored next to the dataset at `root`, or None if there is none.
+    """
+    path = cube_path(root)
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+
+def save_cube(cube, root):
+    os.makedirs(root, exist_ok=True)
+    path = cube_path(root)
+    tmp_path = path + ".tmp"
+    cube.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def update_cube(root, new_records):
+    """
+    Folds newly written records into the cube at `root`. Returns the cube.
+    """
+    cube = merge_cubes(load_cube(root), build_cube(new_records))
+    if cube is not None:
+        save_cube(cube, root)
+    return cube
+
+
+def rebuild_cube(root):
+    """
+    Recomputes the cube from every record in the dataset at `root`.
+    """
+    from dataset import read_dataset
+
+    cube = build_cube(read_dataset(root, columns=DIMENSIONS[:-1] + ["DecisionDate"]))
+    save_cube(cube, root)
+    return cube
+
+
+def decision_timeline(cube, by=("DecisionWeek",), **filters):
+    """
+    Record counts from the cube, summed over everything except `by`.
+    `filters` map a dimension to a value or a list of values, e.g.
+    decision_timeline(cube, by=["DecisionWeek", "Decision"],
+    School=["Stanford University", "Harvard University"], Season="Fall").
+    Returns a Series of counts indexed by `by`.
+    """
+    mask = pd.Series(True, index=cube.index)
+    for name, value in filters.items():
+        if name not in DIMENSIONS:
+            raise ValueError(f"unknown cube dimension {name!r}, expected one of {DIMENSIONS}")
+        if isinstance(value, (list, tuple, set)):
+            mask &= cube[name].isin(list(value))
+        else:
+            mask &= cube[name] == value
+    return cube[mask].groupby(list(by), dropna=False, observed=True)["count"].sum()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or query the decision cube of a dataset.")
+    parser.add_argument("root", help="dataset directory")
+    parser.add_argument("--rebuild", action="store_true", help="recompute the cube from the whole dataset")
+    parser.add_argument("--school", action="append", help="repeat for several schools")
+    parser.add_argument("--program", action="append")
+    parser.add_argument("--degree-type")
+    parser.add_argument("--season")
+    parser.add_argument("--decision")
+    args = parser.parse_args()
+
+    cube = rebuild_cube(args.root) if args.rebuild else load_cube(args.root)
+    if cube is None:
+        raise SystemExit(f"No cube in {args.root}; run with --rebuild.")
+    filters = {"School": args.school, "Program": args.program, "Degree_Type": args.degree_type,
+               "Season": args.season, "Decision": args.decision}
+    timeline = decision_timeline(cube, by=["DecisionWeek", "Decision"],
+                                 **{name: value for name, value in filters.items() if value})
+    print(timeline.unstack(fill_value=0).to_string())
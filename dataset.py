@@ -0,0 +1,177 @@
+"""
+Typed, columnar storage for scraped records.
+
+The CSV output keeps every column as text, so each consumer re-parses
+dates and numbers. Here the records are written once as a Parquet
+dataset partitioned by Year / Season (hive layout, e.g.
+Year=2025/Season=Fall/part-0.parquet) with:
+
+  - School, Program, Degree_Type, Decision, Season, Nationality as
+    dictionary-encoded categoricals
+  - Date_Posted, DecisionDate as date32
+  - Year, effective_year as nullable int16
+  - GRE_Total, GRE_V, GRE_AW, GPA as nullable float32
+
+read_dataset only reads the requested columns and skips partitions
+that the filters rule out. Needs pyarrow.
+"""
+import os
+import uuid
+
+import pandas as pd
+
+CATEGORICAL_COLUMNS = ["School", "Program", "Degree_Type", "Decision", "Season", "Nationality"]
+DATE_COLUMNS = ["Date_Posted", "DecisionDate"]
+INT_COLUMNS = ["Year", "effective_year"]
+FLOAT_COLUMNS = ["GRE_Total", "GRE_V", "GRE_AW", "GPA"]
+PARTITION_COLUMNS = ["Year", "Season"]
+
+
+def arrow_schema():
+    import pyarrow as pa
+
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [(name, dictionary) for name in ["School", "Program", "Degree_Type"]]
+        + [("Date_Posted", pa.date32()), ("Decision", dictionary), ("DecisionDate", pa.date32()),
+           ("Season", pa.string()), ("Year", pa.int16()), ("effective_year", pa.int16())]
+        + [(name, pa.float32()) for name in FLOAT_COLUMNS]
+        + [("Nationality", dictionary), ("Tags", pa.list_(pa.string())), ("Comment", pa.string())]
+    )
+
+
+def partition_schema(schema=None):
+    import pyarrow as pa
+
+    schema = schema or arrow_schema()
+    return pa.schema([schema.field(name) for name in PARTITION_COLUMNS])
+
+
+def _parse_dates(column):
+    # The scraper writes ISO dates; older CSVs (gradcafe.csv) have "December 25, 2024"
+    column = column.astype("string").replace("", pd.NA)
+    parsed = pd.to_datetime(column, format="%Y-%m-%d", errors="coerce")
+    missing = parsed.isna() & column.notna()
+    if missing.any():
+        parsed[missing] = pd.to_datetime(column[missing], format="%B %d, %Y", errors="coerce")
+    return parsed
+
+
+def _parse_tags(value):
+    # Tags come as lists from the scraper and as "['a', 'b']" from CSV files
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, str) and value.startswith("["):
+        import ast
+        try:
+            return list(ast.literal_eval(value))
+        except (ValueError, SyntaxError):
+            pass
+    return []
+
+
+def to_typed_frame(df):
+    """
+    Converts scraped records (all-text columns, as built by the scraper
+    or read back from a CSV) into the typed schema described above.
+    """
+    typed = pd.DataFrame(index=df.index)
+    for name in arrow_schema().names:
+        if name not in df.columns:
+            column = pd.Series(pd.NA, index=df.index, dtype="object")
+        else:
+            column = df[name]
+
+        if name in DATE_COLUMNS:
+            typed[name] = _parse_dates(column)
+        elif name in INT_COLUMNS:
+            typed[name] = pd.to_numeric(column.replace("", pd.NA), errors="coerce").astype("Int16")
+        elif name in FLOAT_COLUMNS:
+            typed[name] = pd.to_numeric(column.replace("", pd.NA), errors="coerce").astype("Float32")
+        elif name in CATEGORICAL_COLUMNS:
+            typed[name] = column.replace("", pd.NA).astype("category")
+        elif name == "Tags":
+            typed[name] = column.map(_parse_tags)
+        else:
+            typed[name] = column.fillna("").astype(str)
+    return typed.reset_index(drop=True)
+
+
+def write_dataset(df, root, typed=False):
+    """
+    Appends records to the partitioned dataset at `root`. Each call adds
+    new files, so it can be used from a sink flushing batch by batch.
+    Pass typed=True if `df` already went through to_typed_frame.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if not typed:
+        df = to_typed_frame(df)
+    table = pa.Table.from_pandas(df, schema=arrow_schema(), preserve_index=False)
+    ds.write_dataset(
+        table, root, format="parquet",
+        partitioning=ds.partitioning(partition_schema(table.schema), flavor="hive"),
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+
+def _filter_expression(filters):
+    import pyarrow.dataset as ds
+
+    expression = None
+    for name, value in (filters or {}).items():
+        field = ds.field(name)
+        if isinstance(value, (list, tuple, set)):
+            condition = field.isin(list(value))
+        else:
+            condition = field == value
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def read_dataset(root, columns=None, filters=None):
+    """
+    Loads the dataset at `root` as a typed DataFrame. `columns` limits
+    what is read; `filters` maps column -> value or list of values, e.g.
+    {"Year": [2024, 2025], "Season": "Fall", "Degree_Type": "PhD"}.
+    Filters on Year / Season only open the matching partitions.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    schema = arrow_schema()
+    dataset = ds.dataset(
+        root, format="parquet", schema=schema,
+        partitioning=ds.partitioning(partition_schema(schema), flavor="hive"),
+    )
+    table = dataset.to_table(columns=columns, filter=_filter_expression(filters))
+    nullable = {pa.int16(): pd.Int16Dtype(), pa.float32(): pd.Float32Dtype()}
+    df = table.to_pandas(date_as_object=False, types_mapper=nullable.get)
+    if "Season" in df.columns:
+        df["Season"] = df["Season"].astype("category")
+    return df
+
+
+def convert_csv(csv_path, root):
+    """
+    One-off migration of a scraper CSV into a dataset at `root`.
+    """
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    write_dataset(df, root)
+    return len(df)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a scraper CSV into a typed, partitioned Parquet dataset.")
+    parser.add_argument("csv_path")
+    parser.add_argument("root", help="dataset directory")
+    args = parser.parse_args()
+    if os.path.exists(args.root):
+        print(f"[*] Appending to existing dataset {args.root}")
+    print(f"Wrote {convert_csv(args.csv_path, args.root)} rows to {args.root}.")
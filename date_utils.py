@@ -1 +1,162 @@
+import re
 from datetime import datetime
+from functools import lru_cache
+
+# Tried in this order by standardize_date_strptime
+DATE_FORMATS = [
+    "%B %d %Y",   # e.g. "December 28 2024"
+    "%b %d %Y",   # e.g. "Dec 28 2024"
+    "%B %d",      # e.g. "December 28"
+    "%b %d",      # e.g. "Dec 28"
+    "%d %B %Y",   # e.g. "28 December 2024"
+    "%d %b %Y",   # e.g. "28 Dec 2024"
+    "%d %B",      # e.g. "28 December"
+    "%d %b",      # e.g. "28 Dec"
+]
+
+FEB_29_RE = re.compile(r'\b29\s+Feb\b', re.IGNORECASE)
+
+_MONTH_NAMES = ["January", "February", "March", "April", "May", "June", "July",
+                "August", "September", "October", "November", "December"]
+# Full names (%B) and three-letter abbreviations (%b), matched case-insensitively
+MONTHS = {name.lower(): number for number, name in enumerate(_MONTH_NAMES, start=1)}
+MONTHS.update({name[:3].lower(): number for number, name in enumerate(_MONTH_NAMES, start=1)})
+
+# What strptime accepts for %d and %Y
+_DAY_RE = re.compile(r'(?:3[01]|[12]\d|0[1-9]|[1-9])\Z', re.ASCII)
+_YEAR_RE = re.compile(r'\d{4}\Z', re.ASCII)
+
+
+def standardize_date_strptime(date_str, default_year=None):
+    """
+    Converts date strings like "December 28, 2024" or "29 Feb"
+    into ISO format (YYYY-MM-DD). If no year is provided,
+    uses default_year if specified.
+
+    Handles both "Month Day" and "Day Month" formats.
+    Replaces "29 Feb" with "28 Feb" to avoid leap year issues.
+
+    This is the original format-probing implementation; standardize_date
+    gives the same answers faster and is what the scraper uses.
+    """
+    date_str = date_str.strip().replace(",", "")  # Remove commas
+    if not date_str:
+        return ""
+
+    # Replace "29 Feb" with "28 Feb" (case-insensitive)
+    date_str = FEB_29_RE.sub('28 Feb', date_str)
+
+    for fmt in DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(date_str, fmt)
+
+            # If year is missing, assign default_year
+            if parsed.year == 1900 and default_year:
+                parsed = parsed.replace(year=default_year)
+
+            return parsed.strftime("%Y-%m-%d")
+        except ValueError:
+            continue  # Try the next format
+
+    # If none of the formats worked, return empty string
+    return ""
+
+
+def _fast_standardize(date_str, default_year):
+    """
+    Tokenizes the common "Month Day [Year]" / "Day Month [Year]" shapes
+    directly. Returns None for anything it is not sure about, so the
+    caller can fall back to standardize_date_strptime.
+    """
+    # Same order as the slow path: strip, then drop commas, which can
+    # leave edge whitespace that strptime rejects (", Dec 28")
+    date_str = date_str.strip().replace(",", "")
+    if date_str != date_str.strip():
+        return None
+    tokens = FEB_29_RE.sub('28 Feb', date_str).split()
+    if len(tokens) not in (2, 3):
+        return None
+
+    first, second = tokens[0].lower(), tokens[1].lower()
+    if first in MONTHS:
+        month, day_token = MONTHS[first], second
+    elif second in MONTHS:
+        month, day_token = MONTHS[second], first
+    else:
+        return None
+    if not _DAY_RE.match(day_token):
+        return None
+
+    year = 1900  # what strptime assumes without %Y
+    if len(tokens) == 3:
+        if not _YEAR_RE.match(tokens[2]):
+            return None
+        year = int(tokens[2])
+        if year < 1000:
+            return None  # leave strftime's padding of tiny years to the slow path
+    if year == 1900 and month == 2 and day_token == "29":
+        return None  # strptime rejects Feb 29 1900 before any default_year applies
+    if year == 1900 and default_year:
+        year = default_year
+
+    try:
+        parsed = datetime(year, month, int(day_token))
+    except (ValueError, TypeError, OverflowError):
+        return None
+    return f"{parsed.year:04d}-{parsed.month:02d}-{parsed.day:02d}"
+
+
+@lru_cache(maxsize=8192)
+def standardize_date(date_str, default_year=None):
+    """
+    Converts date strings like "December 28, 2024" or "29 Feb"
+    into ISO format (YYYY-MM-DD). If no year is provided,
+    uses default_year if specified.
+
+    Same results as standardize_date_strptime, including the
+    "29 Feb" -> "28 Feb" rule, but the usual shapes are tokenized
+    directly instead of probing eight strptime formats, and results are
+    memoized per (date_str, default_year) since the same few hundred
+    "28 Dec"-style strings come up again and again.
+    """
+    result = _fast_standardize(date_str, default_year)
+    if result is None:
+        result = standardize_date_strptime(date_str, default_year)
+    return result
+
+
+def standardize_date_column(dates, default_years=None):
+    """
+    Vectorized standardize_date over a pandas Series of date strings.
+    `default_years` is None, one year for every row, or a Series / array
+    with one year (or None) per row. Each distinct (date, year) pair is
+    converted once. Returns a Series of ISO strings ("" if unparseable).
+    """
+    import numpy as np
+    import pandas as pd
+
+    dates = pd.Series(dates).fillna("").astype(str)
+    if default_years is None or np.isscalar(default_years):
+        years = pd.Series([default_years] * len(dates), index=dates.index, dtype=object)
+    else:
+        years = pd.Series(np.asarray(default_years, dtype=object), index=dates.index)
+
+    date_codes, date_uniques = pd.factorize(dates)
+    year_codes, year_uniques = pd.factorize(years)  # missing years get -1
+    pair_codes, codes = np.unique(date_codes * (len(year_uniques) + 1) + year_codes + 1, return_inverse=True)
+
+    year_lookup = [None] + [_as_year(year) for year in year_uniques]
+    converted = np.array([
+        standardize_date(date_uniques[pair // (len(year_uniques) + 1)], year_lookup[pair % (len(year_uniques) + 1)])
+        for pair in pair_codes
+    ], dtype=object)
+    return pd.Series(converted[codes.reshape(-1)], index=dates.index, dtype=object)
+
+
+def _as_year(value):
+    # Years from a DataFrame may be NaN / NA, numpy ints or strings
+    import pandas as pd
+
+    if value is None or value == "" or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return int(value)
@@ -0,0 +1,232 @@
+"""
+Decision-date distributions, precomputed for plotting.
+
+The notebook's plots (3-day histograms and kernel densities of
+DecisionDate per Decision) are computed here for every (School,
+Program, Degree_Type, Season, effective_year, Decision) group at once,
+so a plotting front-end only has to select the rows of the groups it
+shows:
+
+  bins:     one row per group and 3-day bin of the calendar year
+            (DecisionDate is moved into effective_year by the scraper,
+            so a group's dates all fall in that year): bin_start, the
+            number of decisions in the bin, and the Gaussian kernel
+            density (per day) at the bin's middle day. Rows with no
+            decisions and a negligible density are left out.
+  summary:  one row per group: count, first / last decision date,
+            median and quantiles (linear interpolation, as pandas and
+            R's default), and the density bandwidth in days.
+  gaps:     one row per (School, Program, Degree_Type, Season,
+            effective_year): days from the median / first interview
+            and acceptance to the median / first rejection.
+
+Decision dates are whole days, so a group is reduced to its number of
+decisions per day of the year (one bincount over all groups). The
+histograms sum those days, and the densities are exact Gaussian KDEs
+computed as one matrix product of the per-day counts with the kernel
+evaluated between days and grid points. Bandwidths follow R's
+bw.nrd0 per group (rounded to half a day, one product per distinct
+bandwidth) unless a fixed bandwidth is given.
+
+    python decision_stats.py gradcafe.csv --output distributions/
+    python decision_stats.py dataset_dir --output distributions/ --bandwidth 5
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+GROUP_COLUMNS = ["School", "Program", "Degree_Type", "Season", "effective_year", "Decision"]
+GAP_COLUMNS = GROUP_COLUMNS[:-1]
+QUANTILES = [0.1, 0.25, 0.5, 0.75, 0.9]
+DAYS = 366
+BINS_FILE = "decision_bins.parquet"
+SUMMARY_FILE = "decision_summary.parquet"
+GAPS_FILE = "decision_gaps.parquet"
+_MIN_DENSITY = 1e-6
+
+
+def _day_counts(df):
+    """
+    Groups plus a (groups x 366) matrix of decisions per day of the year.
+    """
+    from dataset import to_typed_frame
+
+    if not pd.api.types.is_datetime64_any_dtype(df["DecisionDate"]):
+        df = to_typed_frame(df)
+    df = df[df["DecisionDate"].notna() & df["effective_year"].notna()]
+
+    grouped = df.groupby(GROUP_COLUMNS, observed=True, dropna=False, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    keys = grouped.size().index.to_frame(index=False)
+    days = df["DecisionDate"].dt.dayofyear.to_numpy() - 1
+    counts = np.bincount(codes * DAYS + days, minlength=len(keys) * DAYS).reshape(len(keys), DAYS)
+    return keys, counts
+
+
+def _quantile_days(counts, totals, q):
+    """
+    Linear-interpolation quantile q of each row's days, from per-day counts.
+    """
+    cumulative = np.cumsum(counts, axis=1)
+    position = q * (totals - 1)
+    low = np.floor(position).astype(np.int64)
+    high = np.ceil(position).astype(np.int64)
+    # The k-th smallest day (0-based) is the number of days with cumulative count <= k
+    low_day = (cumulative <= low[:, None]).sum(axis=1)
+    high_day = (cumulative <= high[:, None]).sum(axis=1)
+    return low_day + (position - low) * (high_day - low_day)
+
+
+def _nrd0(counts, totals):
+    """
+    R's bw.nrd0 per row: 0.9 * min(sd, IQR / 1.34) * n ** -0.2, falling
+    back to sd and then to one day when that is zero.
+    """
+    day = np.arange(DAYS)
+    mean = counts @ day / totals
+    variance = (counts @ (day ** 2) - totals * mean ** 2) / np.maximum(totals - 1, 1)
+    sd = np.sqrt(np.maximum(variance, 0))
+    iqr = _quantile_days(counts, totals, 0.75) - _quantile_days(counts, totals, 0.25)
+    spread = np.minimum(sd, iqr / 1.34)
+    spread = np.where(spread > 0, spread, np.where(sd > 0, sd, 1.0))
+    return 0.9 * spread * totals ** -0.2
+
+
+def _densities(counts, totals, bandwidths, grid):
+    """
+    Gaussian KDE of each row's days at the `grid` days: for each
+    distinct bandwidth, per-day counts times the kernel matrix.
+    """
+    densities = np.empty((len(counts), len(grid)))
+    offsets = grid[None, :] - np.arange(DAYS)[:, None]
+    for bandwidth in np.unique(bandwidths):
+        rows = bandwidths == bandwidth
+        kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+        densities[rows] = counts[rows] @ kernel
+    return densities / totals[:, None]
+
+
+def _year_starts(keys):
+    return pd.to_datetime(keys["effective_year"].astype("int64").astype(str) + "-01-01").to_numpy()
+
+
+def build_distributions(df, bin_days=3, bandwidth=None):
+    """
+    Binned counts, densities and summary statistics of the records in
+    `df` (a typed frame, or all-text scraper records). `bandwidth` is
+    in days (default: bw.nrd0 of each group). Returns (bins, summary).
+    """
+    keys, counts = _day_counts(df)
+    totals = counts.sum(axis=1)
+    if not len(keys):
+        return (pd.DataFrame(columns=GROUP_COLUMNS + ["bin_start", "count", "density"]),
+                pd.DataFrame(columns=GROUP_COLUMNS + ["count"]))
+
+    if bandwidth is None:
+        bandwidths = np.maximum(np.round(_nrd0(counts, totals) * 2) / 2, 0.5)
+    else:
+        bandwidths = np.full(len(keys), float(bandwidth))
+
+    num_bins = -(-DAYS // bin_days)
+    padded = np.zeros((len(keys), num_bins * bin_days), dtype=counts.dtype)
+    padded[:, :DAYS] = counts
+    binned = padded.reshape(len(keys), num_bins, bin_days).sum(axis=2)
+    middles = np.arange(num_bins) * bin_days + (bin_days - 1) / 2
+    densities = _densities(counts, totals, bandwidths, middles)
+
+    year_starts = _year_starts(keys)
+    group, bin_index = np.nonzero((binned > 0) | (densities >= _MIN_DENSITY))
+    bins = keys.iloc[group].reset_index(drop=True)
+    bins["bin_start"] = year_starts[group] + (bin_index * bin_days).astype("timedelta64[D]")
+    bins["count"] = binned[group, bin_index].astype("int32")
+    bins["density"] = densities[group, bin_index].astype("float32")
+
+    summary = keys.copy()
+    summary["count"] = totals.astype("int32")
+    nonzero = counts > 0
+    summary["first"] = year_starts + nonzero.argmax(axis=1).astype("timedelta64[D]")
+    summary["last"] = year_starts + (DAYS - 1 - nonzero[:, ::-1].argmax(axis=1)).astype("timedelta64[D]")
+    for q in QUANTILES:
+        name = "median" if q == 0.5 else f"q{int(q * 100):02d}"
+        summary[name] = year_starts + pd.to_timedelta(_quantile_days(counts, totals, q), unit="D").to_numpy()
+    summary["bandwidth_days"] = bandwidths.astype("float32")
+    return _compact(bins), _compact(summary)
+
+
+def timing_gaps(summary):
+    """
+    Per group without Decision: median and first Interview, Accepted and
+    Rejected dates, and the gaps in days from acceptance to rejection
+    and from interview to acceptance (NaN where a decision is missing).
+    """
+    wanted = summary[summary["Decision"].isin(["Interview", "Accepted", "Rejected"])]
+    wide = wanted.pivot_table(index=GAP_COLUMNS, columns="Decision", values=["median", "first"],
+                              aggfunc="first", observed=True, dropna=False)
+    wide = wide.dropna(how="all")
+    gaps = pd.DataFrame(index=wide.index)
+    for decision in ["Interview", "Accepted", "Rejected"]:
+        for stat in ["first", "median"]:
+            column = (stat, decision)
+            gaps[f"{stat}_{decision.lower()}"] = wide[column] if column in wide.columns else pd.NaT
+
+    def days(later, earlier):
+        return (gaps[later] - gaps[earlier]).dt.total_seconds() / 86400
+
+    gaps["accept_to_reject_days"] = days("median_rejected", "median_accepted")
+    gaps["first_accept_to_first_reject_days"] = days("first_rejected", "first_accepted")
+    gaps["interview_to_accept_days"] = days("median_accepted", "median_interview")
+    return gaps.reset_index()
+
+
+def _compact(df):
+    for name in ["School", "Program", "Degree_Type", "Season", "Decision"]:
+        if name in df.columns:
+            df[name] = df[name].astype("category")
+    if "effective_year" in df.columns:
+        df["effective_year"] = df["effective_year"].astype("Int16")
+    return df
+
+
+def save_distributions(bins, summary, directory):
+    """
+    Writes the bins, summary and timing-gap tables as Parquet files.
+    """
+    os.makedirs(directory, exist_ok=True)
+    tables = {BINS_FILE: bins, SUMMARY_FILE: summary, GAPS_FILE: _compact(timing_gaps(summary))}
+    for name, table in tables.items():
+        path = os.path.join(directory, name)
+        tmp_path = path + ".tmp"
+        table.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+
+def load_records(path):
+    """
+    The records needed here from a scraper CSV, a dataset directory or
+    a SQLite store (store.py).
+    """
+    columns = GROUP_COLUMNS + ["DecisionDate"]
+    if os.path.isdir(path):
+        from dataset import read_dataset
+        return read_dataset(path, columns=columns)
+    if path.endswith((".sqlite", ".db")):
+        from store import RecordStore
+        with RecordStore(path) as store:
+            return store.query(columns=columns)
+    return pd.read_csv(path, dtype=str, keep_default_na=False, usecols=columns)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute decision-date histograms, densities and summaries.")
+    parser.add_argument("data", help="scraper CSV, dataset directory or SQLite store")
+    parser.add_argument("--output", default="distributions", help="directory for the Parquet tables")
+    parser.add_argument("--bin-days", type=int, default=3)
+    parser.add_argument("--bandwidth", type=float, default=None, help="KDE bandwidth in days (default: bw.nrd0)")
+    args = parser.parse_args()
+
+    bins, summary = build_distributions(load_records(args.data), args.bin_days, args.bandwidth)
+    save_distributions(bins, summary, args.output)
+    print(f"{len(summary)} groups, {len(bins)} bin rows written to {args.output}.")
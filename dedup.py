@@ -0,0 +1,168 @@
+"""
+Dropping records that were already scraped, across pages and runs.
+
+While ?sort=newest is paginated, new posts push rows onto later pages,
+so the same record can be scraped twice; re-runs scrape it again. Each
+record is identified by incremental.record_fingerprint (School,
+Program, Degree_Type, Date_Posted, Decision, tags, comment), and
+FingerprintSet keeps the first 64 bits of every fingerprint seen in an
+on-disk hash table, so the check at ingest time is O(1) and the history
+never has to be loaded into pandas.
+
+The table is a memory-mapped file of 64-bit slots with linear probing
+(0 marks an empty slot), doubled whenever it gets half full. It is
+exact, unlike a Bloom filter, whose false positives would silently drop
+real records; with 64-bit keys a collision is unlikely before billions
+of records.
+
+Fingerprints of new records are only written to the table on commit(),
+which the scraper calls once the records themselves have been saved,
+so an interrupted run does not mark unsaved records as seen.
+
+    python gradstats_debug.py --sink csv --output results.csv --dedup-file .seen.fp
+"""
+import mmap
+import os
+
+import numpy as np
+
+from incremental import record_fingerprint
+
+_MAX_LOAD = 0.5
+
+
+def fingerprint_key(record):
+    """
+    The fingerprint of `record` as a non-zero 64-bit integer.
+    """
+    return int(record_fingerprint(record)[:16], 16) or 1
+
+
+class FingerprintSet:
+    """
+    On-disk set of record fingerprints. Without a path it lives in
+    memory only (deduplicates within one run).
+    """
+
+    def __init__(self, path=None, capacity=1 << 16):
+        self.path = path
+        self._pending = set()
+        if path and os.path.exists(path):
+            self._open(path)
+        else:
+            capacity = 1 << max(capacity - 1, 1).bit_length()
+            self._create(path, capacity)
+        self._count = int(np.count_nonzero(np.frombuffer(self._table, dtype=np.uint64)))
+
+    def _create(self, path, capacity):
+        if path:
+            with open(path, "wb") as f:
+                f.truncate(capacity * 8)
+            self._open(path)
+        else:
+            self._mmap = None
+            self._set_buffer(bytearray(capacity * 8))
+
+    def _open(self, path):
+        with open(path, "r+b") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0)
+        self._set_buffer(self._mmap)
+
+    def _set_buffer(self, buffer):
+        # Slots are native-endian uint64; indexing the memoryview gives plain ints
+        self._table = memoryview(buffer).cast("Q")
+        self._mask = len(self._table) - 1
+
+    def _release(self):
+        self._table.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __len__(self):
+        return self._count + len(self._pending)
+
+    def __contains__(self, key):
+        return key in self._pending or self._table[self._slot(key)] == key
+
+    def _slot(self, key):
+        # Slot holding `key`, or the empty slot where it would go
+        table, mask = self._table, self._mask
+        slot = key & mask
+        while True:
+            value = table[slot]
+            if value == 0 or value == key:
+                return slot
+            slot = (slot + 1) & mask
+
+    def filter_new(self, records):
+        """
+        The records not seen before (including earlier in `records`);
+        their fingerprints are remembered until the next commit().
+        """
+        new = []
+        for record in records:
+            key = fingerprint_key(record)
+            if key not in self:
+                self._pending.add(key)
+                new.append(record)
+        return new
+
+    def commit(self):
+        """
+        Writes the pending fingerprints to the table (and the file).
+        """
+        if not self._pending:
+            return
+        needed = self._count + len(self._pending)
+        if needed > _MAX_LOAD * len(self._table):
+            self._grow(needed)
+        table = self._table
+        for key in self._pending:
+            slot = self._slot(key)
+            if table[slot] == 0:
+                table[slot] = key
+                self._count += 1
+        self._pending = set()
+        if self._mmap is not None:
+            self._mmap.flush()
+
+    def discard_pending(self):
+        self._pending = set()
+
+    def _grow(self, needed):
+        capacity = len(self._table)
+        while needed > _MAX_LOAD * capacity:
+            capacity *= 2
+        keys = np.frombuffer(self._table, dtype=np.uint64)
+        keys = keys[keys != 0].tolist()
+        self._release()
+
+        if self.path:
+            tmp_path = self.path + ".tmp"
+            self._create(tmp_path, capacity)
+        else:
+            self._create(None, capacity)
+        table, mask = self._table, self._mask
+        for key in keys:
+            slot = key & mask
+            while table[slot]:
+                slot = (slot + 1) & mask
+            table[slot] = key
+        if self.path:
+            self._mmap.flush()
+            self._release()
+            os.replace(tmp_path, self.path)
+            self._open(self.path)
+
+    def close(self):
+        self.commit()
+        self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is not None:
+            self.discard_pending()
+        self.close()
@@ -0,0 +1,226 @@
+import random
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# What the scraper gets back for each URL. On a 304 the cached body is
+# returned with status 200 and not_modified=True. status_code is None
+# when the request never got an HTTP response (timeouts, resets, ...).
+Page = namedtuple("Page", ["url", "status_code", "text", "not_modified"])
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """
+    Spaces out requests so that each host sees at most `rate` requests
+    per second, no matter how many threads are fetching.
+    A rate of None (or 0) disables limiting.
+    """
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = {}  # host -> earliest time the next request may start
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        # Sleep outside the lock so other hosts are not held up
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class FetchStats:
+    """
+    Thread-safe counters for one PageFetcher.
+    """
+
+    FIELDS = ("requests", "retries", "not_modified", "bytes_downloaded", "bytes_saved", "failures",
+              "cache_hits", "cache_misses")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+
+    def add(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def as_dict(self):
+        with self._lock:
+            return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class PageFetcher:
+    """
+    Fetches pages over one shared keep-alive session.
+
+      - 429 / 5xx responses and connection errors are retried up to
+        `max_retries` times with exponential backoff and full jitter
+        (honouring a numeric Retry-After header).
+      - ETag / Last-Modified validators are remembered per URL and sent
+        back as If-None-Match / If-Modified-Since, so an unchanged page
+        costs a 304 instead of a full download. Without a `cache` a
+        304 needs the body in memory, so only the `max_remembered`
+        most recently fetched pages are kept for that.
+      - With a `cache` (page_cache.PageCache), fresh cached pages are
+        served without touching the network, stale ones are revalidated
+        with their stored validators, and new bodies are written back.
+        `offline=True` serves only from the cache, stale or not.
+
+    Pages served from a local copy have not_modified=True.
+    One instance can be shared by all fetch threads.
+    """
+
+    def __init__(self, pool_size=10, max_retries=3, backoff_base=0.5, backoff_max=30.0, timeout=10,
+                 cache=None, offline=False, max_remembered=128):
+        if offline and cache is None:
+            raise ValueError("offline mode needs a page cache")
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.cache = cache
+        self.offline = offline
+        self.stats = FetchStats()
+
+        self._validators_lock = threading.Lock()
+        self._validators = OrderedDict()  # url -> (etag, last_modified, text), used without a cache
+        self.max_remembered = max_remembered
+
+    def fetch(self, url):
+        cached = None
+        if self.cache is not None:
+            entry = self.cache.lookup(url)
+            if entry is not None:
+                if entry.fresh or self.offline:
+                    self.stats.add("cache_hits")
+                    return Page(url, 200, entry.text, True)
+                cached = (entry.etag, entry.last_modified, entry.text)
+            elif self.offline:
+                self.stats.add("cache_misses")
+                return Page(url, None, "", False)
+        else:
+            with self._validators_lock:
+                cached = self._validators.get(url)
+                if cached:
+                    self._validators.move_to_end(url)
+
+        headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        for attempt in range(self.max_retries + 1):
+            self.stats.add("requests")
+            retry_after = None
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException:
+                response = None
+            else:
+                if response.status_code == 304 and cached:
+                    self.stats.add("not_modified")
+                    self.stats.add("bytes_saved", len(cached[2].encode("utf-8")))
+                    if self.cache is not None:
+                        # Revalidated: restart the TTL clock
+                        self.cache.store(url, cached[2], cached[0], cached[1])
+                    return Page(url, 200, cached[2], True)
+                if response.status_code not in RETRY_STATUSES:
+                    return self._finish(url, response)
+                retry_after = response.headers.get("Retry-After")
+
+            if attempt == self.max_retries:
+                break
+            self.stats.add("retries")
+            time.sleep(self._backoff(attempt, retry_after))
+
+        self.stats.add("failures")
+        if response is None:
+            return Page(url, None, "", False)
+        return Page(url, response.status_code, response.text, False)
+
+    def _finish(self, url, response):
+        self.stats.add("bytes_downloaded", len(response.content))
+        text = response.text
+        if response.status_code == 200:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if self.cache is not None:
+                self.cache.store(url, text, etag, last_modified)
+            elif etag or last_modified:
+                with self._validators_lock:
+                    self._validators[url] = (etag, last_modified, text)
+                    self._validators.move_to_end(url)
+                    while len(self._validators) > self.max_remembered:
+                        self._validators.popitem(last=False)
+        return Page(url, response.status_code, text, False)
+
+    def _backoff(self, attempt, retry_after=None):
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(self.backoff_max, float(retry_after)))
+        return delay
+
+    def close(self):
+        self.session.close()
+
+
+def fetch_pages(urls, concurrency=1, rate_limit=None, fetch=None):
+    """
+    Yields one Page per URL, in the same order as `urls`.
+
+    With concurrency=1 pages are fetched one after another. Otherwise a
+    thread pool keeps up to `concurrency` requests in flight, and never
+    more than 2 * concurrency finished-but-unconsumed responses, so a
+    slow consumer does not make the whole page range pile up in memory.
+    `fetch` defaults to a fresh PageFetcher sized for `concurrency`.
+    """
+    if fetch is None:
+        fetch = PageFetcher(pool_size=max(concurrency, 1)).fetch
+    limiter = RateLimiter(rate_limit)
+
+    def limited_fetch(url):
+        limiter.wait(url)
+        return fetch(url)
+
+    if concurrency <= 1:
+        for url in urls:
+            yield limited_fetch(url)
+        return
+
+    window = 2 * concurrency
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = deque()
+        try:
+            for url in urls:
+                pending.append(pool.submit(limited_fetch, url))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # If the consumer stops early, don't fetch pages nobody will read
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,337 @@
+"""
+Command line entry point for the scraper and its tools.
+
+    python gradstats.py scrape --pages 1-200 --concurrency 4 --sink dataset --output data/
+    python gradstats.py scrape --discover --concurrency 8 --sink store --output gradcafe.sqlite
+    python gradstats.py parse-offline --pages 1-200 --output cached.csv
+    python gradstats.py parse-offline saved_page.html other_page.html --output pages.csv
+    python gradstats.py filter gradcafe.csv --query stats_phd_fall_2024
+    python gradstats.py stats data/
+    python gradstats.py bench decision_dates --rows 100000
+
+Only argparse is imported up front; every command imports what it
+needs when it runs (requests only for scrape, pandas only where a
+DataFrame is built, pyarrow only for Parquet input), so --help and
+light commands start quickly, and worker processes that import the
+scraper modules do not pay for the whole stack.
+"""
+import argparse
+import os
+import sys
+
+DEFAULT_OUTPUT = "gradcafe_with_program_and_effective_year.csv"
+BASE_URL = "https://www.thegradcafe.com/survey/index.php"
+LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+DEFAULT_MAX_PAGES = 50
+
+
+def page_range(text):
+    """
+    "1-50,60,70-72" -> [1, 2, ..., 50, 60, 70, 71, 72]
+    """
+    pages = set()
+    for part in text.split(","):
+        first, _, last = part.strip().partition("-")
+        try:
+            first, last = int(first), int(last or first)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid page range {part!r}, expected e.g. 1-50,60")
+        if first < 1 or last < first:
+            raise argparse.ArgumentTypeError(f"invalid page range {part!r}")
+        pages.update(range(first, last + 1))
+    return sorted(pages)
+
+
+def _add_output_arguments(parser, default_output=DEFAULT_OUTPUT):
+    parser.add_argument("--output", default=default_output)
+    parser.add_argument("--sink", choices=["csv", "dataset", "jsonl", "parquet", "store"],
+                        help="stream records to --output in this format instead of building one DataFrame")
+    parser.add_argument("--flush-every", type=int, default=50, help="pages per sink flush")
+    parser.add_argument("--canonicalize", action="store_true",
+                        help="add School_Canonical / Program_Canonical columns (see canonical.py)")
+    parser.add_argument("--parser", choices=["bs4", "lxml"], default=None, help="HTML parser backend")
+    parser.add_argument("--log-level", default="WARNING", choices=LOG_LEVELS,
+                        help="DEBUG logs every parsed field of every row")
+    parser.add_argument("--stats-file", default=None, help="also write the JSON run summary to this file")
+
+
+def _add_scrape_arguments(parser):
+    pages = parser.add_mutually_exclusive_group()
+    pages.add_argument("--max-pages", type=int, default=None,
+                       help=f"scrape pages 1..MAX_PAGES (default {DEFAULT_MAX_PAGES}, or every page with --discover)")
+    pages.add_argument("--pages", type=page_range, help="page numbers and ranges, e.g. 1-50,60")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--parse-workers", type=int, default=0, help="parser processes (0 = in-process, -1 = per core)")
+    parser.add_argument("--rate-limit", type=float, default=None, help="max requests per second")
+    parser.add_argument("--cache-dir", default=".page_cache", help="on-disk raw page cache ('' to disable)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="stop at the last-seen record and merge new rows into --output")
+    parser.add_argument("--state-file", default=".scrape_state.json")
+    parser.add_argument("--checkpoint", default=None,
+                        help="checkpoint file for --sink; an existing one resumes the scrape")
+    parser.add_argument("--dedup-file", default=None,
+                        help="drop records whose fingerprint is in this file (see dedup.py) and add the new ones")
+    parser.add_argument("--stop-after-empty", type=int, default=None,
+                        help="stop after this many empty pages in a row (0 = never; default: 3 when scraping "
+                             "up to --max-pages, never for --pages or --discover)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="gradstats", description="Scrape and analyse GradCafe survey results.")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    scrape = commands.add_parser("scrape", help="fetch and parse result pages")
+    _add_scrape_arguments(scrape)
+    scrape.add_argument("--offline", action="store_true", help="parse only pages already in the cache")
+    scrape.add_argument("--discover", action="store_true",
+                        help="find the last result page first (see pagination.py) and scrape up to it")
+    _add_output_arguments(scrape)
+
+    offline = commands.add_parser("parse-offline", help="parse cached pages or saved HTML files, without the network")
+    offline.add_argument("html_files", nargs="*", help="saved result pages (default: the page cache)")
+    _add_scrape_arguments(offline)
+    offline.set_defaults(discover=False, offline=True)
+    _add_output_arguments(offline, default_output="gradcafe_offline.csv")
+
+    commands.add_parser("filter", help="run a saved or ad-hoc query (options as in query.py)", add_help=False)
+
+    stats = commands.add_parser("stats", help="record counts of a CSV, Parquet file / dataset or SQLite store")
+    stats.add_argument("path")
+
+    bench = commands.add_parser("bench", help="run a benchmark from benchmarks/")
+    bench.add_argument("benchmark", nargs="?", help="benchmark name (omit to list them)")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # filter and bench hand their remaining arguments to another parser
+    if argv[:1] == ["filter"]:
+        from query import main as query_main
+        return query_main(argv[1:])
+    if argv[:1] == ["bench"] and len(argv) > 1:
+        return run_benchmark(argv[1], argv[2:])
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command in ("scrape", "parse-offline"):
+        _check_scrape_args(parser, args)
+    if args.command == "scrape":
+        return run_scrape(args)
+    if args.command == "parse-offline":
+        if args.html_files:
+            return parse_files(args)
+        return run_scrape(args)
+    if args.command == "stats":
+        return print_stats(args.path)
+    if args.command == "bench":
+        print("\n".join(list_benchmarks()))
+
+
+def _check_scrape_args(parser, args):
+    """
+    Rejects option combinations that would otherwise be silently ignored.
+    """
+    streamed = args.sink or (args.command == "parse-offline" and args.html_files)
+    if streamed and args.incremental:
+        parser.error("--incremental merges into a CSV and cannot be combined with --sink or HTML files; "
+                     "use --dedup-file to skip already-scraped records when streaming")
+    if streamed and args.canonicalize:
+        parser.error("--canonicalize needs the DataFrame output and cannot be combined with --sink or HTML files")
+    if args.discover and args.offline:
+        parser.error("--discover fetches pages and cannot be combined with --offline")
+    if args.offline and not (args.command == "parse-offline" and args.html_files) and not args.cache_dir:
+        parser.error("parsing offline needs a page cache; --cache-dir cannot be empty")
+
+
+def _scrape_options(args, run_stats):
+    from page_cache import PageCache
+
+    options = dict(concurrency=args.concurrency, rate_limit=args.rate_limit,
+                   cache=PageCache(args.cache_dir) if args.cache_dir else None, offline=args.offline,
+                   parser=args.parser, parse_workers=args.parse_workers,
+                   stop_after_empty=args.stop_after_empty, run_stats=run_stats)
+    if args.pages:
+        options["pages"] = args.pages
+    if args.discover:
+        from pagination import discover_last_page
+
+        last_page = discover_last_page(args.base_url, parser=args.parser, max_pages=args.max_pages,
+                                       cache=options["cache"], rate_limit=args.rate_limit)
+        print(f"Last result page: {last_page}")
+        options["pages"] = [n for n in args.pages if n <= last_page] if args.pages else list(range(1, last_page + 1))
+    if args.dedup_file:
+        from dedup import FingerprintSet
+        options["seen"] = FingerprintSet(args.dedup_file)
+    return options
+
+
+def _report_stats(run_stats, stats_file):
+    summary = run_stats.summary()
+    print(f"Run summary: {summary}")
+    if stats_file:
+        with open(stats_file, "w", encoding="utf-8") as f:
+            f.write(summary + "\n")
+
+
+def run_scrape(args):
+    from gradstats_debug import scrape_gradcafe_with_program_type, scrape_to_sink
+    from incremental import ScrapeState, merge_new_records
+    from instrumentation import RunStats, configure_logging
+    from sinks import SINKS, ScrapeCheckpoint
+
+    configure_logging(args.log_level)
+    run_stats = RunStats()
+    scrape_options = _scrape_options(args, run_stats)
+    seen = scrape_options.get("seen")
+    max_pages = args.max_pages or DEFAULT_MAX_PAGES
+
+    if args.sink:
+        checkpoint = ScrapeCheckpoint(args.checkpoint)
+        with SINKS[args.sink](args.output, append=checkpoint.started) as sink:
+            total = scrape_to_sink(sink, args.base_url, max_pages=max_pages, flush_every=args.flush_every,
+                                   checkpoint=checkpoint, **scrape_options)
+        print(f"\nWrote {total} rows to {args.output}.")
+    else:
+        scrape_state = ScrapeState.load(args.state_file) if args.incremental else None
+        df_results = scrape_gradcafe_with_program_type(args.base_url, max_pages=max_pages, state=scrape_state,
+                                                       **scrape_options)
+        if args.canonicalize:
+            from canonical import add_canonical_columns
+            df_results = add_canonical_columns(df_results)
+
+        print("\n==================== FINAL DATAFRAME (first 30 rows) ====================")
+        print(df_results.head(30))
+        print(f"Total rows: {len(df_results)}")
+
+        if args.incremental:
+            merged = merge_new_records(args.output, df_results)
+            scrape_state.save(args.state_file)
+            print(f"\nMerged {len(df_results)} new rows into {args.output} ({len(merged)} total).")
+        else:
+            df_results.to_csv(args.output, index=False)
+            print(f"\nSaved {args.output}.")
+    if seen is not None:
+        seen.close()
+    _report_stats(run_stats, args.stats_file)
+
+
+def parse_files(args):
+    """
+    parse-offline on saved HTML files: one file per page, in the order given.
+    """
+    from gradstats_debug import parse_results_page
+    from instrumentation import RunStats, configure_logging
+    from sinks import SINKS
+
+    configure_logging(args.log_level)
+    run_stats = RunStats()
+    with SINKS[args.sink or "csv"](args.output) as sink:
+        for path in args.html_files:
+            with open(path, encoding="utf-8") as f:
+                sink.write(parse_results_page(f.read(), args.parser, run_stats))
+            run_stats.count("pages_parsed")
+    print(f"Wrote {sink.records_written} rows from {len(args.html_files)} file(s) to {args.output}.")
+    _report_stats(run_stats, args.stats_file)
+
+
+def _counts_from_columns(columns):
+    """
+    Summary dict from {column name: list of values} (None / "" = missing).
+    """
+    from collections import Counter
+
+    decisions = Counter(value for value in columns["Decision"] if value)
+    seasons = Counter(f"{season} {year}" for season, year in zip(columns["Season"], columns["Year"])
+                      if season and year not in (None, ""))
+    dates = sorted(str(value)[:10] for value in columns["DecisionDate"] if value)
+    return {
+        "records": len(columns["Decision"]),
+        "decisions": dict(decisions.most_common()),
+        "seasons": dict(sorted(seasons.items())),
+        "decision_dates": [dates[0], dates[-1]] if dates else [],
+    }
+
+
+def _parquet_columns(path, names):
+    # pyarrow.parquet file by file: pyarrow.dataset would import pandas
+    import pyarrow.parquet as pq
+
+    if not os.path.isdir(path):
+        table = pq.ParquetFile(path).read(columns=names)
+        return {name: table.column(name).to_pylist() for name in names}
+
+    columns = {name: [] for name in names}
+    for directory, _, files in os.walk(path):
+        # Hive partitions: Year=2025/Season=Fall/part-....parquet
+        partition = dict(part.split("=", 1) for part in os.path.relpath(directory, path).split(os.sep) if "=" in part)
+        for name in sorted(files):
+            if not name.endswith(".parquet") or name.startswith(("_", ".")):
+                continue
+            wanted = [column for column in names if column not in partition]
+            table = pq.ParquetFile(os.path.join(directory, name)).read(columns=wanted)
+            for column in names:
+                if column in partition:
+                    value = partition[column]
+                    columns[column] += [None if value == "__HIVE_DEFAULT_PARTITION__" else value] * table.num_rows
+                else:
+                    columns[column] += table.column(column).to_pylist()
+    return columns
+
+
+def summarize(path):
+    """
+    Record count, decisions, seasons and decision-date range of a
+    scraper CSV, a Parquet file or dataset directory, or a SQLite store.
+    """
+    names = ["Decision", "Season", "Year", "DecisionDate"]
+    if os.path.isdir(path) or path.endswith(".parquet"):
+        columns = _parquet_columns(path, names)
+    elif path.endswith((".sqlite", ".db")):
+        import sqlite3
+
+        db = sqlite3.connect(path)
+        try:
+            rows = db.execute(f"SELECT {', '.join(names)} FROM records").fetchall()
+        finally:
+            db.close()
+        columns = {name: [row[i] for row in rows] for i, name in enumerate(names)}
+    else:
+        import csv
+
+        columns = {name: [] for name in names}
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                for name in names:
+                    columns[name].append(row.get(name, ""))
+    return _counts_from_columns(columns)
+
+
+def print_stats(path):
+    import json
+
+    print(json.dumps(summarize(path), indent=2, ensure_ascii=False))
+
+
+def list_benchmarks():
+    directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+    return sorted(name[:-3] for name in os.listdir(directory)
+                  if name.endswith(".py") and name not in ("__init__.py", "synthetic_pages.py"))
+
+
+def run_benchmark(name, argv):
+    import runpy
+
+    if name not in list_benchmarks():
+        raise SystemExit(f"unknown benchmark {name!r}, expected one of {list_benchmarks()}")
+    saved_argv = sys.argv
+    sys.argv = [f"benchmarks/{name}.py"] + list(argv)
+    try:
+        runpy.run_module(f"benchmarks.{name}", run_name="__main__", alter_sys=True)
+    finally:
+        sys.argv = saved_argv
+
+
+if __name__ == "__main__":
+    main()
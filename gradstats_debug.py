@@ -1,11 +1,31 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+import logging
 import re
 import time
 from datetime import datetime
+from functools import partial
 
-def scrape_gradcafe_with_program_type(base_url="https://www.thegradcafe.com/survey/index.php", max_pages=200):
+from date_utils import standardize_date
+from instrumentation import RunStats, stage
+from parsers import extract_rows
+from pipeline import parse_pages
+from records import RecordTable
+from sinks import ScrapeCheckpoint
+
+# Tag patterns, matched against the lowercased tag text
+GRE_TOTAL_RE = re.compile(r'\bgre\D*(\d+(\.\d+)?)\b')       # e.g. "GRE 324"
+GRE_V_RE     = re.compile(r'\bgre\s+v\s+(\d+(\.\d+)?)\b')    # e.g. "GRE V 156"
+GRE_AW_RE    = re.compile(r'\bgre\s+aw\s+(\d+(\.\d+)?)\b')   # e.g. "GRE AW 4.50"
+GPA_RE       = re.compile(r'\bgpa\s+(\d+(\.\d+)?)\b')        # e.g. "GPA 3.07"
+SEASON_YEAR_RE = re.compile(r'(Fall|Spring)\s+(\d{4})', re.IGNORECASE)
+
+logger = logging.getLogger("gradstats")
+
+# Empty pages in a row that end a scrape up to max_pages (see iter_scraped_pages)
+EMPTY_PAGES_TO_STOP = 3
+
+
+def scrape_gradcafe_with_program_type(base_url="https://www.thegradcafe.com/survey/index.php", max_pages=200,
+                                      compact=False, **scrape_options):
     """
     Scrapes GradCafe, capturing:
       - Program (e.g. "Education Policy")
@@ -17,183 +37,381 @@ def scrape_gradcafe_with_program_type(base_url="https://www.thegradcafe.com/surv
       - Season + Year (e.g. "Fall", "2025")
       - effective_year (custom logic based on Season, Year, and DecisionDate)
       - Date Posted (converted to standardized date if possible)
+
+    Returns one DataFrame with the records of all pages in page order.
+    Takes the same options as iter_scraped_pages; use that (or
+    scrape_to_sink) instead to stream records without holding them all.
+
+    With compact=True records are kept dictionary-encoded in a
+    records.RecordTable while scraping, and the result is the typed
+    frame of dataset.to_typed_frame (categoricals, dates, numeric
+    GRE / GPA) instead of all-text columns.
     """
+    import pandas as pd
 
-    all_data = []
-
-    for page_num in range(1, max_pages + 1):
-        page_url = f"{base_url}?page={page_num}&sort=newest"
-        print(f"\n====================================")
-        print(f"Scraping page {page_num}: {page_url}")
-        print(f"====================================\n")
-
-        response = requests.get(page_url, timeout=10)
-        if response.status_code != 200:
-            print(f"[!] Skipping page {page_num}, status {response.status_code}")
-            continue
-
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # The main table
-        results_table = soup.select_one("table.tw-min-w-full.tw-divide-y.tw-divide-gray-300")
-        if not results_table:
-            print("[!] Could not locate main results table. Possibly no entries on this page.")
-            continue
-
-        rows = results_table.select("tbody tr")
-        i = 0
-        while i < len(rows):
-            main_row = rows[i]
-            tds = main_row.select("td")
-
-            # We need at least 4 columns: School, Program, Date Posted, Decision
-            if len(tds) < 4:
-                i += 1
-                continue
-
-            # ========== Column 0 => School Name ==========
-            school_div = tds[0].select_one("div.tw-font-medium.tw-text-gray-900.tw-text-sm")
-            school = school_div.get_text(strip=True) if school_div else ""
-
-            # ========== Column 1 => Program + Program Type ==========
-            program_spans = tds[1].select("span")
-            program_name = ""
-            degree_type = ""
-            if len(program_spans) >= 2:
-                # e.g. <span>Education Policy</span><svg>...</svg><span>PhD</span>
-                program_name = program_spans[0].get_text(strip=True)
-                degree_type = program_spans[1].get_text(strip=True)
-            else:
-                # Fallback if HTML structure differs
-                fallback_text = tds[1].get_text(strip=True)
-                program_name = fallback_text
-
-            # ========== Column 2 => Date Posted ==========
-            date_posted_raw = tds[2].get_text(strip=True)
-            # We'll standardize date posted (but typically do not need a default year)
-            date_posted_std = standardize_date(date_posted_raw)
-            print(f"DEBUG: Date_Posted Raw='{date_posted_raw}' => Standardized='{date_posted_std}'")
-
-            # ========== Column 3 => Decision Text (like "Accepted on 24 Dec") ==========
-            decision_div = tds[3].select_one("div")
-            decision_text = decision_div.get_text(strip=True) if decision_div else ""
-            decision_type = decision_text
-            decision_date_raw = ""
-            if " on " in decision_text:
-                parts = decision_text.split(" on ", 1)
-                decision_type = parts[0].strip()
-                decision_date_raw = parts[1].strip()
-
-            print(f"DEBUG: Decision Raw='{decision_text}' => Type='{decision_type}', Date Raw='{decision_date_raw}'")
-
-            # ========== Next row(s) => tag row & comment row? ==========
-            tag_row = None
-            comment_row = None
-            if i + 1 < len(rows) and "tw-border-none" in rows[i+1].get("class", []):
-                tag_row = rows[i+1]
-                if i + 2 < len(rows) and "tw-border-none" in rows[i+2].get("class", []):
-                    comment_row = rows[i+2]
-                    i += 3
-                else:
-                    i += 2
-            else:
-                i += 1
-
-            # Gather tags from the tag row
-            tags_text = []
-            if tag_row:
-                tag_tds = tag_row.select("td")
-                if tag_tds:
-                    tag_divs = tag_tds[0].select("div.tw-inline-flex")
-                    for div in tag_divs:
-                        tag_str = div.get_text(strip=True)
-                        tags_text.append(tag_str)
-
-            print(f"DEBUG: Tags Extracted={tags_text}")
-
-            # ========== Parse GRE, GPA, Season, etc. from tags ==========
-            gre_total, gre_v, gre_aw, gpa, nationality = parse_extra_tags(tags_text)
-            season, year_str = parse_season_year(tags_text)  # e.g. "Fall", "2025"
-
-            print(f"DEBUG: Parsed Season='{season}', Year='{year_str}'")
-            print(f"DEBUG: Parsed GRE_Total='{gre_total}', GRE_V='{gre_v}', GRE_AW='{gre_aw}', GPA='{gpa}', Nationality='{nationality}'")
-
-            # ========== Convert Decision Date ==========
-            # Convert the decision date into ISO format, guessing the year if needed
-            decision_date_std = ""
-            if decision_date_raw:
-                try:
-                    default_year = int(year_str) if year_str else None
-                    decision_date_std = standardize_date(decision_date_raw, default_year)
-                    print(f"DEBUG: DecisionDate Raw='{decision_date_raw}' => Standardized='{decision_date_std}'")
-                except Exception as e:
-                    print(f"ERROR: Failed to standardize decision date '{decision_date_raw}' with year '{year_str}'. Error: {e}")
-
-            # ========== Possibly parse out the comment row ==========
-            comment_text = ""
-            if comment_row:
-                comment_tds = comment_row.select("td")
-                if comment_tds:
-                    c_div = comment_tds[0].select_one("p.tw-text-gray-500.tw-text-sm.tw-my-0")
-                    if c_div:
-                        comment_text = c_div.get_text(strip=True)
-
-            # ========== Compute effective_year based on your custom logic ==========
-            effective_year = ""
-            if season and year_str and decision_date_std and decision_date_std != decision_date_raw:
-                print(f"DEBUG: Before compute_effective_year -> Season={season}, Year={year_str}, DecisionDateISO={decision_date_std}")
-                effective_year = compute_effective_year(season, year_str, decision_date_std)
-                print(f"DEBUG: Computed Effective Year='{effective_year}'")
-
-                # ========== Replace the year in DecisionDate with effective_year ==========
-                try:
-                    dt = datetime.strptime(decision_date_std, '%Y-%m-%d')
-                    # Attempt to replace the year
-                    try:
-                        dt_new = dt.replace(year=int(effective_year))
-                        decision_date_std_new = dt_new.strftime('%Y-%m-%d')
-                        print(f"DEBUG: Replaced year in DecisionDate: {decision_date_std} -> {decision_date_std_new}")
-                        decision_date_std = decision_date_std_new
-                    except ValueError:
-                        # Handle invalid dates, e.g., '2025-02-29' does not exist
-                        if dt.month == 2 and dt.day == 29:
-                            # Assign to 28 Feb of effective_year
-                            dt_new = dt.replace(year=int(effective_year), day=28)
-                            decision_date_std_new = dt_new.strftime('%Y-%m-%d')
-                            print(f"DEBUG: Replaced year and adjusted day in DecisionDate: {decision_date_std} -> {decision_date_std_new}")
-                            decision_date_std = decision_date_std_new
-                        else:
-                            print(f"ERROR: Replacing year with 'effective_year' leads to invalid date. Keeping original DecisionDate='{decision_date_std}'")
-                except Exception as e:
-                    print(f"ERROR: Failed to parse DecisionDate '{decision_date_std}'. Error: {e}")
-            else:
-                print(f"WARNING: Missing or invalid data for effective year computation. Season='{season}', Year='{year_str}', DecisionDateISO='{decision_date_std}'")
-
-            # ========== Build record ==========
-            record = {
-                "School":         school,
-                "Program":        program_name,
-                "Degree_Type":    degree_type,
-                "Date_Posted":    date_posted_std,   # standardized date
-                "Decision":       decision_type,
-                "DecisionDate":   decision_date_std, # standardized date with effective_year
-                "Season":         season,     # e.g. "Fall"
-                "Year":           year_str,   # e.g. "2025"
-                "effective_year": effective_year,
-                "GRE_Total":      gre_total,
-                "GRE_V":          gre_v,
-                "GRE_AW":         gre_aw,
-                "GPA":            gpa,
-                "Nationality":    nationality,
-                "Tags":           tags_text,   # optional debug
-                "Comment":        comment_text
-            }
-            all_data.append(record)
+    if compact:
+        table = RecordTable()
+        for page_num, records in iter_scraped_pages(base_url, max_pages, **scrape_options):
+            table.append(records, page_num)
+        return table.to_frame()
+
+    page_records = dict(iter_scraped_pages(base_url, max_pages, **scrape_options))
+
+    # Retried pages finish out of order, so put records back in page order
+    all_data = [record for page_num in sorted(page_records) for record in page_records[page_num]]
 
     df = pd.DataFrame(all_data)
     return df
 
 
+def iter_scraped_pages(base_url="https://www.thegradcafe.com/survey/index.php", max_pages=200, pages=None,
+                       concurrency=1, rate_limit=None, fetcher=None, retry_rounds=1,
+                       cache=None, offline=False, state=None, seen=None, parser=None, parse_workers=0,
+                       stop_after_empty=None, run_stats=None):
+    """
+    Generator behind scrape_gradcafe_with_program_type: yields
+    (page_num, records) as each page is parsed, for pages 1..max_pages
+    (or the explicit page numbers in `pages`). Pages come in page order,
+    except that pages recovered from the retry queue come at the end.
+
+    Pages are fetched `concurrency` at a time (1 = one after another) and
+    at most `rate_limit` requests per second per host, but are always
+    parsed in page order, so the result does not depend on concurrency.
+    Pass a `fetcher` (fetch.PageFetcher) to reuse its session, ETag
+    validators and counters across calls.
+
+    With a `cache` (page_cache.PageCache) raw pages are kept on disk
+    between runs; `offline=True` parses only what is already cached.
+    `parser` picks the HTML backend (see parsers.PARSERS).
+    `parse_workers` > 0 parses pages in that many worker processes while
+    the fetch threads keep downloading (-1 = one per core).
+
+    With a `state` (incremental.ScrapeState) only records newer than the
+    previous run are returned: pagination stops at the first page that
+    reaches an already-seen record, and the state is advanced past the
+    new records (the caller saves it).
+
+    Scraping pages 1..max_pages stops after `stop_after_empty` pages in
+    a row without results (default EMPTY_PAGES_TO_STOP; 0 = never):
+    those are past the last page, so the rest of a generous max_pages
+    would be empty too. The stop is logged as a warning, since a block
+    or interstitial page also has no results. With explicit `pages`
+    (e.g. up to pagination.discover_last_page) every page is fetched
+    unless stop_after_empty is given.
+
+    With `seen` (dedup.FingerprintSet) records already seen earlier in
+    this run or in a previous one are dropped; call seen.commit() once
+    the returned records are saved.
+
+    Stage timers and counters go to `run_stats` (instrumentation.RunStats);
+    without one they are logged as a JSON summary at INFO level at the end.
+    """
+    from fetch import PageFetcher, fetch_pages
+
+    own_stats = run_stats is None
+    if own_stats:
+        run_stats = RunStats()
+
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        fetcher = PageFetcher(pool_size=max(concurrency, 1), cache=cache, offline=offline)
+    if fetcher.offline:
+        retry_rounds = 0  # a cache miss will not fix itself
+
+    if pages is None:
+        pages = range(1, max_pages + 1)
+        if stop_after_empty is None:
+            stop_after_empty = EMPTY_PAGES_TO_STOP
+    page_urls = {page_num: f"{base_url}?page={page_num}&sort=newest" for page_num in pages}
+    new_records = {}  # only kept for advancing an incremental state
+    stop_page = None  # first page that reached already-seen records, or of the empty run
+
+    # Pages that still fail after the fetcher's own retries go into a retry
+    # queue and get another pass once the rest of the range is done.
+    def timed_fetch(url):
+        with run_stats.timer("fetch"):
+            return fetcher.fetch(url)
+
+    pending = list(page_urls)
+    try:
+        for round_num in range(retry_rounds + 1):
+            if round_num:
+                logger.warning("Retry round %d: re-fetching %d skipped page(s)", round_num, len(pending))
+            retry_queue = []
+            empty_run = []
+
+            fetched = fetch_pages([page_urls[n] for n in pending], concurrency=concurrency,
+                                  rate_limit=rate_limit, fetch=timed_fetch)
+            parsed = parse_pages(zip(pending, fetched), partial(parse_page_with_stats, parser=parser),
+                                 workers=parse_workers)
+            for page_num, page, result in parsed:
+                logger.info("Scraping page %d: %s", page_num, page.url)
+
+                if page.status_code != 200:
+                    logger.warning("Skipping page %d, status %s (queued for retry)", page_num, page.status_code)
+                    run_stats.count("pages_skipped")
+                    retry_queue.append(page_num)
+                    continue
+
+                records, page_stats = result
+                run_stats.merge(page_stats)
+                run_stats.count("pages_parsed")
+
+                empty_run = [] if records else empty_run + [page_num]
+                if stop_after_empty and len(empty_run) >= stop_after_empty:
+                    skipped = len(pending) - pending.index(page_num) - 1
+                    logger.warning("Pages %d-%d have no results, stopping with %d planned page(s) not fetched.",
+                                   empty_run[0], page_num, skipped)
+                    stop_page = empty_run[0]
+                    parsed.close()
+                    fetched.close()
+                    yield page_num, records
+                    break
+
+                if state is not None:
+                    records, reached_seen = state.split_new(records)
+                    new_records[page_num] = records
+                    if reached_seen:
+                        logger.info("Page %d reaches already-seen records, stopping.", page_num)
+                        stop_page = page_num
+                        parsed.close()
+                        fetched.close()
+                        yield page_num, _drop_seen(records, seen, run_stats)
+                        break
+                yield page_num, _drop_seen(records, seen, run_stats)
+
+            pending = retry_queue
+            if stop_page is not None:
+                pending = [n for n in pending if n < stop_page]
+            if not pending:
+                break
+
+        if pending:
+            logger.warning("Gave up on %d page(s) after %d retry round(s): %s", len(pending), retry_rounds, pending)
+        run_stats.sections["fetch"] = fetcher.stats.as_dict()
+        if own_stats:
+            logger.info("Run summary: %s", run_stats.summary())
+
+        if state is not None:
+            if pending:
+                logger.warning("Not advancing the incremental state, some pages are missing.")
+            else:
+                state.advance([record for page_num in sorted(new_records) for record in new_records[page_num]])
+    finally:
+        if own_fetcher:
+            fetcher.close()
+
+
+def _drop_seen(records, seen, run_stats):
+    if seen is None:
+        return records
+    new = seen.filter_new(records)
+    run_stats.count("duplicates", len(records) - len(new))
+    return new
+
+
+def scrape_to_sink(sink, base_url="https://www.thegradcafe.com/survey/index.php", max_pages=200,
+                   flush_every=50, checkpoint=None, pages=None, **scrape_options):
+    """
+    Streams records of pages 1..max_pages (or the page numbers in
+    `pages`) into `sink` (see sinks.SINKS), flushing every `flush_every`
+    pages, so memory does not grow with the number of pages.
+
+    With a `checkpoint` (sinks.ScrapeCheckpoint) pages already flushed
+    by an earlier run are skipped and the checkpoint is saved after
+    every flush; open the sink with append=True to resume. A `seen`
+    (dedup.FingerprintSet) option is committed on every flush.
+    Returns the number of records written.
+    """
+    if checkpoint is None:
+        checkpoint = ScrapeCheckpoint()
+    if pages is None:
+        pages = list(range(1, max_pages + 1))
+        scrape_options.setdefault("stop_after_empty", EMPTY_PAGES_TO_STOP)
+    else:
+        pages = list(pages)
+    todo = [n for n in pages if not checkpoint.is_done(n)]
+    if len(todo) < len(pages):
+        logger.info("Resuming: %d page(s) already done, %d to go.", len(pages) - len(todo), len(todo))
+
+    seen = scrape_options.get("seen")
+    unflushed_pages = []
+    unflushed_records = 0
+
+    def flush():
+        sink.flush()
+        if seen is not None:
+            seen.commit()
+        checkpoint.mark_done(unflushed_pages, unflushed_records)
+        checkpoint.save()
+
+    for page_num, records in iter_scraped_pages(base_url, pages=todo, **scrape_options):
+        sink.write(records)
+        unflushed_pages.append(page_num)
+        unflushed_records += len(records)
+        if len(unflushed_pages) >= flush_every:
+            flush()
+            unflushed_pages = []
+            unflushed_records = 0
+    flush()
+    return checkpoint.records_written
+
+
+def parse_results_page(html, parser=None, stats=None):
+    """
+    Parses one GradCafe results page into a list of record dicts, using
+    the given parsers.PARSERS backend (parsers.DEFAULT_PARSER if None).
+    Returns an empty list if the main results table is missing.
+    Stage times and row counts go to `stats` (instrumentation.RunStats).
+    """
+    rows = extract_rows(html, parser, stats)
+    if rows is None:
+        logger.info("Could not locate main results table. Possibly no entries on this page.")
+        if stats is not None:
+            stats.count("pages_without_table")
+        return []
+    if stats is not None:
+        stats.count("rows", len(rows))
+    return [build_record(row, stats) for row in rows]
+
+
+def parse_page_with_stats(html, parser=None):
+    """
+    parse_results_page with its own RunStats, for the parse stage:
+    returns (records, stats.as_dict()) so the stats of pages parsed in
+    worker processes make it back to the run.
+    """
+    stats = RunStats()
+    records = parse_results_page(html, parser, stats)
+    return records, stats.as_dict()
+
+
+def build_record(row, stats=None):
+    """
+    Turns one parsers.RawRow into the final record dict: standardized
+    dates, GRE/GPA/nationality and season from the tags, effective_year.
+    Rows with a date that does not standardize count as parse_failures.
+    """
+    parse_failed = False
+
+    # ========== Column 2 => Date Posted ==========
+    date_posted_raw = row.date_posted
+    # We'll standardize date posted (but typically do not need a default year)
+    with stage(stats, "date_normalize"):
+        date_posted_std = standardize_date(date_posted_raw)
+    logger.debug("Date_Posted Raw='%s' => Standardized='%s'", date_posted_raw, date_posted_std)
+    if date_posted_raw and not date_posted_std:
+        parse_failed = True
+
+    # ========== Column 3 => Decision Text (like "Accepted on 24 Dec") ==========
+    decision_text = row.decision
+    decision_type = decision_text
+    decision_date_raw = ""
+    if " on " in decision_text:
+        parts = decision_text.split(" on ", 1)
+        decision_type = parts[0].strip()
+        decision_date_raw = parts[1].strip()
+
+    logger.debug("Decision Raw='%s' => Type='%s', Date Raw='%s'", decision_text, decision_type, decision_date_raw)
+
+    tags_text = row.tags
+    logger.debug("Tags Extracted=%s", tags_text)
+
+    # ========== Parse GRE, GPA, Season, etc. from tags ==========
+    with stage(stats, "tag_parse"):
+        gre_total, gre_v, gre_aw, gpa, nationality = parse_extra_tags(tags_text)
+        season, year_str = parse_season_year(tags_text)  # e.g. "Fall", "2025"
+
+    logger.debug("Parsed Season='%s', Year='%s'", season, year_str)
+    logger.debug("Parsed GRE_Total='%s', GRE_V='%s', GRE_AW='%s', GPA='%s', Nationality='%s'",
+                 gre_total, gre_v, gre_aw, gpa, nationality)
+
+    with stage(stats, "date_normalize"):
+        decision_date_std, effective_year, decision_failed = _normalize_decision_date(
+            decision_date_raw, season, year_str)
+    if (parse_failed or decision_failed) and stats is not None:
+        stats.count("parse_failures")
+
+    # ========== Build record ==========
+    record = {
+        "School":         row.school,
+        "Program":        row.program,
+        "Degree_Type":    row.degree_type,
+        "Date_Posted":    date_posted_std,   # standardized date
+        "Decision":       decision_type,
+        "DecisionDate":   decision_date_std, # standardized date with effective_year
+        "Season":         season,     # e.g. "Fall"
+        "Year":           year_str,   # e.g. "2025"
+        "effective_year": effective_year,
+        "GRE_Total":      gre_total,
+        "GRE_V":          gre_v,
+        "GRE_AW":         gre_aw,
+        "GPA":            gpa,
+        "Nationality":    nationality,
+        "Tags":           tags_text,   # optional debug
+        "Comment":        row.comment
+    }
+    return record
+
+
+def _normalize_decision_date(decision_date_raw, season, year_str):
+    """
+    Standardizes the decision date, computes effective_year and moves the
+    date into that year. Returns (decision_date_std, effective_year, failed).
+    """
+    failed = False
+
+    # ========== Convert Decision Date ==========
+    # Convert the decision date into ISO format, guessing the year if needed
+    decision_date_std = ""
+    if decision_date_raw:
+        try:
+            default_year = int(year_str) if year_str else None
+            decision_date_std = standardize_date(decision_date_raw, default_year)
+            logger.debug("DecisionDate Raw='%s' => Standardized='%s'", decision_date_raw, decision_date_std)
+        except Exception as e:
+            logger.error("Failed to standardize decision date '%s' with year '%s'. Error: %s",
+                         decision_date_raw, year_str, e)
+        if not decision_date_std:
+            failed = True
+
+    # ========== Compute effective_year based on your custom logic ==========
+    effective_year = ""
+    if season and year_str and decision_date_std and decision_date_std != decision_date_raw:
+        logger.debug("Before compute_effective_year -> Season=%s, Year=%s, DecisionDateISO=%s",
+                     season, year_str, decision_date_std)
+        effective_year = compute_effective_year(season, year_str, decision_date_std)
+        logger.debug("Computed Effective Year='%s'", effective_year)
+
+        # ========== Replace the year in DecisionDate with effective_year ==========
+        try:
+            dt = datetime.strptime(decision_date_std, '%Y-%m-%d')
+            # Attempt to replace the year
+            try:
+                dt_new = dt.replace(year=int(effective_year))
+                decision_date_std_new = dt_new.strftime('%Y-%m-%d')
+                logger.debug("Replaced year in DecisionDate: %s -> %s", decision_date_std, decision_date_std_new)
+                decision_date_std = decision_date_std_new
+            except ValueError:
+                # Handle invalid dates, e.g., '2025-02-29' does not exist
+                if dt.month == 2 and dt.day == 29:
+                    # Assign to 28 Feb of effective_year
+                    dt_new = dt.replace(year=int(effective_year), day=28)
+                    decision_date_std_new = dt_new.strftime('%Y-%m-%d')
+                    logger.debug("Replaced year and adjusted day in DecisionDate: %s -> %s",
+                                 decision_date_std, decision_date_std_new)
+                    decision_date_std = decision_date_std_new
+                else:
+                    logger.error("Replacing year with 'effective_year' leads to invalid date. "
+                                 "Keeping original DecisionDate='%s'", decision_date_std)
+        except Exception as e:
+            logger.error("Failed to parse DecisionDate '%s'. Error: %s", decision_date_std, e)
+    else:
+        logger.debug("Missing or invalid data for effective year computation. "
+                     "Season='%s', Year='%s', DecisionDateISO='%s'", season, year_str, decision_date_std)
+
+    return decision_date_std, effective_year, failed
+
 
 def parse_extra_tags(tags_list):
     """
@@ -209,22 +427,22 @@ def parse_extra_tags(tags_list):
         lower = tag.lower()
 
         # GRE total, e.g. "GRE 324"
-        mt = re.search(r'\bgre\D*(\d+(\.\d+)?)\b', lower)
+        mt = GRE_TOTAL_RE.search(lower)
         if mt:
             gre_total = mt.group(1)
 
         # GRE V, e.g. "GRE V 156"
-        mv = re.search(r'\bgre\s+v\s+(\d+(\.\d+)?)\b', lower)
+        mv = GRE_V_RE.search(lower)
         if mv:
             gre_v = mv.group(1)
 
         # GRE AW, e.g. "GRE AW 4.50"
-        maw = re.search(r'\bgre\s+aw\s+(\d+(\.\d+)?)\b', lower)
+        maw = GRE_AW_RE.search(lower)
         if maw:
             gre_aw = maw.group(1)
 
         # GPA, e.g. "GPA 3.07"
-        mgpa = re.search(r'\bgpa\s+(\d+(\.\d+)?)\b', lower)
+        mgpa = GPA_RE.search(lower)
         if mgpa:
             gpa = mgpa.group(1)
 
@@ -242,12 +460,11 @@ def parse_season_year(tags_list):
     Looks for something like "Fall 2025" or "Spring 2024" in the tags.
     Returns (season, year) if found, else ("", "").
     """
-    season_regex = re.compile(r'(Fall|Spring)\s+(\d{4})', re.IGNORECASE)
     season = ""
     year   = ""
 
     for tag in tags_list:
-        match = season_regex.search(tag)
+        match = SEASON_YEAR_RE.search(tag)
         if match:
             season = match.group(1).title()  # "Fall" or "Spring"
             year   = match.group(2)         # e.g. "2025"
@@ -256,63 +473,6 @@ def parse_season_year(tags_list):
     return season, year
 
 
-from datetime import datetime
-
-
-def standardize_date(date_str, default_year=None):
-    """
-    Converts date strings like "December 28, 2024" or "29 Feb"
-    into ISO format (YYYY-MM-DD). If no year is provided,
-    uses default_year if specified.
-    
-    Handles both "Month Day" and "Day Month" formats.
-    Replaces "29 Feb" with "28 Feb" to avoid leap year issues.
-    """
-    date_str = date_str.strip().replace(",", "")  # Remove commas
-    if not date_str:
-        return ""
-    
-    # Replace "29 Feb" with "28 Feb"
-    # Handle case-insensitive replacement
-    if re.search(r'\b29\s+Feb\b', date_str, re.IGNORECASE):
-        date_str = re.sub(r'\b29\s+Feb\b', '28 Feb', date_str, flags=re.IGNORECASE)
-        print(f"DEBUG: Replaced '29 Feb' with '28 Feb' in date_str='{date_str}'")
-    
-    # Expanded patterns to parse both 'Dec 23' and '23 Dec', etc.
-    date_formats = [
-        "%B %d %Y",  # e.g. "December 28 2024"
-        "%b %d %Y",  # e.g. "Dec 28 2024"
-        "%B %d",      # e.g. "December 28"
-        "%b %d",      # e.g. "Dec 28"
-        "%d %B %Y",   # e.g. "28 December 2024"
-        "%d %b %Y",   # e.g. "28 Dec 2024"
-        "%d %B",      # e.g. "28 December"
-        "%d %b",      # e.g. "28 Dec"
-    ]
-    
-    for fmt in date_formats:
-        try:
-            parsed = datetime.strptime(date_str, fmt)
-            
-            # If year is missing, assign default_year
-            if parsed.year == 1900 and default_year:
-                parsed = parsed.replace(year=default_year)
-            
-            standardized = parsed.strftime("%Y-%m-%d")
-            print(f"DEBUG: Parsed '{date_str}' with format '{fmt}' as '{standardized}'")
-            return standardized
-        except ValueError:
-            continue  # Try the next format
-    
-    # If none of the formats worked, return empty string
-    print(f"DEBUG: Failed to parse date '{date_str}'. Returning empty string.")
-    return ""
-
-
-
-
-
-
 def compute_effective_year(season, year_str, decision_date_iso):
     """
     Custom logic to determine the 'effective_year' for the decision date,
@@ -354,13 +514,9 @@ def compute_effective_year(season, year_str, decision_date_iso):
 
 
 if __name__ == "__main__":
-    # Example usage: scraping 2 pages (increase as needed).
-    df_results = scrape_gradcafe_with_program_type(max_pages=50)
+    # Same options as `python gradstats.py scrape`
+    import sys
 
-    print("\n==================== FINAL DATAFRAME (first 30 rows) ====================")
-    print(df_results.head(30))
-    print(f"Total rows: {len(df_results)}")
+    from gradstats import main
 
-    # Save to CSV:
-    df_results.to_csv("gradcafe_with_program_and_effective_year.csv", index=False)
-    print("\nSaved gradcafe_with_program_and_effective_year.csv.")
+    main(["scrape"] + sys.argv[1:])
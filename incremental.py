@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+FINGERPRINT_FIELDS = ("School", "Program", "Degree_Type", "Date_Posted", "Decision")
+
+
+def record_fingerprint(record):
+    """
+    Stable hash identifying a scraped record: School, Program,
+    Degree_Type, Date_Posted, Decision, its tags and its comment.
+    """
+    parts = [str(record.get(field, "")) for field in FINGERPRINT_FIELDS]
+    parts.append("|".join(record.get("Tags") or []))
+    parts.append(record.get("Comment", ""))
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _posted_date(value):
+    """
+    Date_Posted as a date for the high-water mark, or None when it is
+    missing, unparseable, or a year-less date that standardize_date
+    placed in 1900 (such a row may have been posted today).
+    """
+    if not value:
+        return None
+    try:
+        posted = datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+    return posted if posted.year > 1900 else None
+
+
+class ScrapeState:
+    """
+    High-water mark of a previous scrape: the newest Date_Posted seen
+    plus the fingerprints of the most recent records. Lets a refresh of
+    ?sort=newest stop as soon as it reaches rows it already has.
+    """
+
+    def __init__(self, newest_date_posted="", recent_fingerprints=(), keep_recent=1000):
+        self.newest_date_posted = newest_date_posted
+        self.recent_fingerprints = list(recent_fingerprints)
+        self.keep_recent = keep_recent
+        self._seen = set(self.recent_fingerprints)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a state file; a missing file gives an empty state.
+        """
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("newest_date_posted", ""), data.get("recent_fingerprints", []))
+
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "newest_date_posted": self.newest_date_posted,
+                "recent_fingerprints": self.recent_fingerprints,
+            }, f)
+        os.replace(tmp_path, path)
+
+    def is_seen(self, record):
+        if record_fingerprint(record) in self._seen:
+            return True
+        # Anything posted before the newest day we have was already scraped;
+        # rows from that same day, and rows without a usable date, are
+        # checked by fingerprint only.
+        date_posted = _posted_date(record.get("Date_Posted", ""))
+        newest = _posted_date(self.newest_date_posted)
+        return bool(date_posted and newest and date_posted < newest)
+
+    def split_new(self, records):
+        """
+        Returns (new_records, reached_seen) for one page in newest-first
+        order: the records before the first already-seen one, and
+        whether such a record was found (i.e. pagination can stop).
+        """
+        for index, record in enumerate(records):
+            if self.is_seen(record):
+                return records[:index], True
+        return records, False
+
+    def advance(self, new_records):
+        """
+        Moves the high-water mark past `new_records` (newest first).
+        """
+        dates = [_posted_date(r.get("Date_Posted", "")) for r in new_records]
+        dates = [date for date in dates + [_posted_date(self.newest_date_posted)] if date]
+        if dates:
+            self.newest_date_posted = max(dates).isoformat()
+
+        fingerprints = [record_fingerprint(r) for r in new_records]
+        self.recent_fingerprints = (fingerprints + self.recent_fingerprints)[:self.keep_recent]
+        self._seen = set(self.recent_fingerprints)
+
+
+def merge_new_records(csv_path, new_df):
+    """
+    Puts newly scraped rows on top of the dataset at `csv_path`
+    (created if missing) and returns the merged DataFrame.
+    """
+    import pandas as pd
+
+    if os.path.exists(csv_path):
+        existing = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+        merged = pd.concat([new_df.astype(str), existing], ignore_index=True)
+    else:
+        merged = new_df
+    merged.to_csv(csv_path, index=False)
+    return merged
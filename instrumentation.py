@@ -0,0 +1,113 @@
+"""
+Run-level instrumentation for the scraper.
+
+RunStats collects per-stage timers and counters while a scrape runs and
+turns them into one JSON summary at the end:
+
+  timers:   fetch, soup_build, row_parse, tag_parse, date_normalize
+            (seconds, summed over fetch threads / parse processes)
+  counters: pages_parsed, pages_skipped, pages_without_table, rows,
+            parse_failures, duplicates
+
+Logging goes through the standard `logging` module under the
+"gradstats" logger. Nothing is printed unless the application calls
+configure_logging (or sets up logging itself); the default level is
+WARNING, so per-row debug messages cost one level check each.
+"""
+import json
+import logging
+import threading
+import time
+from contextlib import nullcontext
+
+TIMERS = ("fetch", "soup_build", "row_parse", "tag_parse", "date_normalize")
+COUNTERS = ("pages_parsed", "pages_skipped", "pages_without_table", "rows", "parse_failures", "duplicates")
+
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+
+class _Timer:
+    __slots__ = ("stats", "name", "start")
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stats.add_time(self.name, time.perf_counter() - self.start)
+
+
+class RunStats:
+    """
+    Thread-safe stage timers and counters for one run. Stats gathered in
+    another process come back as as_dict() output and are merged in.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timers = dict.fromkeys(TIMERS, 0.0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.sections = {}  # extra summary sections, e.g. {"fetch": FetchStats.as_dict()}
+        self.started = time.perf_counter()
+
+    def timer(self, name):
+        """
+        Context manager adding the time spent in its block to `name`.
+        """
+        return _Timer(self, name)
+
+    def add_time(self, name, seconds):
+        with self._lock:
+            self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, other):
+        """
+        Adds the timers and counters of another RunStats or its as_dict().
+        """
+        if isinstance(other, RunStats):
+            other = other.as_dict()
+        with self._lock:
+            for name, seconds in other.get("timers", {}).items():
+                self.timers[name] = self.timers.get(name, 0.0) + seconds
+            for name, amount in other.get("counters", {}).items():
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def as_dict(self):
+        with self._lock:
+            return {"timers": dict(self.timers), "counters": dict(self.counters)}
+
+    def summary(self):
+        """
+        The end-of-run JSON summary: timers rounded to milliseconds, the
+        counters, wall-clock time and the extra sections.
+        """
+        data = self.as_dict()
+        summary = {
+            "wall_seconds": round(time.perf_counter() - self.started, 3),
+            "timers": {name: round(seconds, 3) for name, seconds in data["timers"].items()},
+            "counters": data["counters"],
+        }
+        summary.update(self.sections)
+        return json.dumps(summary, sort_keys=True)
+
+
+def stage(stats, name):
+    """
+    stats.timer(name), or a no-op if there is no RunStats to report to.
+    """
+    return stats.timer(name) if stats is not None else nullcontext()
+
+
+def configure_logging(level="WARNING"):
+    """
+    Sends log records to stderr at `level` (a name or number).
+    """
+    logging.basicConfig(level=level, format=LOG_FORMAT)
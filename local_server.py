@@ -0,0 +1,92 @@
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """
+    Answers every GET with the fixture page after sleeping `latency`
+    seconds, like a slow GradCafe. Pages past `num_pages` come back
+    without a results table.
+
+    Every page carries an ETag and honours If-None-Match with a 304.
+    server.flaky_pages maps page number -> how many more times that
+    page should fail with a 503 before it is served normally.
+    """
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency)
+
+        query = parse_qs(urlparse(self.path).query)
+        page_num = int(query.get("page", ["1"])[0])
+
+        with server.lock:
+            server.hits += 1
+            failures_left = server.flaky_pages.get(page_num, 0)
+            if failures_left:
+                server.flaky_pages[page_num] = failures_left - 1
+        if failures_left:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if server.num_pages is not None and page_num > server.num_pages:
+            body = b"<html><body><p>No results.</p></body></html>"
+        else:
+            body = server.pages(page_num)
+
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep test / benchmark output clean
+
+
+def serve_fixture(html_path="test_sc.html", latency=0.0, num_pages=None, flaky_pages=None, port=0):
+    """
+    Starts a local stand-in for the GradCafe survey pages in a
+    background thread and returns (server, base_url).
+    Call server.shutdown() when done.
+    """
+    with open(html_path, "rb") as f:
+        html = f.read()
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), FixtureHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.num_pages = num_pages
+    server.flaky_pages = dict(flaky_pages or {})
+    server.pages = lambda page_num: html
+    server.lock = threading.Lock()
+    server.hits = 0
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/survey/index.php"
+    return server, base_url
+
+
+if __name__ == "__main__":
+    server, base_url = serve_fixture(latency=0.05, port=8000)
+    print(f"Serving test_sc.html at {base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
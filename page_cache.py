@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import namedtuple
+from urllib.parse import parse_qs, urlparse
+
+CacheEntry = namedtuple("CacheEntry", ["url", "text", "etag", "last_modified", "fetched_at", "fresh"])
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+
+def default_ttl(page_num):
+    """
+    How long (in seconds) a cached page stays fresh, by depth in
+    ?sort=newest. Page 1 changes constantly, deep pages almost never.
+    """
+    if page_num <= 1:
+        return 10 * 60
+    if page_num <= 10:
+        return HOUR
+    if page_num <= 100:
+        return DAY
+    return 30 * DAY
+
+
+def page_number(url):
+    """
+    Reads the ?page=N query parameter of a survey URL (1 if missing).
+    """
+    query = parse_qs(urlparse(url).query)
+    try:
+        return int(query.get("page", ["1"])[0])
+    except ValueError:
+        return 1
+
+
+class PageCache:
+    """
+    On-disk cache of raw page HTML.
+
+    Each entry is one zlib-compressed JSON file named after the SHA-256
+    of its URL, holding the body plus its ETag / Last-Modified and the
+    time it was fetched. Freshness is decided per page depth by `ttl`
+    (page number -> seconds). A file's mtime is bumped on every read,
+    and once the directory grows past `max_bytes` the least recently
+    used entries are deleted.
+    """
+
+    def __init__(self, cache_dir=".page_cache", max_bytes=512 * 1024 * 1024, ttl=default_ttl):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._total_bytes = sum(size for _, _, size in self._entries())
+
+    def path_for(self, url):
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".json.z")
+
+    def lookup(self, url):
+        """
+        Returns the CacheEntry for `url` (fresh or stale), or None.
+        """
+        path = self.path_for(url)
+        try:
+            with open(path, "rb") as f:
+                data = json.loads(zlib.decompress(f.read()))
+        except (OSError, ValueError, zlib.error):
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+
+        age = time.time() - data["fetched_at"]
+        fresh = age < self.ttl(page_number(url))
+        return CacheEntry(url, data["text"], data.get("etag"), data.get("last_modified"), data["fetched_at"], fresh)
+
+    def store(self, url, text, etag=None, last_modified=None):
+        payload = json.dumps({
+            "url": url,
+            "text": text,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        }).encode("utf-8")
+        blob = zlib.compress(payload, 6)
+
+        path = self.path_for(url)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+
+        with self._lock:
+            try:
+                old_size = os.path.getsize(path)
+            except OSError:
+                old_size = 0
+            os.replace(tmp_path, path)
+            self._total_bytes += len(blob) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json.z"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            yield path, st.st_mtime, st.st_size
+
+    def _evict(self):
+        # Drop least recently used entries until we are back under 90% of the cap
+        target = self.max_bytes * 0.9
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._total_bytes = total
+
+    def __len__(self):
+        return sum(1 for _ in self._entries())
@@ -0,0 +1,148 @@
+"""
+Finding how many result pages there are before scraping them.
+
+The survey has no "total pages" API, but every page carries a
+pagination widget whose last link (?page=44148 in test_sc.html) is the
+last page. discover_last_page reads that from page 1 and checks it
+with two requests: the claimed last page must have a results table and
+the page after it must not. If the widget is missing or out of date
+(results posted since, a stand-in server), the last page is found by
+probing instead: double the page number until a page comes back
+empty, then bisect between the last full and the first empty page,
+about 2 * log2(pages) requests.
+
+With the bound known, the page range can be split exactly (see
+gradstats.py scrape --discover and shards.py --discover) instead of
+guessing a max_pages and fetching hundreds of empty pages past the
+end. iter_scraped_pages also stops by itself after a run of empty
+pages, for scrapes that still pass a generous max_pages.
+
+    python pagination.py --base-url http://127.0.0.1:8000/survey/index.php
+"""
+import logging
+import re
+
+from parsers import extract_rows
+
+# ?page=N / &page=N / &amp;page=N in the pagination links
+PAGE_LINK_RE = re.compile(r'[?&;]page=(\d+)')
+
+logger = logging.getLogger("gradstats")
+
+
+def last_page_link(html):
+    """
+    The highest page number linked from a page, or None without links.
+    """
+    numbers = [int(number) for number in PAGE_LINK_RE.findall(html)]
+    return max(numbers) if numbers else None
+
+
+def probe_last_page(has_results, known_full=1, known_empty=None, limit=None):
+    """
+    Last page p with has_results(p), given that page `known_full` has
+    results and (if given) page `known_empty` has none. Pages are
+    assumed full up to the last one and empty after it. Never looks
+    past `limit`.
+    """
+    full, empty = known_full, known_empty
+    while empty is None:
+        if limit is not None and full >= limit:
+            return limit
+        candidate = full * 2 if limit is None else min(full * 2, limit)
+        if has_results(candidate):
+            full = candidate
+        else:
+            empty = candidate
+    while empty - full > 1:
+        middle = (full + empty) // 2
+        if has_results(middle):
+            full = middle
+        else:
+            empty = middle
+    return full
+
+
+class _PageChecker:
+    """
+    has_results for probe_last_page: fetches each page once and checks
+    it for result rows.
+    """
+
+    def __init__(self, base_url, fetcher, parser=None, limiter=None):
+        self.base_url = base_url
+        self.fetcher = fetcher
+        self.parser = parser
+        self.limiter = limiter
+        self.pages = {}  # page_num -> html
+        self.requests = 0
+
+    def html(self, page_num):
+        if page_num not in self.pages:
+            url = f"{self.base_url}?page={page_num}&sort=newest"
+            if self.limiter is not None:
+                self.limiter.wait(url)
+            page = self.fetcher.fetch(url)
+            self.requests += 1
+            if page.status_code != 200:
+                # Treating a failed page as empty could cut the scrape short
+                raise RuntimeError(f"could not fetch page {page_num} (status {page.status_code}) to find the last page")
+            self.pages[page_num] = page.text
+        return self.pages[page_num]
+
+    def __call__(self, page_num):
+        return bool(extract_rows(self.html(page_num), self.parser))
+
+
+def discover_last_page(base_url="https://www.thegradcafe.com/survey/index.php", fetcher=None, parser=None,
+                       max_pages=None, cache=None, rate_limit=None):
+    """
+    Number of the last result page (0 if page 1 has no results), at
+    most `max_pages`. Uses `fetcher` (fetch.PageFetcher, default: a new
+    one over `cache`), so pages fetched here are served from the cache
+    or revalidated by the scrape that follows. Probes are spaced out to
+    at most `rate_limit` requests per second, like the scrape itself.
+    """
+    from fetch import PageFetcher, RateLimiter
+
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        fetcher = PageFetcher(pool_size=1, cache=cache)
+    try:
+        has_results = _PageChecker(base_url, fetcher, parser, RateLimiter(rate_limit))
+        if not has_results(1):
+            return 0
+
+        hint = last_page_link(has_results.html(1))
+        if max_pages is not None and hint is not None:
+            hint = min(hint, max_pages)
+        if hint is None or hint <= 1:
+            last = probe_last_page(has_results, limit=max_pages)
+        elif not has_results(hint):
+            last = probe_last_page(has_results, known_empty=hint)
+        elif hint == max_pages or not has_results(hint + 1):
+            last = hint
+        else:
+            logger.info("Pages continue past the pagination widget's last page %d.", hint)
+            last = probe_last_page(has_results, known_full=hint + 1, limit=max_pages)
+        logger.info("Last result page is %d (%d page request(s)).", last, has_results.requests)
+        return last
+    finally:
+        if own_fetcher:
+            fetcher.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from instrumentation import configure_logging
+
+    parser = argparse.ArgumentParser(description="Find the number of GradCafe result pages.")
+    parser.add_argument("--base-url", default="https://www.thegradcafe.com/survey/index.php")
+    parser.add_argument("--max-pages", type=int, default=None)
+    parser.add_argument("--rate-limit", type=float, default=None, help="max requests per second")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args()
+
+    configure_logging(args.log_level)
+    print(discover_last_page(args.base_url, max_pages=args.max_pages, rate_limit=args.rate_limit))
@@ -0,0 +1,235 @@
+"""
+Parser backends for GradCafe result pages.
+
+Each backend takes the raw page HTML and returns a list of RawRow, one
+per result (main row + optional tag row + optional comment row), or
+None if the main results table is missing. Turning a RawRow into a
+record (dates, tags, effective_year) is shared and lives in
+gradstats_debug.build_record, so backends only have to agree on text.
+With a `stats` (instrumentation.RunStats) the time spent building the
+document tree and walking its rows goes to the soup_build / row_parse
+timers.
+
+  - "bs4":  BeautifulSoup with html.parser and CSS selects (the original)
+  - "lxml": lxml.html with precompiled XPath, several times faster
+"""
+from collections import namedtuple
+
+from instrumentation import stage
+
+RawRow = namedtuple("RawRow", ["school", "program", "degree_type", "date_posted", "decision", "tags", "comment"])
+
+RESULTS_TABLE_CLASSES = ("tw-min-w-full", "tw-divide-y", "tw-divide-gray-300")
+SCHOOL_DIV_CLASSES = ("tw-font-medium", "tw-text-gray-900", "tw-text-sm")
+COMMENT_P_CLASSES = ("tw-text-gray-500", "tw-text-sm", "tw-my-0")
+
+
+def extract_rows_bs4(html, stats=None):
+    from bs4 import BeautifulSoup
+
+    with stage(stats, "soup_build"):
+        soup = BeautifulSoup(html, "html.parser")
+
+    with stage(stats, "row_parse"):
+        return _walk_rows_bs4(soup)
+
+
+def _walk_rows_bs4(soup):
+    # The main table
+    results_table = soup.select_one("table.tw-min-w-full.tw-divide-y.tw-divide-gray-300")
+    if not results_table:
+        return None
+
+    raw_rows = []
+    rows = results_table.select("tbody tr")
+    i = 0
+    while i < len(rows):
+        main_row = rows[i]
+        tds = main_row.select("td")
+
+        # We need at least 4 columns: School, Program, Date Posted, Decision
+        if len(tds) < 4:
+            i += 1
+            continue
+
+        # ========== Column 0 => School Name ==========
+        school_div = tds[0].select_one("div.tw-font-medium.tw-text-gray-900.tw-text-sm")
+        school = school_div.get_text(strip=True) if school_div else ""
+
+        # ========== Column 1 => Program + Program Type ==========
+        program_spans = tds[1].select("span")
+        program_name = ""
+        degree_type = ""
+        if len(program_spans) >= 2:
+            # e.g. <span>Education Policy</span><svg>...</svg><span>PhD</span>
+            program_name = program_spans[0].get_text(strip=True)
+            degree_type = program_spans[1].get_text(strip=True)
+        else:
+            # Fallback if HTML structure differs
+            program_name = tds[1].get_text(strip=True)
+
+        # ========== Column 2 => Date Posted ==========
+        date_posted_raw = tds[2].get_text(strip=True)
+
+        # ========== Column 3 => Decision Text (like "Accepted on 24 Dec") ==========
+        decision_div = tds[3].select_one("div")
+        decision_text = decision_div.get_text(strip=True) if decision_div else ""
+
+        # ========== Next row(s) => tag row & comment row? ==========
+        tag_row = None
+        comment_row = None
+        if i + 1 < len(rows) and "tw-border-none" in rows[i+1].get("class", []):
+            tag_row = rows[i+1]
+            if i + 2 < len(rows) and "tw-border-none" in rows[i+2].get("class", []):
+                comment_row = rows[i+2]
+                i += 3
+            else:
+                i += 2
+        else:
+            i += 1
+
+        # Gather tags from the tag row
+        tags_text = []
+        if tag_row:
+            tag_tds = tag_row.select("td")
+            if tag_tds:
+                tag_divs = tag_tds[0].select("div.tw-inline-flex")
+                for div in tag_divs:
+                    tags_text.append(div.get_text(strip=True))
+
+        # Comment text from the comment row
+        comment_text = ""
+        if comment_row:
+            comment_tds = comment_row.select("td")
+            if comment_tds:
+                c_div = comment_tds[0].select_one("p.tw-text-gray-500.tw-text-sm.tw-my-0")
+                if c_div:
+                    comment_text = c_div.get_text(strip=True)
+
+        raw_rows.append(RawRow(school, program_name, degree_type, date_posted_raw, decision_text,
+                               tags_text, comment_text))
+
+    return raw_rows
+
+
+def _has_classes(*classes):
+    # XPath predicate equivalent to the CSS selector ".a.b.c"
+    return " and ".join(f"contains(concat(' ', normalize-space(@class), ' '), ' {c} ')" for c in classes)
+
+
+try:
+    from lxml import etree
+    import lxml.html
+except ImportError:  # lxml is optional, the bs4 backend always works
+    etree = None
+else:
+    _XP_TABLE = etree.XPath(f"(//table[{_has_classes(*RESULTS_TABLE_CLASSES)}])[1]")
+    _XP_ROWS = etree.XPath(".//tbody//tr")
+    _XP_TDS = etree.XPath(".//td")
+    _XP_SCHOOL = etree.XPath(f"(.//div[{_has_classes(*SCHOOL_DIV_CLASSES)}])[1]")
+    _XP_SPANS = etree.XPath(".//span")
+    _XP_FIRST_DIV = etree.XPath("(.//div)[1]")
+    _XP_TAG_DIVS = etree.XPath(f".//div[{_has_classes('tw-inline-flex')}]")
+    _XP_COMMENT = etree.XPath(f"(.//p[{_has_classes(*COMMENT_P_CLASSES)}])[1]")
+
+
+def _text(el):
+    # Same as bs4's get_text(strip=True): strip every text node, join them
+    return "".join(s.strip() for s in el.itertext())
+
+
+def _first_text(matches):
+    return _text(matches[0]) if matches else ""
+
+
+def extract_rows_lxml(html, stats=None):
+    if etree is None:
+        raise ImportError("the lxml parser backend needs lxml installed")
+
+    if not html.strip():
+        return None  # lxml refuses empty documents
+    with stage(stats, "soup_build"):
+        doc = lxml.html.fromstring(html)
+        # bs4 leaves script/style contents out of get_text(); do the same
+        etree.strip_elements(doc, "script", "style", "template", with_tail=False)
+
+    with stage(stats, "row_parse"):
+        return _walk_rows_lxml(doc)
+
+
+def _walk_rows_lxml(doc):
+    tables = _XP_TABLE(doc)
+    if not tables:
+        return None
+
+    raw_rows = []
+    rows = _XP_ROWS(tables[0])
+    row_classes = [row.get("class", "").split() for row in rows]
+    i = 0
+    while i < len(rows):
+        tds = _XP_TDS(rows[i])
+        if len(tds) < 4:
+            i += 1
+            continue
+
+        school = _first_text(_XP_SCHOOL(tds[0]))
+
+        program_spans = _XP_SPANS(tds[1])
+        if len(program_spans) >= 2:
+            program_name = _text(program_spans[0])
+            degree_type = _text(program_spans[1])
+        else:
+            program_name = _text(tds[1])
+            degree_type = ""
+
+        date_posted_raw = _text(tds[2])
+        decision_text = _first_text(_XP_FIRST_DIV(tds[3]))
+
+        tag_row = None
+        comment_row = None
+        if i + 1 < len(rows) and "tw-border-none" in row_classes[i+1]:
+            tag_row = rows[i+1]
+            if i + 2 < len(rows) and "tw-border-none" in row_classes[i+2]:
+                comment_row = rows[i+2]
+                i += 3
+            else:
+                i += 2
+        else:
+            i += 1
+
+        tags_text = []
+        if tag_row is not None:
+            tag_tds = _XP_TDS(tag_row)
+            if tag_tds:
+                tags_text = [_text(div) for div in _XP_TAG_DIVS(tag_tds[0])]
+
+        comment_text = ""
+        if comment_row is not None:
+            comment_tds = _XP_TDS(comment_row)
+            if comment_tds:
+                comment_text = _first_text(_XP_COMMENT(comment_tds[0]))
+
+        raw_rows.append(RawRow(school, program_name, degree_type, date_posted_raw, decision_text,
+                               tags_text, comment_text))
+
+    return raw_rows
+
+
+PARSERS = {
+    "bs4": extract_rows_bs4,
+    "lxml": extract_rows_lxml,
+}
+
+DEFAULT_PARSER = "lxml" if etree is not None else "bs4"
+
+
+def extract_rows(html, parser=None, stats=None):
+    """
+    Runs the named backend (DEFAULT_PARSER if None) over one page.
+    """
+    name = parser or DEFAULT_PARSER
+    try:
+        backend = PARSERS[name]
+    except KeyError:
+        raise ValueError(f"unknown parser backend {name!r}, expected one of {sorted(PARSERS)}") from None
+    return backend(html, stats)
@@ -0,0 +1,53 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# The pool starts while fetch threads (and urllib3's pool locks) are live;
+# a forked child could inherit a lock held mid-request and deadlock, so
+# workers start from a clean process instead.
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def parse_pages(numbered_pages, parse, workers=0):
+    """
+    Second stage of the scrape pipeline: turns (page_num, Page) pairs
+    from the fetch stage into (page_num, Page, records) in the same
+    order. Pages that did not come back with a 200 get records=None.
+
+    With workers=0 pages are parsed in this process. Otherwise a pool
+    of `workers` processes parses them (`parse` must be picklable, e.g.
+    a module-level function or a functools.partial of one), so parsing
+    is not held up by the GIL. At most 2 * workers pages are in flight,
+    and the fetch stage is only pulled when there is room, which keeps
+    memory flat however many pages are scraped.
+    """
+    if workers < 0:
+        workers = os.cpu_count() or 1
+
+    if workers == 0:
+        for page_num, page in numbered_pages:
+            records = parse(page.text) if page.status_code == 200 else None
+            yield page_num, page, records
+        return
+
+    window = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(_START_METHOD)) as pool:
+        pending = deque()
+
+        def finish(item):
+            page_num, page, future = item
+            return page_num, page, future.result() if future is not None else None
+
+        try:
+            for page_num, page in numbered_pages:
+                future = pool.submit(parse, page.text) if page.status_code == 200 else None
+                pending.append((page_num, page, future))
+                if len(pending) >= window:
+                    yield finish(pending.popleft())
+            while pending:
+                yield finish(pending.popleft())
+        finally:
+            for _, _, future in pending:
+                if future is not None:
+                    future.cancel()
@@ -0,0 +1,242 @@
+"""
+Declarative filters over scraped records.
+
+A query spec is a dict (e.g. loaded from saved_queries.json) with any of
+
+  schools, programs, degree_types, seasons, decisions    lists of names
+  years, effective_years                                  lists of ints
+  decision_from, decision_to, posted_from, posted_to     ISO dates, inclusive
+
+A record matches when it matches every key given (a single value works
+as a one-element list). A list of specs matches records that match any
+of them, e.g. "Statistics PhD at UCLA, or Statistical Science PhD at Duke".
+
+RecordIndex keeps the records as a typed frame (see dataset.py) with
+School and Program rows pre-sorted by category code, so a query naming
+schools or programs only looks at the rows of those schools / programs
+instead of comparing strings across the whole frame.
+
+Command line (replaces the hardcoded filter.py):
+    python query.py gradcafe.csv --query stats_phd_fall_2024 --output filtered.csv
+    python query.py dataset_dir --school "Duke University" --degree-type PhD --save duke_phd
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+SAVED_QUERIES = "saved_queries.json"
+
+# spec key -> record column
+LIST_FILTERS = {
+    "schools": "School",
+    "programs": "Program",
+    "degree_types": "Degree_Type",
+    "seasons": "Season",
+    "decisions": "Decision",
+    "years": "Year",
+    "effective_years": "effective_year",
+}
+RANGE_FILTERS = {
+    "decision_from": ("DecisionDate", ">="),
+    "decision_to": ("DecisionDate", "<="),
+    "posted_from": ("Date_Posted", ">="),
+    "posted_to": ("Date_Posted", "<="),
+}
+INDEXED_COLUMNS = ["School", "Program"]
+
+
+def _as_list(value):
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def validate_spec(spec):
+    """
+    Raises ValueError for keys that are not filters (typos would
+    otherwise silently match everything).
+    """
+    for part in spec if isinstance(spec, list) else [spec]:
+        unknown = set(part) - set(LIST_FILTERS) - set(RANGE_FILTERS)
+        if unknown:
+            raise ValueError(f"unknown query keys {sorted(unknown)}, expected some of "
+                             f"{sorted(LIST_FILTERS) + sorted(RANGE_FILTERS)}")
+
+
+class _Postings:
+    """
+    Row positions of a categorical column grouped by category code:
+    rows with code c are order[bounds[c]:bounds[c + 1]].
+    """
+
+    def __init__(self, column):
+        self.categories = column.cat.categories
+        self.codes = column.cat.codes.to_numpy()
+        self.order = np.argsort(self.codes, kind="stable")
+        # Missing values have code -1 and sort first; bounds[c] is where code c starts
+        self.bounds = np.searchsorted(self.codes[self.order], np.arange(len(self.categories) + 1))
+
+    def wanted_codes(self, values):
+        codes = self.categories.get_indexer(values)
+        return codes[codes >= 0]
+
+    def count(self, values):
+        return sum(self.bounds[code + 1] - self.bounds[code] for code in self.wanted_codes(values))
+
+    def rows(self, values):
+        slices = [self.order[self.bounds[code]:self.bounds[code + 1]] for code in self.wanted_codes(values)]
+        return np.sort(np.concatenate(slices)) if slices else np.empty(0, dtype=np.intp)
+
+
+class RecordIndex:
+    """
+    Records plus sorted School / Program indexes, built once and queried
+    many times.
+    """
+
+    def __init__(self, df):
+        from dataset import to_typed_frame
+
+        if not pd.api.types.is_datetime64_any_dtype(df["DecisionDate"]):
+            df = to_typed_frame(df)
+        self.df = df.reset_index(drop=True)
+        self._postings = {name: _Postings(self.df[name]) for name in INDEXED_COLUMNS}
+
+    @classmethod
+    def load(cls, path):
+        """
+        From a scraper CSV or a dataset directory (see dataset.py).
+        """
+        if os.path.isdir(path):
+            from dataset import read_dataset
+            return cls(read_dataset(path))
+        return cls(pd.read_csv(path, dtype=str, keep_default_na=False))
+
+    def positions(self, spec):
+        """
+        Sorted row positions of the records matching `spec`.
+        """
+        validate_spec(spec)
+        if isinstance(spec, list):
+            matches = [self.positions(part) for part in spec]
+            return np.unique(np.concatenate(matches)) if matches else np.empty(0, dtype=np.intp)
+
+        # Start from the rows of the most selective indexed column...
+        indexed = [(self._postings[column], _as_list(spec[key])) for key, column in LIST_FILTERS.items()
+                   if column in INDEXED_COLUMNS and spec.get(key) is not None]
+        indexed.sort(key=lambda item: item[0].count(item[1]))
+        if indexed:
+            postings, values = indexed[0]
+            candidates = postings.rows(values)
+            # ...and check the other one by category code on those rows only
+            for postings, values in indexed[1:]:
+                candidates = candidates[np.isin(postings.codes[candidates], postings.wanted_codes(values))]
+        else:
+            candidates = np.arange(len(self.df))
+
+        # The remaining filters only look at the candidate rows
+        mask = np.ones(len(candidates), dtype=bool)
+        for key, column in LIST_FILTERS.items():
+            if column not in INDEXED_COLUMNS and spec.get(key) is not None:
+                mask &= self._isin(column, _as_list(spec[key]), candidates)
+        for key, (column, op) in RANGE_FILTERS.items():
+            if spec.get(key):
+                bound = pd.Timestamp(spec[key])
+                values = self.df[column].iloc[candidates]
+                mask &= (values >= bound if op == ">=" else values <= bound).to_numpy(dtype=bool, na_value=False)
+        return candidates[mask]
+
+    def _isin(self, column, values, candidates):
+        series = self.df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Compare integer codes instead of strings
+            wanted = series.cat.categories.get_indexer(values)
+            return np.isin(series.cat.codes.to_numpy()[candidates], wanted[wanted >= 0])
+        return series.iloc[candidates].isin(values).to_numpy(dtype=bool, na_value=False)
+
+    def select(self, spec):
+        """
+        The matching records as a DataFrame, in their original order.
+        """
+        return self.df.iloc[self.positions(spec)]
+
+
+def load_saved_queries(path=SAVED_QUERIES):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_query(name, spec, path=SAVED_QUERIES):
+    validate_spec(spec)
+    queries = load_saved_queries(path)
+    queries[name] = spec
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(queries, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Filter scraped GradCafe records with a saved or ad-hoc query.")
+    parser.add_argument("data", nargs="?", help="scraper CSV or dataset directory")
+    parser.add_argument("--query", help="name of a saved query (options below are added to it)")
+    parser.add_argument("--queries-file", default=SAVED_QUERIES)
+    parser.add_argument("--list", action="store_true", help="list the saved queries and exit")
+    parser.add_argument("--school", action="append", help="repeat for several schools")
+    parser.add_argument("--program", action="append", help="repeat for several programs")
+    parser.add_argument("--degree-type", action="append")
+    parser.add_argument("--season", action="append")
+    parser.add_argument("--decision", action="append")
+    parser.add_argument("--year", action="append", type=int)
+    parser.add_argument("--effective-year", action="append", type=int)
+    parser.add_argument("--decision-from", help="YYYY-MM-DD")
+    parser.add_argument("--decision-to", help="YYYY-MM-DD")
+    parser.add_argument("--save", metavar="NAME", help="save the resulting query under NAME")
+    parser.add_argument("--output", help="write the matching records to this CSV")
+    parser.add_argument("--head", type=int, default=20, help="rows to print")
+    args = parser.parse_args(argv)
+
+    saved = load_saved_queries(args.queries_file)
+    if args.list:
+        for name, spec in saved.items():
+            print(f"{name}: {json.dumps(spec, ensure_ascii=False)}")
+        return
+    if not args.data:
+        parser.error("the data argument is required")
+
+    if args.query:
+        if args.query not in saved:
+            parser.error(f"no saved query {args.query!r} in {args.queries_file}")
+        spec = saved[args.query]
+    else:
+        spec = {}
+    options = {"schools": args.school, "programs": args.program, "degree_types": args.degree_type,
+               "seasons": args.season, "decisions": args.decision, "years": args.year,
+               "effective_years": args.effective_year, "decision_from": args.decision_from,
+               "decision_to": args.decision_to}
+    options = {key: value for key, value in options.items() if value}
+    if options:
+        if isinstance(spec, list):
+            spec = [{**part, **options} for part in spec]
+        else:
+            spec = {**spec, **options}
+
+    if args.save:
+        save_query(args.save, spec, args.queries_file)
+        print(f"Saved query {args.save!r} to {args.queries_file}.")
+
+    matches = RecordIndex.load(args.data).select(spec)
+    print(matches.head(args.head))
+    print(f"{len(matches)} matching records.")
+    if args.output:
+        matches.to_csv(args.output, index=False)
+        print(f"Saved {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Compact in-memory forms of scraped records.
+
+build_record returns a 16-key dict of strings per row, and the same
+few hundred School / Program / Decision / date strings are allocated
+again for every row. For large scrapes two leaner forms are available:
+
+  - CompactRecord: a namedtuple with interned strings, the tags as a
+    tuple, GRE / GPA as floats and Year / effective_year as ints
+    (None if missing).
+  - RecordTable: a columnar builder. Low-cardinality text columns
+    (including both dates) are dictionary-encoded into integer code
+    arrays, numbers go into typed arrays, and to_frame() builds the
+    final DataFrame straight from those columns, with the same typed
+    schema as dataset.to_typed_frame.
+
+benchmarks/record_memory.py compares bytes per record for each form.
+"""
+import sys
+from array import array
+from collections import namedtuple
+
+from sinks import RECORD_COLUMNS
+
+CompactRecord = namedtuple("CompactRecord", RECORD_COLUMNS)
+
+ENCODED_COLUMNS = ["School", "Program", "Degree_Type", "Date_Posted", "Decision", "DecisionDate",
+                   "Season", "Nationality"]
+FLOAT_COLUMNS = ["GRE_Total", "GRE_V", "GRE_AW", "GPA"]
+INT_COLUMNS = ["Year", "effective_year"]
+
+_NAN = float("nan")
+_MISSING_INT = -1  # years are never negative
+
+
+def _to_float(value):
+    try:
+        return float(value) if value != "" else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value):
+    try:
+        return int(value) if value != "" else None
+    except (TypeError, ValueError):
+        return None
+
+
+def compact_record(record):
+    """
+    Converts one record dict (as built by build_record) to a CompactRecord.
+    """
+    values = []
+    for name in RECORD_COLUMNS:
+        value = record.get(name, "")
+        if name in FLOAT_COLUMNS:
+            value = _to_float(value)
+        elif name in INT_COLUMNS:
+            value = _to_int(value)
+        elif name == "Tags":
+            value = tuple(sys.intern(tag) for tag in value)
+        elif name in ENCODED_COLUMNS:
+            value = sys.intern(value)
+        values.append(value)
+    return CompactRecord._make(values)
+
+
+class RecordTable:
+    """
+    Column-oriented, dictionary-encoded store of records. Append record
+    dicts (or CompactRecords) page by page and call to_frame() once at
+    the end. Pages may be appended out of order; to_frame() puts the
+    rows back in page order.
+    """
+
+    def __init__(self):
+        self._codes = {name: array("i") for name in ENCODED_COLUMNS}
+        self._values = {name: {} for name in ENCODED_COLUMNS}  # value -> code
+        self._floats = {name: array("d") for name in FLOAT_COLUMNS}
+        self._ints = {name: array("i") for name in INT_COLUMNS}
+        self._tags = []
+        self._comments = []
+        self._pages = array("i")
+
+    def __len__(self):
+        return len(self._pages)
+
+    def append(self, records, page_num=0):
+        for record in records:
+            if isinstance(record, CompactRecord):
+                record = record._asdict()
+            for name in ENCODED_COLUMNS:
+                values = self._values[name]
+                value = record.get(name, "")
+                code = values.get(value)
+                if code is None:
+                    code = values[value] = len(values)
+                self._codes[name].append(code)
+            for name in FLOAT_COLUMNS:
+                value = _to_float(record.get(name, ""))
+                self._floats[name].append(_NAN if value is None else value)
+            for name in INT_COLUMNS:
+                value = _to_int(record.get(name, ""))
+                self._ints[name].append(_MISSING_INT if value is None else value)
+            self._tags.append(tuple(sys.intern(tag) for tag in record.get("Tags", ())))
+            self._comments.append(record.get("Comment", ""))
+            self._pages.append(page_num)
+
+    def to_frame(self):
+        """
+        The records as a DataFrame with the dataset.to_typed_frame schema:
+        categoricals, datetime64 dates, nullable Int16 years and Float32
+        GRE / GPA, in page order.
+        """
+        import numpy as np
+        import pandas as pd
+        from dataset import DATE_COLUMNS, _parse_dates
+
+        pages = np.frombuffer(self._pages, dtype=np.int32)
+        order = None
+        if len(pages) and (np.diff(pages) < 0).any():
+            order = np.argsort(pages, kind="stable")
+
+        def ordered(values):
+            return values if order is None else values[order]
+
+        columns = {}
+        for name in RECORD_COLUMNS:
+            if name in ENCODED_COLUMNS:
+                codes = ordered(np.frombuffer(self._codes[name], dtype=np.int32))
+                uniques = pd.Series(list(self._values[name]), dtype=object)
+                if name in DATE_COLUMNS:
+                    # Parse each distinct date string once
+                    columns[name] = _parse_dates(uniques).to_numpy()[codes]
+                    continue
+                # Same categories as astype("category"): sorted, "" is missing
+                categories = sorted(value for value in uniques if value != "")
+                position = {value: i for i, value in enumerate(categories)}
+                remap = np.array([position.get(value, -1) for value in uniques], dtype=np.int32)
+                columns[name] = pd.Categorical.from_codes(remap[codes] if len(codes) else codes,
+                                                          categories=categories)
+            elif name in FLOAT_COLUMNS:
+                values = ordered(np.frombuffer(self._floats[name], dtype=np.float64))
+                columns[name] = pd.array(values, dtype="Float32")
+                columns[name][np.isnan(values)] = pd.NA
+            elif name in INT_COLUMNS:
+                values = ordered(np.frombuffer(self._ints[name], dtype=np.int32))
+                columns[name] = pd.arrays.IntegerArray(values.astype(np.int16), values == _MISSING_INT)
+            elif name == "Tags":
+                tags = np.empty(len(self._tags), dtype=object)
+                tags[:] = [list(t) for t in self._tags]
+                columns[name] = ordered(tags)
+            else:
+                columns[name] = ordered(np.array(self._comments, dtype=object))
+        return pd.DataFrame(columns, columns=RECORD_COLUMNS)
@@ -0,0 +1,407 @@
+"""
+Sharded scraping across processes or machines.
+
+The page range is split into shards (e.g. pages 1-50, 51-100, ...)
+kept in a SQLite work queue. Workers lease a shard, scrape it, write
+its records to their own partition file and mark it done. A lease
+that is not renewed in time (the worker died or hung) expires and the
+shard is handed to another worker; a shard with pages that could not
+be fetched goes back to the queue, up to `max_attempts` times.
+
+Partitions are written as <output>/shard-<id>.jsonl.<token>.tmp and
+renamed to shard-<id>.jsonl when complete, so a crashed worker never
+leaves a partial partition behind.
+
+merge_shards reads the partitions in page order and drops records
+already seen in an earlier shard: with ?sort=newest, results posted
+while the scrape runs push older rows onto later pages, so rows near a
+shard boundary can be scraped twice (they cannot be skipped, since
+rows only move towards later pages). A merge with failed or unfinished
+shards is refused (exit status 1) unless --allow-partial is given, so a
+partial output is never mistaken for a complete one.
+
+On one machine:
+    python shards.py run --queue work.sqlite --output shards/ --max-pages 2000 --workers 4 --merge-to out.csv
+Across machines, share the queue file and output directory and run
+    python shards.py plan --queue work.sqlite --discover --shard-size 50          # once
+    python shards.py worker --queue work.sqlite --output shards/                  # on every node
+    python shards.py merge --queue work.sqlite --output shards/ --merge-to out.csv  # at the end
+(SQLite locking needs a file system that supports it; NFS often does not.)
+"""
+import glob
+import json
+import logging
+import os
+import re
+import socket
+import sqlite3
+import time
+import uuid
+from collections import namedtuple
+
+from incremental import record_fingerprint
+
+logger = logging.getLogger("gradstats")
+
+Shard = namedtuple("Shard", ["shard_id", "first_page", "last_page", "token", "attempts"])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shards (
+    shard_id INTEGER PRIMARY KEY,
+    first_page INTEGER NOT NULL,
+    last_page INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',   -- pending / leased / done / failed
+    worker TEXT,
+    token TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    records INTEGER
+)
+"""
+_PARTITION_RE = re.compile(r'shard-(\d+)\.jsonl$')
+
+
+class ShardQueue:
+    """
+    SQLite-backed queue of page-range shards with leases. Safe to use
+    from several processes at once (each opens its own ShardQueue).
+    """
+
+    def __init__(self, path, lease_seconds=300, max_attempts=3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def plan(self, max_pages, shard_size=50, first_page=1):
+        """
+        Adds shards covering first_page..max_pages, unless the queue
+        already has shards (planning twice must not duplicate work).
+        Returns the number of shards in the queue.
+        """
+        with self._transaction():
+            count = self._db.execute("SELECT COUNT(*) FROM shards").fetchone()[0]
+            if not count:
+                self._db.executemany(
+                    "INSERT INTO shards (first_page, last_page) VALUES (?, ?)",
+                    [(start, min(start + shard_size - 1, max_pages))
+                     for start in range(first_page, max_pages + 1, shard_size)])
+                count = self._db.execute("SELECT COUNT(*) FROM shards").fetchone()[0]
+        return count
+
+    def lease(self, worker):
+        """
+        Hands out the lowest pending (or expired) shard, or None if
+        nothing is left to lease right now. An expired shard that has
+        already been leased max_attempts times (a page that keeps
+        killing its worker) is marked failed instead.
+        """
+        now = time.time()
+        token = uuid.uuid4().hex
+        with self._transaction():
+            exhausted = [shard_id for shard_id, in self._db.execute(
+                "SELECT shard_id FROM shards WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts))]
+            for shard_id in exhausted:
+                logger.warning("Shard %d: lease expired after %d attempt(s), giving up", shard_id, self.max_attempts)
+                self._db.execute("UPDATE shards SET state = 'failed', lease_expires = NULL WHERE shard_id = ?",
+                                 (shard_id,))
+            row = self._db.execute(
+                "SELECT shard_id, first_page, last_page, attempts FROM shards "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) "
+                "ORDER BY shard_id LIMIT 1", (now,)).fetchone()
+            if row is None:
+                return None
+            shard_id, first_page, last_page, attempts = row
+            self._db.execute(
+                "UPDATE shards SET state = 'leased', worker = ?, token = ?, lease_expires = ?, attempts = ? "
+                "WHERE shard_id = ?", (worker, token, now + self.lease_seconds, attempts + 1, shard_id))
+        return Shard(shard_id, first_page, last_page, token, attempts + 1)
+
+    def renew(self, shard):
+        """
+        Extends the lease; False if it was lost (expired and re-leased).
+        """
+        cursor = self._db.execute(
+            "UPDATE shards SET lease_expires = ? WHERE shard_id = ? AND token = ? AND state = 'leased'",
+            (time.time() + self.lease_seconds, shard.shard_id, shard.token))
+        return cursor.rowcount == 1
+
+    def complete(self, shard, records):
+        """
+        Marks the shard done; False if the lease was lost in the meantime.
+        """
+        cursor = self._db.execute(
+            "UPDATE shards SET state = 'done', records = ?, lease_expires = NULL "
+            "WHERE shard_id = ? AND token = ? AND state = 'leased'", (records, shard.shard_id, shard.token))
+        return cursor.rowcount == 1
+
+    def release(self, shard):
+        """
+        Gives a shard back after a failed attempt; after max_attempts it
+        is marked failed instead.
+        """
+        state = "failed" if shard.attempts >= self.max_attempts else "pending"
+        self._db.execute(
+            "UPDATE shards SET state = ?, lease_expires = NULL WHERE shard_id = ? AND token = ? AND state = 'leased'",
+            (state, shard.shard_id, shard.token))
+
+    def progress(self):
+        """
+        Number of shards per state, e.g. {"done": 3, "pending": 1}.
+        """
+        return dict(self._db.execute("SELECT state, COUNT(*) FROM shards GROUP BY state").fetchall())
+
+    def states(self):
+        """
+        State of every planned shard, {shard_id: state}.
+        """
+        return dict(self._db.execute("SELECT shard_id, state FROM shards ORDER BY shard_id").fetchall())
+
+    def finished(self):
+        """
+        True once no shard is pending or leased.
+        """
+        progress = self.progress()
+        return not progress.get("pending") and not progress.get("leased")
+
+    def _transaction(self):
+        return _ImmediateTransaction(self._db)
+
+
+class _ImmediateTransaction:
+    # BEGIN IMMEDIATE takes the write lock up front, so two workers
+    # cannot both read the same shard as pending and lease it
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, *exc_info):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+def partition_path(output_dir, shard_id):
+    return os.path.join(output_dir, f"shard-{shard_id:05d}.jsonl")
+
+
+def scrape_shard(shard, queue, output_dir, base_url, **scrape_options):
+    """
+    Scrapes the pages of one leased shard into its partition file,
+    renewing the lease after every page. Returns the number of records,
+    or None if pages were missing or the lease was lost (the partition
+    is then discarded).
+    """
+    from gradstats_debug import iter_scraped_pages
+    from sinks import JsonlSink
+
+    pages = list(range(shard.first_page, shard.last_page + 1))
+    final_path = partition_path(output_dir, shard.shard_id)
+    tmp_path = f"{final_path}.{shard.token}.tmp"
+    done = set()
+    lost = False
+    with JsonlSink(tmp_path) as sink:
+        for page_num, records in iter_scraped_pages(base_url, pages=pages, **scrape_options):
+            sink.write(records)
+            done.add(page_num)
+            if not queue.renew(shard):
+                lost = True
+                break
+
+    if lost or done != set(pages):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    if not os.path.exists(tmp_path):
+        open(tmp_path, "w").close()  # a shard past the last page: empty partition
+    os.replace(tmp_path, final_path)
+    return sink.records_written
+
+
+def run_worker(queue_path, output_dir, base_url="https://www.thegradcafe.com/survey/index.php", worker=None,
+               lease_seconds=300, idle_wait=1.0, **scrape_options):
+    """
+    Leases and scrapes shards until the queue is finished. Returns the
+    number of shards this worker completed.
+    """
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+    os.makedirs(output_dir, exist_ok=True)
+    queue = ShardQueue(queue_path, lease_seconds=lease_seconds)
+    completed = 0
+    try:
+        while True:
+            shard = queue.lease(worker)
+            if shard is None:
+                if queue.finished():
+                    return completed
+                time.sleep(idle_wait)  # other workers hold the rest; one may still die
+                continue
+
+            logger.info("%s: shard %d (pages %d-%d, attempt %d)", worker, shard.shard_id,
+                        shard.first_page, shard.last_page, shard.attempts)
+            try:
+                records = scrape_shard(shard, queue, output_dir, base_url, **scrape_options)
+            except Exception:
+                queue.release(shard)
+                raise
+            if records is None:
+                logger.warning("%s: shard %d incomplete, returning it to the queue", worker, shard.shard_id)
+                queue.release(shard)
+            elif queue.complete(shard, records):
+                completed += 1
+    finally:
+        queue.close()
+
+
+def iter_merged_records(output_dir):
+    """
+    Records of all finished partitions in page order, without the
+    records that already appeared earlier, on an earlier page of the
+    same shard or in an earlier shard.
+    """
+    partitions = []
+    for path in glob.glob(os.path.join(output_dir, "shard-*.jsonl")):
+        match = _PARTITION_RE.search(os.path.basename(path))
+        if match:
+            partitions.append((int(match.group(1)), path))
+
+    seen = set()
+    for _, path in sorted(partitions):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                fingerprint = record_fingerprint(record)
+                if fingerprint in seen:
+                    continue  # drifted onto a later page
+                seen.add(fingerprint)
+                yield record
+
+
+def missing_shards(queue, output_dir):
+    """
+    Ids of the shards in `queue` that have no finished partition in
+    `output_dir`: failed, still pending or leased, or with the
+    partition file gone. Merging without them gives a partial result.
+    """
+    return [shard_id for shard_id, state in queue.states().items()
+            if state != "done" or not os.path.exists(partition_path(output_dir, shard_id))]
+
+
+def merge_shards(output_dir, sink):
+    """
+    Writes the merged records into `sink` (see sinks.SINKS). Returns
+    the number of records written.
+    """
+    batch = []
+    for record in iter_merged_records(output_dir):
+        batch.append(record)
+        if len(batch) >= 10000:
+            sink.write(batch)
+            sink.flush()
+            batch = []
+    sink.write(batch)
+    sink.flush()
+    return sink.records_written
+
+
+def run_local(queue_path, output_dir, max_pages, workers=4, shard_size=50,
+              base_url="https://www.thegradcafe.com/survey/index.php", lease_seconds=300, **scrape_options):
+    """
+    Coordinator for one machine: plans the shards and runs `workers`
+    worker processes until the queue is finished. Returns the queue's
+    progress counts. With max_pages=None the page range ends at the
+    last result page (pagination.discover_last_page).
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    from pipeline import _START_METHOD
+
+    if max_pages is None:
+        from pagination import discover_last_page
+        max_pages = discover_last_page(base_url, parser=scrape_options.get("parser"),
+                                       rate_limit=scrape_options.get("rate_limit"))
+
+    queue = ShardQueue(queue_path, lease_seconds=lease_seconds)
+    try:
+        queue.plan(max_pages, shard_size)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(_START_METHOD)) as pool:
+            futures = [pool.submit(run_worker, queue_path, output_dir, base_url, f"local-{n}",
+                                   lease_seconds, **scrape_options) for n in range(workers)]
+            for future in futures:
+                future.result()
+        missing = missing_shards(queue, output_dir)
+        if missing:
+            logger.warning("Shard(s) %s did not complete; their pages are missing from %s", missing, output_dir)
+        return queue.progress()
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from instrumentation import configure_logging
+    from sinks import SINKS
+
+    parser = argparse.ArgumentParser(description="Sharded GradCafe scrape through a SQLite work queue.")
+    parser.add_argument("command", choices=["plan", "worker", "merge", "run"])
+    parser.add_argument("--queue", default="scrape_queue.sqlite")
+    parser.add_argument("--output", default="shards", help="directory for the per-shard partitions")
+    parser.add_argument("--max-pages", type=int, default=2000)
+    parser.add_argument("--discover", action="store_true",
+                        help="plan up to the last result page (at most --max-pages) instead of --max-pages")
+    parser.add_argument("--base-url", default="https://www.thegradcafe.com/survey/index.php")
+    parser.add_argument("--shard-size", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4, help="worker processes for 'run'")
+    parser.add_argument("--concurrency", type=int, default=1, help="fetch threads per worker")
+    parser.add_argument("--rate-limit", type=float, default=None, help="max requests per second per worker")
+    parser.add_argument("--lease-seconds", type=float, default=300)
+    parser.add_argument("--merge-to", default=None, help="merged output file")
+    parser.add_argument("--sink", choices=sorted(SINKS), default="csv", help="format of --merge-to")
+    parser.add_argument("--allow-partial", action="store_true",
+                        help="merge even if some shards failed or are unfinished")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args()
+
+    configure_logging(args.log_level)
+    scrape_options = dict(concurrency=args.concurrency, rate_limit=args.rate_limit)
+    max_pages = args.max_pages
+    if args.discover and args.command in ("plan", "run"):
+        from pagination import discover_last_page
+        max_pages = discover_last_page(args.base_url, max_pages=args.max_pages, rate_limit=args.rate_limit)
+        print(f"Last result page: {max_pages}")
+
+    if args.command == "plan":
+        queue = ShardQueue(args.queue)
+        print(f"{queue.plan(max_pages, args.shard_size)} shard(s) in {args.queue}")
+        queue.close()
+    elif args.command == "worker":
+        done = run_worker(args.queue, args.output, args.base_url, lease_seconds=args.lease_seconds,
+                          **scrape_options)
+        print(f"Completed {done} shard(s).")
+    elif args.command == "run":
+        progress = run_local(args.queue, args.output, max_pages, args.workers, args.shard_size,
+                             args.base_url, lease_seconds=args.lease_seconds, **scrape_options)
+        print(f"Shards: {progress}")
+
+    if args.command in ("merge", "run") and args.merge_to:
+        if not os.path.exists(args.queue):
+            missing = f"unknown (no queue {args.queue})"
+        else:
+            queue = ShardQueue(args.queue)
+            missing = missing_shards(queue, args.output)
+            queue.close()
+        if missing:
+            logger.warning("Incomplete merge: missing shard(s) %s", missing)
+            if not args.allow_partial:
+                raise SystemExit(f"Not merging: missing shard(s) {missing}; pass --allow-partial to merge anyway.")
+        with SINKS[args.sink](args.merge_to) as sink:
+            total = merge_shards(args.output, sink)
+        print(f"Wrote {total} merged rows to {args.merge_to}.")
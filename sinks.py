@@ -0,0 +1,247 @@
+"""
+Streaming destinations for scraped records.
+
+A sink buffers records with write() and persists them on flush(), so a
+scrape only ever holds one flush interval of records in memory:
+
+  - CsvSink:     appends rows to one CSV file
+  - JsonlSink:   appends one JSON object per line
+  - ParquetSink: writes each flush as a row group of a new part file in
+                 a directory, so resumed runs just add more parts
+  - DatasetSink: appends each flush to the typed, Year/Season partitioned
+                 Parquet dataset described in dataset.py
+  - StoreSink:   upserts each flush into the SQLite store of store.py
+
+ScrapeCheckpoint remembers which pages have been flushed, so an
+interrupted scrape can resume where it stopped.
+"""
+import csv
+import json
+import os
+import shutil
+import time
+
+# Same order as the record dicts built by gradstats_debug.build_record
+RECORD_COLUMNS = [
+    "School", "Program", "Degree_Type", "Date_Posted", "Decision", "DecisionDate",
+    "Season", "Year", "effective_year", "GRE_Total", "GRE_V", "GRE_AW", "GPA",
+    "Nationality", "Tags", "Comment",
+]
+
+
+class RecordSink:
+    """
+    Base class: subclasses implement _write_batch(records).
+    """
+
+    def __init__(self):
+        self._buffer = []
+        self.records_written = 0
+
+    def write(self, records):
+        self._buffer.extend(records)
+
+    def flush(self):
+        if self._buffer:
+            self._write_batch(self._buffer)
+            self.records_written += len(self._buffer)
+            self._buffer = []
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write_batch(self, records):
+        raise NotImplementedError
+
+
+class CsvSink(RecordSink):
+    """
+    Tags are written the way DataFrame.to_csv writes a list, e.g.
+    "['Fall 2025', 'American']", so the file matches the old output.
+    """
+
+    def __init__(self, path, append=False):
+        super().__init__()
+        self.path = path
+        if not append and os.path.exists(path):
+            os.remove(path)
+
+    def _write_batch(self, records):
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=RECORD_COLUMNS, extrasaction="ignore")
+            if new_file:
+                writer.writeheader()
+            for record in records:
+                writer.writerow({**record, "Tags": str(list(record.get("Tags", [])))})
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class JsonlSink(RecordSink):
+    def __init__(self, path, append=False):
+        super().__init__()
+        self.path = path
+        if not append and os.path.exists(path):
+            os.remove(path)
+
+    def _write_batch(self, records):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class ParquetSink(RecordSink):
+    """
+    Writes to `<path>/part-<timestamp>-<pid>.parquet`, one row group per
+    flush. Read the whole directory back with pandas.read_parquet(path).
+    Needs pyarrow.
+    """
+
+    def __init__(self, path, append=False):
+        super().__init__()
+        import pyarrow as pa
+
+        self.path = path
+        if not append and os.path.isdir(path):
+            for name in os.listdir(path):
+                if name.endswith(".parquet"):
+                    os.remove(os.path.join(path, name))
+        os.makedirs(path, exist_ok=True)
+
+        fields = [pa.field(name, pa.string()) for name in RECORD_COLUMNS]
+        fields[RECORD_COLUMNS.index("Tags")] = pa.field("Tags", pa.list_(pa.string()))
+        self.schema = pa.schema(fields)
+        self.part_path = os.path.join(path, f"part-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}.parquet")
+        self._writer = None
+
+    def _write_batch(self, records):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = {name: [record.get(name) for record in records] for name in RECORD_COLUMNS}
+        table = pa.table(columns, schema=self.schema)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.part_path, self.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        super().close()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class DatasetSink(RecordSink):
+    """
+    Needs pyarrow. Without append, existing Year=... partitions under
+    `path` (and the cube) are removed first. Every flush is also folded
+    into the decision cube stored next to the dataset (see cube.py).
+    """
+
+    def __init__(self, path, append=False):
+        super().__init__()
+        self.path = path
+        if not append and os.path.isdir(path):
+            for name in os.listdir(path):
+                if name.startswith("Year="):
+                    shutil.rmtree(os.path.join(path, name))
+                elif name == "_cube.parquet":
+                    os.remove(os.path.join(path, name))
+
+    def _write_batch(self, records):
+        from cube import update_cube
+        from dataset import write_dataset
+        from records import RecordTable
+
+        table = RecordTable()
+        table.append(records)
+        typed = table.to_frame()
+        write_dataset(typed, self.path, typed=True)
+        update_cube(self.path, typed)
+
+
+class StoreSink(RecordSink):
+    """
+    Upserts each flush into the SQLite store at `path` (see store.py).
+    Records already in the store are updated, not duplicated, so
+    `append` makes no difference.
+    """
+
+    def __init__(self, path, append=False):
+        super().__init__()
+        from store import RecordStore
+
+        self.path = path
+        self.store = RecordStore(path)
+
+    def _write_batch(self, records):
+        self.store.upsert(records)
+
+    def close(self):
+        super().close()
+        self.store.close()
+
+
+SINKS = {
+    "csv": CsvSink,
+    "jsonl": JsonlSink,
+    "parquet": ParquetSink,
+    "dataset": DatasetSink,
+    "store": StoreSink,
+}
+
+
+class ScrapeCheckpoint:
+    """
+    Pages whose records have been flushed to a sink. Stored as the first
+    page not yet done plus any done pages past it (retried pages can
+    finish out of order).
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.next_page = 1
+        self.done_after = set()
+        self.records_written = 0
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.next_page = data["next_page"]
+            self.done_after = set(data.get("done_after", []))
+            self.records_written = data.get("records_written", 0)
+
+    @property
+    def started(self):
+        return self.next_page > 1 or bool(self.done_after)
+
+    def is_done(self, page_num):
+        return page_num < self.next_page or page_num in self.done_after
+
+    def mark_done(self, page_nums, records_written=0):
+        self.done_after.update(page_nums)
+        while self.next_page in self.done_after:
+            self.done_after.remove(self.next_page)
+            self.next_page += 1
+        self.records_written += records_written
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "next_page": self.next_page,
+                "done_after": sorted(self.done_after),
+                "records_written": self.records_written,
+            }, f)
+        os.replace(tmp_path, self.path)
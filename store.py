@@ -0,0 +1,268 @@
+"""
+Local SQLite store for scraped records.
+
+Instead of one loose CSV per scrape (gradcafe.csv, gradcafe2024.csv,
+...), records go into one SQLite file (stdlib sqlite3, no server):
+
+  - one row per record, keyed by incremental.record_fingerprint, so
+    writing a record again (a re-run, a row that drifted onto the next
+    page) updates it instead of adding a duplicate
+  - writes are batched: one transaction and one executemany per batch
+  - indexes on (School, Program, Degree_Type, Season, Year) and on
+    DecisionDate, so the notebook's "these programs, this season"
+    queries only touch the matching rows
+
+Queries take the same specs as query.py (see saved_queries.json) and
+return DataFrames with the column types of dataset.to_typed_frame.
+decision_date_counts aggregates in SQL, so a decision-date distribution
+never loads the records themselves.
+
+    python gradstats_debug.py --sink store --output gradcafe.sqlite
+    python store.py gradcafe.sqlite --import gradcafe.csv gradcafe2024.csv
+    python store.py gradcafe.sqlite --query stats_phd_fall_2024 --counts
+"""
+import json
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from dataset import CATEGORICAL_COLUMNS, DATE_COLUMNS, FLOAT_COLUMNS, INT_COLUMNS, _parse_tags
+from incremental import record_fingerprint
+from query import LIST_FILTERS, RANGE_FILTERS, _as_list, validate_spec
+from sinks import RECORD_COLUMNS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    fingerprint TEXT PRIMARY KEY,
+    School TEXT, Program TEXT, Degree_Type TEXT, Date_Posted TEXT, Decision TEXT, DecisionDate TEXT,
+    Season TEXT, Year INTEGER, effective_year INTEGER,
+    GRE_Total REAL, GRE_V REAL, GRE_AW REAL, GPA REAL,
+    Nationality TEXT, Tags TEXT, Comment TEXT,
+    first_seen TEXT NOT NULL DEFAULT (datetime('now')),
+    last_seen TEXT NOT NULL DEFAULT (datetime('now'))
+);
+CREATE INDEX IF NOT EXISTS records_program ON records (School, Program, Degree_Type, Season, Year);
+CREATE INDEX IF NOT EXISTS records_decision_date ON records (DecisionDate);
+"""
+_UPSERT = (
+    f"INSERT INTO records (fingerprint, {', '.join(RECORD_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * (len(RECORD_COLUMNS) + 1))}) "
+    f"ON CONFLICT (fingerprint) DO UPDATE SET "
+    + ", ".join(f"{name} = excluded.{name}" for name in RECORD_COLUMNS)
+    + ", last_seen = datetime('now')"
+)
+
+
+def _number(value, kind):
+    if value is None or value == "":
+        return None
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _iso_date(value):
+    # Same formats as dataset._parse_dates: the scraper's ISO dates and
+    # older CSVs' "December 25, 2024"; anything else is stored as missing
+    if value is None or value == "" or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d")
+    for fmt in ("%Y-%m-%d", "%B %d, %Y"):
+        try:
+            return datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    return None
+
+
+def _row(record):
+    """
+    The parameters of _UPSERT for one record dict. The fingerprint is
+    taken after dates and tags are normalized, so a record read from an
+    older CSV gets the same key as the same record scraped today.
+    """
+    normalized = dict(record)
+    values = []
+    for name in RECORD_COLUMNS:
+        value = record.get(name)
+        if name in INT_COLUMNS:
+            value = _number(value, int)
+        elif name in FLOAT_COLUMNS:
+            value = _number(value, float)
+        elif name in DATE_COLUMNS:
+            value = _iso_date(value)
+            if value is not None:
+                normalized[name] = value
+        elif name == "Tags":
+            normalized[name] = _parse_tags(value)
+            value = json.dumps(normalized[name], ensure_ascii=False)
+        elif value == "":
+            value = None
+        values.append(value)
+    return [record_fingerprint(normalized)] + values
+
+
+def _where(spec):
+    """
+    SQL condition and parameters for a query.py spec.
+    """
+    validate_spec(spec)
+    if isinstance(spec, list):
+        parts = [_where(part) for part in spec]
+        if not parts:
+            return "0", []
+        return " OR ".join(f"({clause})" for clause, _ in parts), [p for _, params in parts for p in params]
+
+    clauses, params = [], []
+    for key, column in LIST_FILTERS.items():
+        if spec.get(key) is not None:
+            values = _as_list(spec[key])
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params += values
+    for key, (column, op) in RANGE_FILTERS.items():
+        if spec.get(key):
+            clauses.append(f"{column} {op} ?")
+            params.append(pd.Timestamp(spec[key]).strftime("%Y-%m-%d"))
+    return " AND ".join(clauses) or "1", params
+
+
+def _typed(df):
+    # Same dtypes as dataset.to_typed_frame, for the columns that were read
+    for name in df.columns:
+        if name in DATE_COLUMNS:
+            df[name] = pd.to_datetime(df[name], format="%Y-%m-%d", errors="coerce")
+        elif name in INT_COLUMNS:
+            df[name] = df[name].astype("Int16")
+        elif name in FLOAT_COLUMNS:
+            df[name] = df[name].astype("Float32")
+        elif name in CATEGORICAL_COLUMNS:
+            df[name] = df[name].astype("category")
+        elif name == "Tags":
+            df[name] = df[name].map(lambda value: json.loads(value) if value else [])
+        elif name == "Comment":
+            df[name] = df[name].fillna("").astype(str)
+    return df
+
+
+class RecordStore:
+    """
+    A SQLite file of records. Use as a context manager or call close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=60)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def upsert(self, records):
+        """
+        Inserts or updates a batch of record dicts in one transaction.
+        Returns how many of them were new.
+        """
+        rows = [_row(record) for record in records]
+        fingerprints = {row[0] for row in rows}
+        with self._db:
+            existing = set()
+            batch = list(fingerprints)
+            for start in range(0, len(batch), 500):
+                part = batch[start:start + 500]
+                existing.update(fingerprint for fingerprint, in self._db.execute(
+                    f"SELECT fingerprint FROM records WHERE fingerprint IN ({', '.join('?' * len(part))})", part))
+            self._db.executemany(_UPSERT, rows)
+        return len(fingerprints - existing)
+
+    def query(self, spec=None, columns=None, chunksize=None):
+        """
+        Records matching a query.py spec (all records without one), as a
+        typed DataFrame with `columns` (default: all record columns).
+        With `chunksize`, yields DataFrames of that many rows instead.
+        """
+        where, params = _where(spec or {})
+        sql = f"SELECT {', '.join(columns or RECORD_COLUMNS)} FROM records WHERE {where} ORDER BY rowid"
+        if chunksize:
+            return (_typed(chunk) for chunk in pd.read_sql_query(sql, self._db, params=params, chunksize=chunksize))
+        return _typed(pd.read_sql_query(sql, self._db, params=params))
+
+    def decision_date_counts(self, spec=None, by=("Decision",)):
+        """
+        Number of matching records per DecisionDate and `by` columns
+        (records without a decision date are left out), counted in SQL.
+        """
+        where, params = _where(spec or {})
+        group = ", ".join(["DecisionDate"] + list(by))
+        sql = (f"SELECT {group}, COUNT(*) AS count FROM records "
+               f"WHERE ({where}) AND DecisionDate IS NOT NULL GROUP BY {group} ORDER BY {group}")
+        return _typed(pd.read_sql_query(sql, self._db, params=params))
+
+    def explain(self, spec=None):
+        """
+        SQLite's query plan for a spec, e.g. to check an index is used.
+        """
+        where, params = _where(spec or {})
+        rows = self._db.execute(f"EXPLAIN QUERY PLAN SELECT * FROM records WHERE {where}", params).fetchall()
+        return [row[-1] for row in rows]
+
+
+def import_csv(store, csv_path, chunksize=50000):
+    """
+    Upserts the records of a scraper CSV into `store`, a chunk at a
+    time (dates in either CSV format are stored as ISO dates). Returns
+    the number of new records.
+    """
+    added = 0
+    for chunk in pd.read_csv(csv_path, dtype=str, keep_default_na=False, chunksize=chunksize):
+        if "Tags" in chunk.columns:
+            chunk["Tags"] = chunk["Tags"].map(_parse_tags)
+        added += store.upsert(chunk.to_dict("records"))
+    return added
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from query import SAVED_QUERIES, load_saved_queries
+
+    parser = argparse.ArgumentParser(description="Import into or query the SQLite record store.")
+    parser.add_argument("path", help="SQLite file")
+    parser.add_argument("--import", dest="csv_paths", nargs="+", default=[], help="scraper CSVs to upsert")
+    parser.add_argument("--query", help="name of a saved query")
+    parser.add_argument("--queries-file", default=SAVED_QUERIES)
+    parser.add_argument("--counts", action="store_true", help="print decision-date counts instead of records")
+    parser.add_argument("--output", help="write the matching records to this CSV")
+    args = parser.parse_args()
+
+    with RecordStore(args.path) as store:
+        for csv_path in args.csv_paths:
+            print(f"{csv_path}: {import_csv(store, csv_path)} new records")
+        spec = {}
+        if args.query:
+            saved = load_saved_queries(args.queries_file)
+            if args.query not in saved:
+                parser.error(f"no saved query {args.query!r} in {args.queries_file}")
+            spec = saved[args.query]
+
+        if args.counts:
+            print(store.decision_date_counts(spec).to_string(index=False))
+        elif args.query or args.output:
+            matches = store.query(spec)
+            print(matches.head(20))
+            print(f"{len(matches)} matching records.")
+            if args.output:
+                matches.to_csv(args.output, index=False)
+        print(f"{len(store)} records in {args.path}.")
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from canonical import add_canonical_columns, load_canonicalizers, normalize_name, save_canonicalizers
+
+
+@pytest.fixture
+def canonicalizers():
+    return load_canonicalizers(cache_path=None)
+
+
+def test_normalize_name():
+    assert normalize_name("Université de Montréal (UdeM)") == "universite de montreal udem"
+    assert normalize_name("Texas A&M Univ.") == "texas a and m university"
+
+
+@pytest.mark.parametrize("raw, canonical", [
+    ("UCLA", "University of California-Los Angeles"),
+    ("University of California, Los Angeles (UCLA)", "University of California-Los Angeles"),
+    ("University Of Washington", "University of Washington"),
+    ("Univeristy of Washington", "University of Washington"),
+    ("Texas A&M University - College Station (TAMU)", "Texas A&M University - College Station"),
+])
+def test_schools(canonicalizers, raw, canonical):
+    assert canonicalizers["School"].resolve(raw) == canonical
+
+
+def test_similar_but_different_schools_stay_apart(canonicalizers):
+    schools = canonicalizers["School"]
+    assert schools.resolve("University of California-Irvine") == "University of California-Irvine"
+    assert schools.resolve("University of California-Davis") == "University of California-Davis"
+    assert schools.resolve("University of California - Irvine") == "University of California-Irvine"
+    assert schools.resolve("Boston College") != schools.resolve("Boston University")
+
+
+@pytest.mark.parametrize("raw, canonical", [
+    ("IDSS SES", "Social And Engineering Systems"),
+    ("Social and Engineering Systems", "Social And Engineering Systems"),
+    ("Social And Engineering Systems (IDSS)", "Social And Engineering Systems"),
+    ("IDSS", "Institute For Data, Systems And Society"),
+    ("Statistical Sciences", "Statistical Science"),
+    ("Data Science (CDS)", "Data Science"),
+    ("Biostatistics", "Biostatistics"),
+])
+def test_programs(canonicalizers, raw, canonical):
+    assert canonicalizers["Program"].resolve(raw) == canonical
+
+
+def test_mapping_cache_persists(tmp_path):
+    cache = str(tmp_path / "cache.json")
+    df = pd.DataFrame({"School": ["Stanford University", "Standford University", "", "UCLA"],
+                       "Program": ["Computer Science", "Computer Sciences", "Statistics", "Statistic"]})
+    out = add_canonical_columns(df, cache_path=cache)
+    assert out["School_Canonical"].tolist() == ["Stanford University", "Stanford University", "",
+                                                "University of California-Los Angeles"]
+    assert out["Program_Canonical"].tolist() == ["Computer Science", "Computer Science", "Statistics", "Statistics"]
+
+    reloaded = load_canonicalizers(cache)
+    assert reloaded["School"].mapping["Standford University"] == "Stanford University"
+    # A new spelling resolved after reloading joins the cached canonical name
+    assert reloaded["Program"].resolve("Computer  Science") == "Computer Science"
+    save_canonicalizers(reloaded, cache)
+    assert "Computer  Science" in load_canonicalizers(cache)["Program"].mapping
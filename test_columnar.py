@@ -0,0 +1,60 @@
+import pandas as pd
+
+from benchmarks.synthetic_pages import synthetic_pages
+from benchmarks.tag_parsing import synthetic_tag_lists
+from columnar import (TAG_COLUMNS, add_tag_columns, build_records_frame, effective_year_batch,
+                      normalize_decision_dates, parse_tags_batch)
+from gradstats_debug import (_normalize_decision_date, build_record, compute_effective_year, parse_extra_tags,
+                             parse_season_year)
+from parsers import extract_rows
+
+
+def per_record(tag_lists):
+    return [parse_extra_tags(tags) + parse_season_year(tags) for tags in tag_lists]
+
+
+def test_batch_matches_per_record_functions():
+    tag_lists = synthetic_tag_lists(2000, seed=1) + [
+        [],
+        ["GRE V 156"],                               # also matches the GRE total pattern
+        ["International", "american"],               # the last nationality tag wins
+        ["spring 2024", "Fall 2025"],                # the first season tag wins
+        ["GPA 3.9", "GPA 3.1", "Fall 20255"],
+    ]
+    batch = parse_tags_batch(tag_lists)
+    assert list(batch.columns) == TAG_COLUMNS
+    assert [tuple(row) for row in batch.itertuples(index=False)] == per_record(tag_lists)
+
+
+def test_empty_input_and_add_tag_columns():
+    assert len(parse_tags_batch([])) == 0
+
+    df = pd.DataFrame({"Tags": [["Fall 2025", "GPA 3.50"], []], "GPA": ["", "4.0"]}, index=[10, 11])
+    out = add_tag_columns(df)
+    assert out.loc[10, "GPA"] == "3.50" and out.loc[10, "Season"] == "Fall"
+    assert out.loc[11, "GPA"] == ""
+
+
+def test_decision_dates_match_per_record_function():
+    raw_dates = ["24 Dec", "29 Feb", "Feb 29, 2024", "2024-02-29", "15 Jul", "3 Nov", "", "garbage", "10 Jan",
+                 "29 Feb", "15 Jun", None]
+    seasons = ["Fall", "Fall", "Spring", "Fall", "Spring", "fall", "Fall", "Fall", "", "Spring", "Summer", "Fall"]
+    years = ["2025", "2024", "2025", "2025", "2025", "2023", "2025", "2025", "2025", "2100", "2025", ""]
+    batch = normalize_decision_dates(raw_dates, seasons, years)
+    expected = [_normalize_decision_date(raw or "", season, year)
+                for raw, season, year in zip(raw_dates, seasons, years)]
+    assert [tuple(row) for row in batch.itertuples(index=False)] == expected
+
+    iso_dates = ["2024-12-03", "2025-07-01", "2025-03-01", "", "2025-11-30", "not a date"]
+    seasons = ["Fall", "Spring", "Spring", "Fall", "", "Fall"]
+    years = ["2025", "2026", "2025", "2025", "2025", "2025"]
+    assert list(effective_year_batch(seasons, years, iso_dates)) == [
+        compute_effective_year(season, year, iso) for season, year, iso in zip(seasons, years, iso_dates)]
+
+
+def test_build_records_frame_matches_build_record():
+    rows = []
+    for html in synthetic_pages(20):
+        rows.extend(extract_rows(html))
+    expected = pd.DataFrame([build_record(row) for row in rows])
+    pd.testing.assert_frame_equal(build_records_frame(rows), expected)
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_pages import synthetic_page
+from cube import build_cube, decision_timeline, load_cube, rebuild_cube
+from dataset import read_dataset, to_typed_frame
+from gradstats_debug import parse_results_page
+from sinks import DatasetSink
+
+pytest.importorskip("pyarrow")
+
+
+def synthetic_records(pages, seed=0):
+    records = []
+    for page in range(pages):
+        records += parse_results_page(synthetic_page(50, seed=seed + page)[0])
+    return records
+
+
+def test_incremental_cube_matches_rebuild(tmp_path):
+    root = str(tmp_path / "dataset")
+    first, second = synthetic_records(2), synthetic_records(2, seed=10)
+    with DatasetSink(root) as sink:
+        sink.write(first)
+        sink.flush()
+        sink.write(second)
+
+    incremental = load_cube(root)
+    assert incremental["count"].sum() == len(first) + len(second)
+    assert len(read_dataset(root)) == len(first) + len(second)  # the cube file is not read as data
+
+    key = ["School", "Program", "Degree_Type", "Season", "effective_year", "Decision", "DecisionWeek"]
+    rebuilt = rebuild_cube(root)
+    a = incremental.astype({name: str for name in key}).sort_values(key).reset_index(drop=True)
+    b = rebuilt.astype({name: str for name in key}).sort_values(key).reset_index(drop=True)
+    pd.testing.assert_frame_equal(a, b)
+
+
+def test_timeline_matches_raw_rows():
+    typed = to_typed_frame(pd.DataFrame(synthetic_records(4)))
+    cube = build_cube(typed)
+
+    schools = ["Stanford University", "Harvard University"]
+    timeline = decision_timeline(cube, School=schools, Season="Fall", Decision="Accepted")
+
+    rows = typed[typed["School"].isin(schools) & (typed["Season"] == "Fall") & (typed["Decision"] == "Accepted")]
+    weeks = rows["DecisionDate"] - pd.to_timedelta(rows["DecisionDate"].dt.dayofweek, unit="D")
+    expected = weeks.dt.normalize().value_counts(dropna=False)
+    assert timeline.sum() == len(rows)
+    assert timeline.sort_index().tolist() == expected.sort_index().tolist()
+
+    with pytest.raises(ValueError):
+        decision_timeline(cube, Campus="x")
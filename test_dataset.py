@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from dataset import read_dataset, to_typed_frame, write_dataset
+from gradstats_debug import parse_results_page
+from sinks import DatasetSink
+
+pytest.importorskip("pyarrow")
+
+
+def load_fixture_records():
+    with open("test_sc.html", encoding="utf-8") as f:
+        return parse_results_page(f.read())
+
+
+def test_typed_roundtrip(tmp_path):
+    df = pd.DataFrame(load_fixture_records())
+    df.loc[0, "Year"] = ""  # a record without a season tag
+    root = str(tmp_path / "dataset")
+    write_dataset(df, root)
+
+    loaded = read_dataset(root)
+    assert len(loaded) == len(df)
+    assert str(loaded["School"].dtype) == "category"
+    assert str(loaded["Season"].dtype) == "category"
+    assert str(loaded["GPA"].dtype) == "Float32"
+    assert str(loaded["Year"].dtype) == "Int16"
+    assert loaded["Year"].isna().sum() == 1
+    assert loaded["DecisionDate"].dtype.kind == "M"
+
+    expected = to_typed_frame(df)
+    key = ["School", "Program", "Comment"]
+    a = loaded.sort_values(key).reset_index(drop=True)
+    b = expected.sort_values(key).reset_index(drop=True)
+    assert (a["DecisionDate"] == b["DecisionDate"]).all()
+    assert a["GPA"].astype(float).fillna(-1).tolist() == b["GPA"].astype(float).fillna(-1).tolist()
+
+
+def test_partition_pruning_and_column_selection(tmp_path):
+    root = str(tmp_path / "dataset")
+    with DatasetSink(root) as sink:
+        sink.write(load_fixture_records())
+
+    fall_2025 = read_dataset(root, columns=["School", "Decision"], filters={"Year": 2025, "Season": "Fall"})
+    assert list(fall_2025.columns) == ["School", "Decision"]
+    assert 0 < len(fall_2025) <= 20
+    assert len(read_dataset(root, filters={"Year": [1999]})) == 0
+
+
+def test_old_csv_date_format():
+    df = pd.DataFrame({"Date_Posted": ["December 25, 2024", "2024-12-26", ""]})
+    typed = to_typed_frame(df)
+    assert typed["Date_Posted"].dt.strftime("%Y-%m-%d").tolist()[:2] == ["2024-12-25", "2024-12-26"]
+    assert pd.isna(typed["Date_Posted"].iloc[2])
@@ -0,0 +1,40 @@
+import itertools
+
+import pandas as pd
+
+from date_utils import standardize_date, standardize_date_column, standardize_date_strptime
+
+
+def date_strings():
+    months = ["December", "Dec", "dec", "DECEMBER", "February", "Feb", "feb", "Sept", "May", "Mai"]
+    days = [str(day) for day in range(0, 33)] + ["01", "09", "001", "+5"]
+    for month, day in itertools.product(months, days):
+        yield f"{month} {day}"
+        yield f"{day} {month}"
+        yield f"{month} {day}, 2024"
+        yield f"{day} {month} 2023"
+        yield f" {month}  {day} "
+    yield from [
+        "", "   ", ",", "29 Feb", "29 feb 2024", "Feb 29", "Feb 29 2024", "29  Feb", "129 Feb",
+        "Dec 28 24", "Dec 28 0999", "Dec 28 1900", "Dec 28 2024 extra", "28", "Dec", "junk here",
+        "31 Apr", "Apr 31 2025", "28 Dec, 2024", "December 28,2024",
+        ", Dec 28", "Dec 28 ,", " , 28 Dec", "Feb 29 1900", "29 Feb 1900", "feb 29, 1900",
+    ]
+
+
+def test_matches_strptime_version():
+    for date_str, default_year in itertools.product(date_strings(), [None, 0, 2024, 2025]):
+        expected = standardize_date_strptime(date_str, default_year)
+        assert standardize_date(date_str, default_year) == expected, (date_str, default_year)
+
+
+def test_column_version():
+    # "Feb 29" is not rewritten like "29 Feb", and strptime rejects it without a year
+    dates = pd.Series(["28 Dec", "28 Dec", "Feb 29", "December 28, 2024", None, "junk"], index=list("abcdef"))
+    years = [2025, 2024, 2025, 2020, 2025, float("nan")]
+    out = standardize_date_column(dates, years)
+    assert list(out.index) == list("abcdef")
+    assert out.tolist() == ["2025-12-28", "2024-12-28", "", "2024-12-28", "", ""]
+
+    assert standardize_date_column(["28 Dec"], 2023).tolist() == ["2023-12-28"]
+    assert standardize_date_column(["28 Dec"]).tolist() == ["1900-12-28"]
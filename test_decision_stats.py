@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_pages import synthetic_page
+from dataset import to_typed_frame
+from decision_stats import (GROUP_COLUMNS, build_distributions, load_records, save_distributions,
+                            timing_gaps)
+from gradstats_debug import parse_results_page
+
+
+@pytest.fixture(scope="module")
+def typed():
+    rows = []
+    for page in range(20):
+        rows += parse_results_page(synthetic_page(50, seed=page)[0])
+    return to_typed_frame(pd.DataFrame(rows))
+
+
+@pytest.fixture(scope="module")
+def distributions(typed):
+    return build_distributions(typed)
+
+
+def _dated(typed):
+    return typed.dropna(subset=["DecisionDate", "effective_year"])
+
+
+def test_bins_match_groupby(typed, distributions):
+    bins, summary = distributions
+    dated = _dated(typed)
+    year_start = pd.to_datetime(dated["effective_year"].astype(str) + "-01-01")
+    dated = dated.assign(bin_start=year_start + pd.to_timedelta((dated["DecisionDate"] - year_start).dt.days // 3 * 3,
+                                                                 unit="D"))
+    expected = dated.groupby(GROUP_COLUMNS + ["bin_start"], observed=True, dropna=False).size()
+    counted = bins[bins["count"] > 0].set_index(GROUP_COLUMNS + ["bin_start"])["count"]
+    assert counted.to_dict() == expected.to_dict()
+    assert summary["count"].sum() == len(dated)
+
+
+def test_summary_matches_pandas_quantiles(typed, distributions):
+    _, summary = distributions
+    dates = _dated(typed).groupby(GROUP_COLUMNS, observed=True, dropna=False)["DecisionDate"]
+    assert summary["median"].tolist() == dates.median().tolist()
+    assert summary["q10"].tolist() == dates.quantile(0.1).tolist()
+    assert summary["q90"].tolist() == dates.quantile(0.9).tolist()
+    assert summary["first"].tolist() == dates.min().tolist()
+    assert summary["last"].tolist() == dates.max().tolist()
+
+
+def test_density_is_a_gaussian_kde(typed):
+    bins, summary = build_distributions(typed, bin_days=1, bandwidth=4)
+    largest = summary.sort_values("count").iloc[-1]
+    key = tuple(largest[name] for name in GROUP_COLUMNS)
+    rows = bins.set_index(GROUP_COLUMNS).loc[key]
+    dates = _dated(typed).groupby(GROUP_COLUMNS, observed=True, dropna=False)["DecisionDate"].get_group(key)
+
+    days = (rows["bin_start"] - dates.min()).dt.days.to_numpy()[:, None]
+    offsets = (dates - dates.min()).dt.days.to_numpy()[None, :]
+    direct = np.exp(-0.5 * ((days - offsets) / 4) ** 2).sum(axis=1) / (len(dates) * 4 * np.sqrt(2 * np.pi))
+    assert np.allclose(rows["density"], direct, atol=1e-6)
+    # Daily densities of a group sum to about one, less what falls outside the year
+    assert 0.9 < rows["density"].sum() <= 1.0001
+
+
+def test_timing_gaps_and_saved_tables(typed, distributions, tmp_path):
+    bins, summary = distributions
+    gaps = timing_gaps(summary)
+    both = gaps.dropna(subset=["median_accepted", "median_rejected"])
+    assert len(both)
+    row = both.iloc[0]
+    assert row["accept_to_reject_days"] == (row["median_rejected"] - row["median_accepted"]).days
+
+    save_distributions(bins, summary, str(tmp_path / "out"))
+    saved = pd.read_parquet(tmp_path / "out" / "decision_summary.parquet")
+    assert saved["median"].tolist() == summary["median"].tolist()
+    assert len(pd.read_parquet(tmp_path / "out" / "decision_gaps.parquet")) == len(gaps)
+
+    # A scraper CSV (all text) gives the same tables
+    csv_path = tmp_path / "records.csv"
+    to_csv = typed.assign(DecisionDate=typed["DecisionDate"].dt.strftime("%Y-%m-%d"))
+    to_csv.to_csv(csv_path, index=False)
+    from_csv, _ = build_distributions(load_records(str(csv_path)))
+    assert from_csv["count"].tolist() == bins["count"].tolist()
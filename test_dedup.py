@@ -0,0 +1,46 @@
+from benchmarks.synthetic_pages import synthetic_page
+from dedup import FingerprintSet, fingerprint_key
+from gradstats_debug import scrape_to_sink
+from instrumentation import RunStats
+from local_server import serve_fixture
+from sinks import JsonlSink
+
+
+def make_record(n):
+    return {"School": f"School {n}", "Program": "Statistics", "Degree_Type": "PhD", "Date_Posted": "2025-01-02",
+            "Decision": "Accepted", "Tags": ["Fall 2025"], "Comment": ""}
+
+
+def test_fingerprint_set_persists_grows_and_only_keeps_committed(tmp_path):
+    path = str(tmp_path / "seen.fp")
+    records = [make_record(n) for n in range(300)]
+    with FingerprintSet(path, capacity=16) as seen:
+        assert seen.filter_new(records + records[:10]) == records
+        assert len(seen) == 300
+
+    seen = FingerprintSet(path)
+    assert len(seen) == 300
+    assert all(fingerprint_key(record) in seen for record in records)
+    assert seen.filter_new([make_record(0), make_record(300)]) == [make_record(300)]
+    seen.discard_pending()
+    seen.close()
+
+    assert len(FingerprintSet(path)) == 300
+
+
+def test_scrape_drops_drifted_and_rerun_duplicates(tmp_path):
+    server, base_url = serve_fixture(num_pages=4)
+    # Page 3 repeats page 2, as if 20 new results were posted mid-scrape
+    server.pages = lambda page_num: synthetic_page(20, seed=2 if page_num == 3 else page_num)[0].encode()
+    path = str(tmp_path / "seen.fp")
+    try:
+        run_stats = RunStats()
+        with FingerprintSet(path) as seen, JsonlSink(str(tmp_path / "first.jsonl")) as sink:
+            assert scrape_to_sink(sink, base_url, max_pages=4, flush_every=1, seen=seen,
+                                  run_stats=run_stats) == 60
+        assert run_stats.counters["duplicates"] == 20
+
+        with FingerprintSet(path) as seen, JsonlSink(str(tmp_path / "second.jsonl")) as sink:
+            assert scrape_to_sink(sink, base_url, max_pages=5, seen=seen) == 0
+    finally:
+        server.shutdown()
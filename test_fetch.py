@@ -0,0 +1,99 @@
+import time
+
+from fetch import PageFetcher, RateLimiter, fetch_pages
+from gradstats_debug import scrape_gradcafe_with_program_type
+from local_server import serve_fixture
+
+
+def test_fetch_pages_keeps_order():
+    # Earlier URLs finish last, so completion order is the reverse of input order
+    def slow_fetch(url):
+        time.sleep(0.05 * (5 - int(url)))
+        return url
+
+    urls = [str(n) for n in range(5)]
+    assert list(fetch_pages(urls, concurrency=5, fetch=slow_fetch)) == urls
+
+
+def test_rate_limiter_spaces_requests_per_host():
+    limiter = RateLimiter(rate=20)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.wait("http://a.example/x")
+    limiter.wait("http://b.example/x")  # a different host is not held back
+    assert time.monotonic() - start >= 4 * 0.05 - 0.01
+
+
+def test_concurrent_scrape_matches_sequential():
+    server, base_url = serve_fixture(latency=0.01)
+    try:
+        sequential = scrape_gradcafe_with_program_type(base_url, max_pages=4)
+        concurrent = scrape_gradcafe_with_program_type(base_url, max_pages=4, concurrency=4)
+    finally:
+        server.shutdown()
+
+    assert len(sequential) > 0
+    assert sequential.equals(concurrent)
+
+
+def test_fetcher_retries_5xx_and_uses_etags():
+    server, base_url = serve_fixture(flaky_pages={1: 2})
+    fetcher = PageFetcher(backoff_base=0.01)
+    try:
+        url = f"{base_url}?page=1&sort=newest"
+        first = fetcher.fetch(url)
+        second = fetcher.fetch(url)
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+    assert first.status_code == 200 and not first.not_modified
+    assert second.status_code == 200 and second.not_modified
+    assert second.text == first.text
+
+    stats = fetcher.stats.as_dict()
+    assert stats["retries"] == 2
+    assert stats["not_modified"] == 1
+    assert stats["bytes_saved"] == len(first.text.encode("utf-8"))
+
+
+def test_fetcher_without_cache_remembers_a_bounded_number_of_pages():
+    server, base_url = serve_fixture()
+    fetcher = PageFetcher(max_remembered=2)
+    try:
+        for page_num in range(1, 6):
+            fetcher.fetch(f"{base_url}?page={page_num}")
+        assert list(fetcher._validators) == [f"{base_url}?page=4", f"{base_url}?page=5"]
+        assert fetcher.fetch(f"{base_url}?page=5").not_modified
+        assert not fetcher.fetch(f"{base_url}?page=1").not_modified
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+
+def test_skipped_pages_are_retried_not_dropped():
+    server, base_url = serve_fixture(flaky_pages={2: 3})
+    try:
+        clean = scrape_gradcafe_with_program_type(base_url, max_pages=3, fetcher=PageFetcher())
+        # page 2 outlasts the fetcher's single retry, so only the retry queue saves it
+        server.flaky_pages = {2: 3}
+        recovered = scrape_gradcafe_with_program_type(
+            base_url, max_pages=3, concurrency=3,
+            fetcher=PageFetcher(max_retries=1, backoff_base=0.01), retry_rounds=2,
+        )
+    finally:
+        server.shutdown()
+
+    assert clean.equals(recovered)
+
+
+def test_parse_workers_match_in_process():
+    server, base_url = serve_fixture()
+    try:
+        in_process = scrape_gradcafe_with_program_type(base_url, max_pages=4, concurrency=2)
+        pooled = scrape_gradcafe_with_program_type(base_url, max_pages=4, concurrency=2, parse_workers=2)
+    finally:
+        server.shutdown()
+
+    assert len(in_process) > 0
+    assert in_process.equals(pooled)
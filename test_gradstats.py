@@ -0,0 +1,75 @@
+import argparse
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from gradstats import list_benchmarks, main, page_range, summarize
+from local_server import serve_fixture
+
+
+def test_page_range():
+    assert page_range("1-3,7,5-6") == [1, 2, 3, 5, 6, 7]
+    assert page_range("4") == [4]
+    for text in ["3-1", "0-2", "a-b"]:
+        with pytest.raises(argparse.ArgumentTypeError):
+            page_range(text)
+
+
+def test_scraper_modules_import_without_heavy_dependencies():
+    code = ("import sys, gradstats, gradstats_debug, dedup, shards; gradstats.build_parser(); "
+            "print(sorted(name for name in ('pandas', 'numpy', 'requests', 'bs4') if name in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    # dedup needs numpy for its table; nothing here needs pandas or requests at import time
+    assert output.strip() == "['numpy']"
+
+
+def test_scrape_parse_offline_and_stats(tmp_path, capsys):
+    server, base_url = serve_fixture()
+    output = tmp_path / "scraped.csv"
+    try:
+        main(["scrape", "--base-url", base_url, "--pages", "1-2,4", "--sink", "csv", "--output", str(output),
+              "--cache-dir", str(tmp_path / "cache")])
+    finally:
+        server.shutdown()
+    scraped = pd.read_csv(output, dtype=str, keep_default_na=False)
+    assert len(scraped) == 60
+
+    # The cached pages parse again without the server
+    cached = tmp_path / "cached.csv"
+    main(["parse-offline", "--base-url", base_url, "--pages", "1-2,4", "--sink", "csv", "--output", str(cached),
+          "--cache-dir", str(tmp_path / "cache")])
+    assert cached.read_text(encoding="utf-8") == output.read_text(encoding="utf-8")
+
+    from_file = tmp_path / "from_file.csv"
+    main(["parse-offline", "test_sc.html", "--output", str(from_file)])
+    assert len(pd.read_csv(from_file, dtype=str, keep_default_na=False)) == 20
+
+    summary = summarize(str(output))
+    assert summary["records"] == 60
+    assert sum(summary["decisions"].values()) == 60
+    capsys.readouterr()
+    main(["stats", str(output)])
+    assert '"records": 60' in capsys.readouterr().out
+
+
+def test_bench_lists_benchmarks(capsys):
+    assert "decision_dates" in list_benchmarks() and "synthetic_pages" not in list_benchmarks()
+    main(["bench"])
+    assert "parse_scaling" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("argv", [
+    ["scrape", "--sink", "csv", "--incremental"],
+    ["scrape", "--sink", "jsonl", "--canonicalize"],
+    ["parse-offline", "test_sc.html", "--incremental"],
+    ["parse-offline", "--cache-dir", ""],
+    ["scrape", "--offline", "--cache-dir", ""],
+    ["scrape", "--offline", "--discover"],
+])
+def test_ignored_option_combinations_are_rejected(argv, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        main(argv)
+    assert excinfo.value.code == 2
+    assert "error:" in capsys.readouterr().err
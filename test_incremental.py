@@ -0,0 +1,63 @@
+from gradstats_debug import scrape_gradcafe_with_program_type
+from incremental import ScrapeState, merge_new_records, record_fingerprint
+from local_server import serve_fixture
+
+
+def make_record(school, date_posted):
+    return {"School": school, "Program": "Statistics", "Degree_Type": "PhD", "Date_Posted": date_posted,
+            "Decision": "Accepted", "Tags": ["Fall 2025"], "Comment": ""}
+
+
+def test_split_new_stops_at_first_seen_record(tmp_path):
+    state = ScrapeState()
+    old = [make_record("Duke University", "2024-12-27"), make_record("Rice University", "2024-12-26")]
+    state.advance(old)
+    assert state.newest_date_posted == "2024-12-27"
+
+    state_path = str(tmp_path / "state.json")
+    state.save(state_path)
+    state = ScrapeState.load(state_path)
+
+    same_day = make_record("Cornell University", "2024-12-27")
+    page = [make_record("Boston University", "2024-12-28"), same_day] + old
+    new, reached_seen = state.split_new(page)
+    assert reached_seen
+    assert new == page[:2]
+
+    # Older than the high-water mark counts as seen even without a fingerprint
+    assert state.is_seen(make_record("New York University", "2024-12-01"))
+    assert record_fingerprint(same_day) != record_fingerprint(old[0])
+
+
+def test_year_less_dates_do_not_count_as_seen():
+    state = ScrapeState()
+    state.advance([make_record("Duke University", "2024-12-27"), make_record("Rice University", "1900-12-28")])
+    assert state.newest_date_posted == "2024-12-27"
+
+    # "28 Dec" without a year was normalized to 1900; it may be from today
+    year_less = make_record("Boston University", "1900-12-28")
+    assert not state.is_seen(year_less)
+    assert state.split_new([year_less]) == ([year_less], False)
+    assert state.is_seen(make_record("Rice University", "1900-12-28"))  # by fingerprint
+    assert state.is_seen(make_record("New York University", "2024-12-01"))
+
+
+def test_incremental_scrape_stops_early_and_merges(tmp_path):
+    server, base_url = serve_fixture(num_pages=50)
+    state = ScrapeState()
+    csv_path = str(tmp_path / "results.csv")
+    try:
+        first = scrape_gradcafe_with_program_type(base_url, max_pages=1, state=state)
+        merge_new_records(csv_path, first)
+
+        hits_before = server.hits
+        second = scrape_gradcafe_with_program_type(base_url, max_pages=50, concurrency=4, state=state)
+        merged = merge_new_records(csv_path, second)
+    finally:
+        server.shutdown()
+
+    assert len(first) > 0
+    assert len(second) == 0
+    assert len(merged) == len(first)
+    # Page 1 is all seen, so at most the prefetch window (2 * concurrency) went out
+    assert server.hits - hits_before <= 8
@@ -0,0 +1,51 @@
+import json
+import logging
+
+from gradstats_debug import scrape_gradcafe_with_program_type
+from instrumentation import TIMERS, RunStats
+from local_server import serve_fixture
+
+
+def test_merge_and_summary():
+    stats = RunStats()
+    with stats.timer("fetch"):
+        pass
+    stats.count("rows", 3)
+    stats.merge({"timers": {"row_parse": 0.5}, "counters": {"rows": 2, "parse_failures": 1}})
+    stats.sections["fetch"] = {"requests": 4}
+
+    summary = json.loads(stats.summary())
+    assert summary["counters"]["rows"] == 5 and summary["counters"]["parse_failures"] == 1
+    assert summary["timers"]["row_parse"] == 0.5
+    assert summary["fetch"] == {"requests": 4}
+
+
+def test_scrape_fills_stats_and_prints_nothing(capsys, caplog):
+    server, base_url = serve_fixture(num_pages=2, flaky_pages={1: 5})
+    stats = RunStats()
+    try:
+        with caplog.at_level(logging.WARNING, logger="gradstats"):
+            df = scrape_gradcafe_with_program_type(base_url, max_pages=3, retry_rounds=0, run_stats=stats)
+    finally:
+        server.shutdown()
+
+    assert capsys.readouterr().out == ""
+    assert "Skipping page 1" in caplog.text
+    summary = json.loads(stats.summary())
+    assert summary["counters"]["rows"] == len(df) > 0
+    assert summary["counters"]["pages_parsed"] == 2
+    assert summary["counters"]["pages_skipped"] == 1
+    assert summary["counters"]["pages_without_table"] == 1
+    assert all(summary["timers"][name] >= 0 for name in TIMERS)
+    assert summary["fetch"]["requests"] > 0
+
+
+def test_parse_worker_stats_come_back():
+    server, base_url = serve_fixture()
+    stats = RunStats()
+    try:
+        df = scrape_gradcafe_with_program_type(base_url, max_pages=2, parse_workers=1, run_stats=stats)
+    finally:
+        server.shutdown()
+    assert stats.counters["rows"] == len(df) > 0
+    assert stats.timers["soup_build"] > 0 and stats.timers["tag_parse"] > 0
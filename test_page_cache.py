@@ -0,0 +1,60 @@
+import os
+import time
+
+from fetch import PageFetcher
+from gradstats_debug import scrape_gradcafe_with_program_type
+from local_server import serve_fixture
+from page_cache import PageCache, default_ttl
+
+
+def test_roundtrip_and_ttl(tmp_path):
+    cache = PageCache(str(tmp_path), ttl=lambda page_num: 0 if page_num == 1 else 3600)
+    cache.store("http://x/survey?page=1", "<p>one</p>", etag='"a"')
+    cache.store("http://x/survey?page=50", "<p>fifty</p>")
+
+    first = cache.lookup("http://x/survey?page=1")
+    deep = cache.lookup("http://x/survey?page=50")
+    assert first.text == "<p>one</p>" and first.etag == '"a"' and not first.fresh
+    assert deep.text == "<p>fifty</p>" and deep.fresh
+    assert cache.lookup("http://x/survey?page=2") is None
+
+    assert default_ttl(1) < default_ttl(10) < default_ttl(1000)
+
+
+def test_lru_eviction(tmp_path):
+    cache = PageCache(str(tmp_path), max_bytes=10 ** 9)
+    body = os.urandom(2000).hex()  # incompressible enough to give a stable size
+    for n in range(3):
+        cache.store(f"http://x/?page={n}", body)
+    entry_size = os.path.getsize(cache.path_for("http://x/?page=0"))
+
+    # Read page 0 so page 1 becomes the least recently used
+    old = time.time() - 100
+    for n in range(3):
+        os.utime(cache.path_for(f"http://x/?page={n}"), (old + n, old + n))
+    cache.lookup("http://x/?page=0")
+
+    cache.max_bytes = int(entry_size * 3.5)
+    cache.store("http://x/?page=3", body)
+
+    assert cache.lookup("http://x/?page=1") is None
+    assert cache.lookup("http://x/?page=0") is not None
+    assert cache.lookup("http://x/?page=3") is not None
+
+
+def test_offline_scrape_matches_online(tmp_path):
+    cache = PageCache(str(tmp_path))
+    server, base_url = serve_fixture()
+    try:
+        online = scrape_gradcafe_with_program_type(base_url, max_pages=2, cache=cache)
+    finally:
+        server.shutdown()
+
+    fetcher = PageFetcher(cache=cache, offline=True)
+    offline = scrape_gradcafe_with_program_type(base_url, max_pages=3, fetcher=fetcher)
+
+    assert len(cache) == 2
+    assert online.equals(offline)
+    assert fetcher.stats.cache_hits == 2
+    assert fetcher.stats.cache_misses == 1
+    assert fetcher.stats.requests == 0
@@ -0,0 +1,99 @@
+import logging
+import time
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_pages import synthetic_page
+from gradstats import main
+from gradstats_debug import iter_scraped_pages, scrape_gradcafe_with_program_type
+from local_server import serve_fixture
+from pagination import discover_last_page, last_page_link, probe_last_page
+
+
+def test_last_page_link():
+    with open("test_sc.html", encoding="utf-8") as f:
+        assert last_page_link(f.read()) == 44148
+    assert last_page_link('<a href="/survey/index.php?q=x&amp;page=7">7</a>') == 7
+    assert last_page_link("<p>No results.</p>") is None
+
+
+@pytest.mark.parametrize("last", [1, 2, 37, 44148])
+def test_probe_finds_last_page_in_logarithmic_requests(last):
+    probed = []
+
+    def has_results(page_num):
+        probed.append(page_num)
+        return page_num <= last
+
+    assert probe_last_page(has_results) == last
+    assert len(probed) <= 2 * last.bit_length() + 1
+    assert probe_last_page(has_results, known_empty=last + 1000) == last
+    probed.clear()
+    assert probe_last_page(has_results, limit=20) == min(last, 20)
+    assert max(probed) <= 20
+
+
+def test_discover_checks_the_pagination_widget():
+    # The fixture's widget links page 44148; the stand-in serves that many
+    server, base_url = serve_fixture(num_pages=44148)
+    try:
+        assert discover_last_page(base_url) == 44148
+        assert server.hits == 3  # page 1, the last page and the one after it
+        assert discover_last_page(base_url, max_pages=100) == 100
+    finally:
+        server.shutdown()
+
+
+def test_discover_probes_when_the_widget_is_wrong():
+    server, base_url = serve_fixture(num_pages=37)
+    try:
+        assert discover_last_page(base_url) == 37
+        # Pages without a widget are found by doubling and bisecting
+        server.pages = lambda page_num: synthetic_page(5, seed=page_num)[0].encode()
+        hits = server.hits
+        assert discover_last_page(base_url) == 37
+        assert server.hits - hits <= 13
+        server.num_pages = 0
+        assert discover_last_page(base_url) == 0
+    finally:
+        server.shutdown()
+
+
+def test_scrape_stops_after_empty_pages(tmp_path, caplog):
+    server, base_url = serve_fixture(num_pages=5)
+    try:
+        with caplog.at_level(logging.WARNING, logger="gradstats"):
+            df = scrape_gradcafe_with_program_type(base_url, max_pages=2000)
+        assert len(df) == 100
+        assert server.hits == 8  # 5 pages and a run of 3 empty ones
+        assert "1992 planned page(s) not fetched" in caplog.text
+
+        # An explicit page list is fetched in full, empty pages or not
+        hits = server.hits
+        assert [n for n, _ in iter_scraped_pages(base_url, pages=range(3, 12))] == list(range(3, 12))
+        assert server.hits - hits == 9
+
+        output = tmp_path / "discovered.csv"
+        hits = server.hits
+        main(["scrape", "--base-url", base_url, "--discover", "--concurrency", "4", "--sink", "csv",
+              "--output", str(output), "--cache-dir", ""])
+        assert len(pd.read_csv(output, dtype=str, keep_default_na=False)) == 100
+        # Page 1, the widget's empty page 44148, bisecting 1-44148, then the 5 pages
+        assert server.hits - hits <= 2 + 16 + 5
+    finally:
+        server.shutdown()
+
+
+def test_discover_honours_the_rate_limit():
+    server, base_url = serve_fixture(num_pages=6)
+    server.pages = lambda page_num: synthetic_page(5, seed=page_num)[0].encode()
+    try:
+        started = time.perf_counter()
+        assert discover_last_page(base_url, rate_limit=20) == 6
+        elapsed = time.perf_counter() - started
+    finally:
+        server.shutdown()
+    # Every probe request after the first waits for its 1/20 s slot
+    assert server.hits >= 5
+    assert elapsed >= (server.hits - 1) / 20
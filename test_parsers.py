@@ -0,0 +1,35 @@
+import pytest
+
+from benchmarks.synthetic_pages import synthetic_page
+from gradstats_debug import parse_results_page
+from parsers import DEFAULT_PARSER, extract_rows, extract_rows_bs4
+
+pytest.importorskip("lxml")
+
+
+@pytest.mark.parametrize("html_path", ["test_sc.html", "test_local.html"])
+def test_backends_agree(html_path):
+    with open(html_path, encoding="utf-8") as f:
+        html = f.read()
+
+    bs4_rows = extract_rows(html, "bs4")
+    assert bs4_rows
+    assert extract_rows(html, "lxml") == bs4_rows
+    assert parse_results_page(html, "lxml") == parse_results_page(html, "bs4")
+
+
+def test_missing_table():
+    html = "<html><body><p>No results.</p></body></html>"
+    assert extract_rows_bs4(html) is None
+    assert extract_rows(html, "lxml") is None
+    assert parse_results_page(html) == []
+
+
+def test_lxml_is_default():
+    assert DEFAULT_PARSER == "lxml"
+
+
+@pytest.mark.parametrize("parser", ["bs4", "lxml"])
+def test_synthetic_page_round_trips(parser):
+    html, raw_rows = synthetic_page(40, seed=7)
+    assert extract_rows(html, parser) == raw_rows
@@ -0,0 +1,74 @@
+import json
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_pages import synthetic_page
+from gradstats_debug import parse_results_page
+from query import RecordIndex, main
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture(scope="module")
+def records():
+    rows = []
+    for page in range(10):
+        rows += parse_results_page(synthetic_page(30, seed=page)[0])
+    return pd.DataFrame(rows)
+
+
+def brute_force(df, schools=None, programs=None, degree_types=None, years=None, decision_from=None):
+    mask = pd.Series(True, index=df.index)
+    if schools:
+        mask &= df["School"].isin(schools)
+    if programs:
+        mask &= df["Program"].isin(programs)
+    if degree_types:
+        mask &= df["Degree_Type"].isin(degree_types)
+    if years:
+        mask &= df["Year"].isin([str(year) for year in years])
+    if decision_from:
+        mask &= (df["DecisionDate"] >= decision_from) & (df["DecisionDate"] != "")
+    return list(df.index[mask])
+
+
+@pytest.mark.parametrize("spec", [
+    {"schools": ["Stanford University", "Harvard University"]},
+    {"schools": "Stanford University", "programs": ["Economics", "Statistics"], "degree_types": ["PhD"]},
+    {"programs": ["Economics"], "years": [2024, 2025]},
+    {"degree_types": ["Masters"], "decision_from": "2024-06-01"},
+    {"schools": ["No Such University"]},
+    {},
+])
+def test_matches_brute_force(records, spec):
+    index = RecordIndex(records)
+    as_lists = {key: [value] if key == "schools" and isinstance(value, str) else value for key, value in spec.items()}
+    expected = brute_force(records, **as_lists)
+    assert list(index.positions(spec)) == expected
+
+
+def test_any_of_and_validation(records):
+    index = RecordIndex(records)
+    a = {"schools": ["Stanford University"], "degree_types": ["PhD"]}
+    b = {"programs": ["History"]}
+    assert list(index.positions([a, b])) == sorted(set(index.positions(a)) | set(index.positions(b)))
+    with pytest.raises(ValueError):
+        index.positions({"school": ["Stanford University"]})
+
+
+def test_cli_saves_and_runs_queries(records, tmp_path, capsys):
+    csv_path = str(tmp_path / "records.csv")
+    records.to_csv(csv_path, index=False)
+    queries = str(tmp_path / "queries.json")
+    output = str(tmp_path / "out.csv")
+
+    main([csv_path, "--queries-file", queries, "--school", "Stanford University", "--degree-type", "PhD",
+          "--save", "stanford_phd"])
+    with open(queries, encoding="utf-8") as f:
+        assert json.load(f) == {"stanford_phd": {"schools": ["Stanford University"], "degree_types": ["PhD"]}}
+
+    main([csv_path, "--queries-file", queries, "--query", "stanford_phd", "--output", output])
+    saved = pd.read_csv(output)
+    assert len(saved) == len(brute_force(records, schools=["Stanford University"], degree_types=["PhD"])) > 0
+    assert "matching records" in capsys.readouterr().out
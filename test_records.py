@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_pages import synthetic_page
+from dataset import to_typed_frame
+from gradstats_debug import parse_results_page, scrape_gradcafe_with_program_type
+from local_server import serve_fixture
+from records import RecordTable, compact_record
+
+pytest.importorskip("pyarrow")
+
+
+def fixture_records():
+    with open("test_sc.html", encoding="utf-8") as f:
+        return parse_results_page(f.read())
+
+
+def test_compact_record_types():
+    record = dict(fixture_records()[0], GPA="3.50", GRE_V="", Year="2025")
+    compact = compact_record(record)
+    assert compact.GPA == 3.5 and compact.GRE_V is None and compact.Year == 2025
+    assert isinstance(compact.Tags, tuple)
+    assert compact.School is compact_record(record).School  # interned
+
+
+def test_table_frame_matches_typed_frame():
+    first = fixture_records()
+    second = parse_results_page(synthetic_page(30, seed=2)[0])
+    second[0]["Year"] = ""
+    table = RecordTable()
+    table.append(second, page_num=2)  # retried pages arrive late
+    table.append([compact_record(record) for record in first], page_num=1)
+
+    assert len(table) == len(first) + len(second)
+    pd.testing.assert_frame_equal(table.to_frame(), to_typed_frame(pd.DataFrame(first + second)))
+
+
+def test_compact_scrape():
+    server, base_url = serve_fixture()
+    try:
+        plain = scrape_gradcafe_with_program_type(base_url, max_pages=2)
+        compact = scrape_gradcafe_with_program_type(base_url, max_pages=2, compact=True)
+    finally:
+        server.shutdown()
+    pd.testing.assert_frame_equal(compact, to_typed_frame(plain))
@@ -0,0 +1,111 @@
+import subprocess
+import sys
+import time
+
+from benchmarks.synthetic_pages import synthetic_page
+from gradstats_debug import iter_scraped_pages
+from local_server import serve_fixture
+from shards import ShardQueue, merge_shards, missing_shards, run_local
+from sinks import CsvSink
+
+
+def test_queue_hands_out_each_shard_once_and_reclaims_expired_leases(tmp_path):
+    path = str(tmp_path / "queue.sqlite")
+    queue = ShardQueue(path, lease_seconds=0.2, max_attempts=2)
+    assert queue.plan(10, shard_size=4) == 3
+    assert queue.plan(10, shard_size=4) == 3  # planning again does not add shards
+
+    other = ShardQueue(path, lease_seconds=60)
+    first = queue.lease("a")
+    second = other.lease("b")
+    assert (first.first_page, first.last_page) == (1, 4)
+    assert (second.first_page, second.last_page) == (5, 8)
+    assert other.complete(second, 80)
+
+    # "a" stops renewing; once the lease expires the shard goes to someone else
+    third = other.lease("b")
+    assert third.first_page == 9
+    assert other.lease("b") is None
+    time.sleep(0.3)
+    retried = other.lease("b")
+    assert retried.shard_id == first.shard_id and retried.attempts == 2
+    assert not queue.renew(first)
+    assert not queue.complete(first, 80)
+
+    # A shard that keeps failing is given up after max_attempts
+    queue.release(retried)
+    other.release(third)
+    assert queue.progress() == {"done": 1, "failed": 1, "pending": 1}
+    assert not queue.finished()
+    queue.close()
+    other.close()
+
+
+def test_shard_whose_lease_keeps_expiring_is_failed(tmp_path):
+    queue = ShardQueue(str(tmp_path / "queue.sqlite"), lease_seconds=0.05, max_attempts=2)
+    queue.plan(2, shard_size=2)
+    assert queue.lease("a").attempts == 1
+    time.sleep(0.1)
+    assert queue.lease("b").attempts == 2
+    time.sleep(0.1)
+    # A worker died on every attempt: give up instead of handing it out forever
+    assert queue.lease("c") is None
+    assert queue.progress() == {"failed": 1}
+    assert queue.finished()
+    queue.close()
+
+
+def test_worker_processes_match_single_scrape_without_drifted_duplicates(tmp_path):
+    server, base_url = serve_fixture(num_pages=11, flaky_pages={6: 1})
+    # With sort=newest, 20 results posted during the scrape push page 2 onto page 3
+    server.pages = lambda page_num: synthetic_page(20, seed=2 if page_num == 3 else page_num)[0].encode()
+    try:
+        progress = run_local(str(tmp_path / "queue.sqlite"), str(tmp_path / "shards"), max_pages=13,
+                             workers=3, shard_size=2, base_url=base_url)
+        assert progress == {"done": 7}
+        merged_path = tmp_path / "merged.csv"
+        with CsvSink(str(merged_path)) as sink:
+            assert merge_shards(str(tmp_path / "shards"), sink) == 200
+
+        expected_path = tmp_path / "expected.csv"
+        with CsvSink(str(expected_path)) as sink:
+            for page_num, records in iter_scraped_pages(base_url, max_pages=13):
+                if page_num != 3:
+                    sink.write(records)
+    finally:
+        server.shutdown()
+
+    assert merged_path.read_text(encoding="utf-8") == expected_path.read_text(encoding="utf-8")
+
+
+def test_merge_drops_records_drifted_within_one_shard(tmp_path):
+    server, base_url = serve_fixture(num_pages=8)
+    # Page 6 repeats page 5, both inside the shard of pages 5-8
+    server.pages = lambda page_num: synthetic_page(20, seed=5 if page_num == 6 else page_num)[0].encode()
+    try:
+        progress = run_local(str(tmp_path / "queue.sqlite"), str(tmp_path / "shards"), max_pages=8,
+                             workers=1, shard_size=4, base_url=base_url)
+    finally:
+        server.shutdown()
+    assert progress == {"done": 2}
+    with CsvSink(str(tmp_path / "merged.csv")) as sink:
+        assert merge_shards(str(tmp_path / "shards"), sink) == 7 * 20
+
+
+def test_merge_refuses_missing_shards_unless_partial(tmp_path):
+    queue_path, output = str(tmp_path / "queue.sqlite"), tmp_path / "shards"
+    output.mkdir()
+    queue = ShardQueue(queue_path, max_attempts=1)
+    queue.plan(4, shard_size=2)
+    done = queue.lease("a")
+    queue.complete(done, 0)
+    (output / "shard-00001.jsonl").write_text("")
+    queue.release(queue.lease("a"))
+    assert missing_shards(queue, str(output)) == [2]
+    queue.close()
+
+    command = [sys.executable, "shards.py", "merge", "--queue", queue_path, "--output", str(output),
+               "--merge-to", str(tmp_path / "merged.csv")]
+    assert subprocess.run(command, capture_output=True).returncode == 1
+    assert not (tmp_path / "merged.csv").exists()
+    assert subprocess.run(command + ["--allow-partial"], capture_output=True).returncode == 0
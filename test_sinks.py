@@ -0,0 +1,73 @@
+import json
+
+import pandas as pd
+import pytest
+
+from gradstats_debug import scrape_gradcafe_with_program_type, scrape_to_sink
+from local_server import serve_fixture
+from sinks import CsvSink, JsonlSink, ParquetSink, ScrapeCheckpoint
+
+
+@pytest.fixture
+def fixture_server():
+    server, base_url = serve_fixture()
+    yield server, base_url
+    server.shutdown()
+
+
+def test_csv_sink_matches_dataframe_output(fixture_server, tmp_path):
+    _, base_url = fixture_server
+    expected_path = tmp_path / "expected.csv"
+    scrape_gradcafe_with_program_type(base_url, max_pages=3).to_csv(expected_path, index=False)
+
+    csv_path = tmp_path / "streamed.csv"
+    with CsvSink(str(csv_path)) as sink:
+        total = scrape_to_sink(sink, base_url, max_pages=3, flush_every=2)
+
+    assert total == 60
+    assert csv_path.read_text(encoding="utf-8") == expected_path.read_text(encoding="utf-8")
+
+
+def test_resume_from_checkpoint(fixture_server, tmp_path):
+    server, base_url = fixture_server
+    out_path = str(tmp_path / "out.jsonl")
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+
+    # A first run that only got through pages 1-2
+    checkpoint = ScrapeCheckpoint(checkpoint_path)
+    with JsonlSink(out_path) as sink:
+        scrape_to_sink(sink, base_url, max_pages=2, flush_every=1, checkpoint=checkpoint)
+
+    hits_before = server.hits
+    checkpoint = ScrapeCheckpoint(checkpoint_path)
+    assert checkpoint.next_page == 3 and checkpoint.started
+    with JsonlSink(out_path, append=checkpoint.started) as sink:
+        total = scrape_to_sink(sink, base_url, max_pages=5, flush_every=1, checkpoint=checkpoint)
+
+    assert server.hits - hits_before == 3
+    assert total == 100
+    with open(out_path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert len(rows) == 100
+    assert rows[0]["Tags"] == ["Interview on 23 Dec", "Fall 2025", "American"]
+
+
+def test_checkpoint_handles_out_of_order_pages():
+    checkpoint = ScrapeCheckpoint()
+    checkpoint.mark_done([1, 3, 4])
+    assert checkpoint.next_page == 2 and not checkpoint.is_done(2) and checkpoint.is_done(4)
+    checkpoint.mark_done([2])
+    assert checkpoint.next_page == 5 and not checkpoint.done_after
+
+
+def test_parquet_sink_writes_row_groups(fixture_server, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    _, base_url = fixture_server
+    out_dir = str(tmp_path / "dataset")
+    with ParquetSink(out_dir) as sink:
+        scrape_to_sink(sink, base_url, max_pages=3, flush_every=1)
+
+    assert pq.ParquetFile(sink.part_path).num_row_groups == 3
+    df = pd.read_parquet(out_dir)
+    assert len(df) == 60
+    assert list(df["Tags"].iloc[0]) == ["Interview on 23 Dec", "Fall 2025", "American"]
@@ -0,0 +1,111 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_pages import synthetic_page
+from dataset import to_typed_frame
+from gradstats_debug import parse_results_page, scrape_to_sink
+from local_server import serve_fixture
+from query import RecordIndex
+from sinks import CsvSink, StoreSink
+from store import RecordStore, import_csv
+
+
+@pytest.fixture(scope="module")
+def records():
+    rows = []
+    for page in range(10):
+        rows += parse_results_page(synthetic_page(30, seed=page)[0])
+    return rows
+
+
+def test_upsert_keeps_one_row_per_fingerprint(records, tmp_path):
+    with RecordStore(str(tmp_path / "records.sqlite")) as store:
+        assert store.upsert(records[:200]) == 200
+        assert store.upsert(records[150:] + records[:10]) == 100
+        assert len(store) == 300
+
+        typed = to_typed_frame(pd.DataFrame(records))
+        stored = store.query()
+        for name in ["School", "Decision", "Nationality"]:
+            assert stored[name].astype(object).tolist() == typed[name].astype(object).tolist()
+        for name in ["DecisionDate", "Year", "GPA", "Tags", "Comment"]:
+            assert stored[name].tolist() == typed[name].tolist()
+
+
+@pytest.mark.parametrize("spec", [
+    {"schools": ["Stanford University", "Harvard University"], "degree_types": "PhD"},
+    {"programs": ["Economics"], "years": [2024, 2025], "decision_from": "2024-03-01"},
+    [{"schools": "Duke University", "seasons": "Fall"}, {"decisions": ["Rejected"], "decision_to": "2024-01-31"}],
+])
+def test_queries_match_record_index(records, tmp_path, spec):
+    with RecordStore(str(tmp_path / "records.sqlite")) as store:
+        store.upsert(records)
+        result = store.query(spec, columns=["School", "Program", "DecisionDate", "Decision"])
+        expected = RecordIndex(pd.DataFrame(records)).select(spec)
+        assert result["DecisionDate"].tolist() == expected["DecisionDate"].tolist()
+        assert result["School"].astype(object).tolist() == expected["School"].astype(object).tolist()
+
+        counts = store.decision_date_counts(spec)
+        dated = expected.dropna(subset=["DecisionDate"])
+        expected_counts = dated.groupby(["DecisionDate", "Decision"], observed=True).size()
+        assert counts.set_index(["DecisionDate", "Decision"])["count"].tolist() == expected_counts.tolist()
+        assert sum(len(chunk) for chunk in store.query(spec, chunksize=7)) == len(expected)
+
+
+def test_indexes_are_used(tmp_path):
+    with RecordStore(str(tmp_path / "records.sqlite")) as store:
+        plan = " ".join(store.explain({"schools": ["Duke University"], "programs": ["Statistics"]}))
+        assert "records_program" in plan
+        assert "records_decision_date" in " ".join(store.explain({"decision_from": "2024-01-01"}))
+
+
+def test_store_sink_and_csv_import_do_not_duplicate(tmp_path):
+    server, base_url = serve_fixture()
+    path = str(tmp_path / "records.sqlite")
+    try:
+        with StoreSink(path) as sink:
+            scrape_to_sink(sink, base_url, max_pages=2)
+        with CsvSink(str(tmp_path / "results.csv")) as sink:
+            scrape_to_sink(sink, base_url, max_pages=2)
+    finally:
+        server.shutdown()
+
+    with RecordStore(path) as store:
+        count = len(store)
+        # The fixture serves the same page for every page number, so page 2 adds nothing
+        assert 0 < count <= 20
+        assert import_csv(store, str(tmp_path / "results.csv")) == 0
+        assert len(store) == count
+
+
+def test_csv_import_normalizes_legacy_dates(records, tmp_path):
+    # Older CSVs (gradcafe.csv) have "December 25, 2024" dates
+    legacy = pd.DataFrame(records[:50])
+    for name in ["DecisionDate", "Date_Posted"]:
+        legacy[name] = pd.to_datetime(legacy[name], format="%Y-%m-%d").dt.strftime("%B %d, %Y").fillna("")
+    csv_path = tmp_path / "legacy.csv"
+    legacy.to_csv(csv_path, index=False)
+
+    with RecordStore(str(tmp_path / "records.sqlite")) as store:
+        import_csv(store, str(csv_path))
+        expected = to_typed_frame(pd.DataFrame(records[:50]))
+        stored = store.query()
+        assert stored["DecisionDate"].tolist() == expected["DecisionDate"].tolist()
+        assert stored["Date_Posted"].tolist() == expected["Date_Posted"].tolist()
+
+        spec = {"decision_from": "2024-03-01"}
+        assert len(store.query(spec)) == (expected["DecisionDate"] >= "2024-03-01").sum() > 0
+        assert store.decision_date_counts()["count"].sum() == expected["DecisionDate"].notna().sum()
+
+
+def test_legacy_csv_import_matches_scraped_fingerprints(records, tmp_path):
+    legacy = pd.DataFrame(records[:20])
+    for name in ["DecisionDate", "Date_Posted"]:
+        legacy[name] = pd.to_datetime(legacy[name], format="%Y-%m-%d").dt.strftime("%B %d, %Y").fillna("")
+    csv_path = tmp_path / "legacy.csv"
+    legacy.to_csv(csv_path, index=False)
+
+    with RecordStore(str(tmp_path / "records.sqlite")) as store:
+        assert store.upsert(records[:20]) == 20
+        assert import_csv(store, str(csv_path)) == 0
+        assert len(store) == 20